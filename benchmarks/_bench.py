@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+"""Shared setup for the scripts in this directory; import it before rumps.
+
+Makes the checkout importable and, when PyObjC is not available, selects the in-memory backend
+(``RUMPS_BACKEND=fake``) so the benchmarks also run off macOS. Numbers from the fake backend measure the Python side
+of rumps only.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import AppKit  # noqa: F401
+except ImportError:
+    os.environ.setdefault('RUMPS_BACKEND', 'fake')
+
+
+def per_call_us(func, number):
+    """Mean wall time of `func` in microseconds over `number` calls."""
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def banner(title):
+    from rumps import backends
+    print('{0} [backend: {1}]'.format(title, backends.name))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""Latency from a socket becoming readable to a menu item showing the data:
+``App.run(loop='asyncio')`` (coroutine on the main thread) vs. an asyncio loop in a worker thread handing the update
+to the main thread with :func:`rumps.call_on_main`.
+
+Usage::
+
+    python benchmarks/bench_asyncio_latency.py [samples]
+"""
+
+from __future__ import print_function
+
+import asyncio
+import socket
+import struct
+import sys
+import threading
+import time
+
+from _bench import banner
+
+import rumps
+from rumps import _aio, backends
+
+from Foundation import NSDate, NSDefaultRunLoopMode, NSRunLoop  # after rumps, which selects the backend
+
+
+def pump():
+    # one pass of the main run loop, waiting up to half a millisecond for something to do
+    if backends.name == 'fake':
+        time.sleep(0.0005)  # the in-memory run loop doesn't block in real time
+    NSRunLoop.currentRunLoop().runMode_beforeDate_(NSDefaultRunLoopMode, NSDate.dateWithTimeIntervalSinceNow_(0.0005))
+
+
+def send_timestamps(sock, samples):
+    for _ in range(samples):
+        time.sleep(0.002)
+        sock.send(struct.pack('d', time.perf_counter()))
+
+
+async def receive(reader, samples, deliver):
+    loop = asyncio.get_running_loop()
+    for _ in range(samples):
+        data = b''
+        while len(data) < 8:
+            data += await loop.sock_recv(reader, 8 - len(data))
+        deliver(struct.unpack('d', data)[0])
+
+
+def measure(samples, thread_hop):
+    item = rumps.MenuItem('value')
+    latencies = []
+
+    def show(sent):  # on the main thread
+        item.title = repr(sent)
+        latencies.append(time.perf_counter() - sent)
+
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    if thread_hop:
+        hop = receive(reader, samples, lambda sent: rumps.call_on_main(show, sent))
+        worker = threading.Thread(target=asyncio.run, args=(hop,))
+        worker.start()
+    else:
+        _aio.start()
+        _aio.run_coroutine(receive(reader, samples, show))
+    sender = threading.Thread(target=send_timestamps, args=(writer, samples))
+    sender.start()
+    while len(latencies) < samples:
+        pump()
+    sender.join()
+    if thread_hop:
+        worker.join()
+    else:
+        _aio.stop()
+    reader.close()
+    writer.close()
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1e6, latencies[int(len(latencies) * 0.99)] * 1e6
+
+
+def main(samples=500):
+    banner('socket readable -> menu item updated, {0} samples'.format(samples))
+    print('{0:<30} {1:>10} {2:>10}'.format('', 'p50 (us)', 'p99 (us)'))
+    for label, thread_hop in (('loop="asyncio"', False), ('worker thread + call_on_main', True)):
+        p50, p99 = measure(samples, thread_hop)
+        print('{0:<30} {1:>10.0f} {2:>10.0f}'.format(label, p50, p99))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""Soak test: rebuilding a menu of items and widgets over and over, checking the callback registry and the traced
+memory stay flat.
+
+Usage::
+
+    python benchmarks/bench_callback_registry.py [number-of-rebuilds]
+"""
+
+from __future__ import print_function
+
+import gc
+import sys
+import tracemalloc
+
+from _bench import banner
+
+import rumps
+
+
+def build(menu):
+    menu.clear()
+    menu.update([rumps.MenuItem('item {0}'.format(n), callback=len) for n in range(5)] +
+                [rumps.SliderMenuItem(callback=len), rumps.CheckboxMenuItem(callback=len),
+                 rumps.CardMenuItem(callback=len), ('submenu', [rumps.MenuItem('nested', callback=len)])])
+
+
+def main(rebuilds=100000, report_every=10000):
+    menu = rumps.MenuItem('soak')
+    build(menu)
+    gc.collect()
+    tracemalloc.start()
+    banner('{0} menu rebuilds'.format(rebuilds))
+    print('{0:>9} {1:>9} {2:>14}'.format('rebuilds', 'entries', 'traced (KiB)'))
+    baseline = None
+    for i in range(1, rebuilds + 1):
+        build(menu)
+        if i % report_every == 0:
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            if baseline is None:
+                baseline = current
+            print('{0:>9} {1:>9} {2:>14.1f}'.format(i, len(rumps.callback_registry), current / 1024.0))
+    print('growth after the first report: {0:.1f} KiB'.format((current - baseline) / 1024.0))
+    print(rumps.callback_registry.stats())
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Four worker threads publishing into an event channel while the main run loop drains it: publish cost, the longest
+run loop pass spent delivering, and payloads dropped, for each backpressure policy and batch size.
+
+Usage::
+
+    python benchmarks/bench_channels.py [payloads-per-thread]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import threading
+import time
+
+os.environ['RUMPS_BACKEND'] = 'fake'
+
+from _bench import banner
+
+from rumps import events
+from rumps.backends import fake
+
+THREADS = 4
+
+
+def measure(payloads, **options):
+    channel = events.Channel('bench', **options)
+    channel.register(lambda payload: None)
+    passes = []
+
+    def drain(_drain=channel._drain):
+        start = time.perf_counter()
+        _drain()
+        passes.append(time.perf_counter() - start)
+    channel._drain = drain
+
+    def publish():
+        for n in range(payloads):
+            channel.publish(n)
+
+    workers = [threading.Thread(target=publish) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers) or channel.depth:
+        fake.run_pending()
+        time.sleep(0.001)  # the rest of the run loop pass
+    elapsed = time.perf_counter() - start
+    stats = channel.queue_stats()
+    return elapsed / (payloads * THREADS) * 1e6, max(passes) * 1e3, stats.max_depth, stats.dropped, stats.batches
+
+
+def main(payloads=20000):
+    banner('{0} threads publishing {1} payloads each'.format(THREADS, payloads))
+    print('{0:<34} {1:>14} {2:>18} {3:>10} {4:>9} {5:>8}'.format(
+        'channel', 'us/payload', 'longest pass (ms)', 'max depth', 'dropped', 'batches'))
+    for backpressure in events.BACKPRESSURE:
+        for batch_size in (10, 100, 1000):
+            label = '{0}, batch {1}'.format(backpressure, batch_size)
+            print('{0:<34} {1:>14.2f} {2:>18.2f} {3:>10} {4:>9} {5:>8}'.format(
+                label, *measure(payloads, maxsize=1000, backpressure=backpressure, batch_size=batch_size)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Callback dispatch: cached bound-method table vs. scanning the App instance on every call.
+
+Usage::
+
+    python benchmarks/bench_dispatch.py [number-of-methods]
+"""
+
+from __future__ import print_function
+
+import inspect
+import sys
+
+from _bench import banner, per_call_us
+
+import rumps
+from rumps import _internal
+
+
+def scan_call(func, *args, **kwargs):
+    # dispatch as rumps did before the method table was introduced
+    try:
+        app = getattr(rumps.App, '*app_instance')
+    except AttributeError:
+        pass
+    else:
+        for name, method in inspect.getmembers(app, predicate=inspect.ismethod):
+            if method.__func__ is func:
+                return method(*args, **kwargs)
+    return func(*args, **kwargs)
+
+
+def make_app(n_methods):
+    namespace = {}
+    for i in range(n_methods):
+        namespace['method_%03d' % i] = lambda self, sender: None
+    cls = type('BenchApp', (rumps.App,), namespace)
+    return cls('rumps-bench')
+
+
+def main(n_methods=150, number=2000):
+    app = make_app(n_methods)
+    setattr(rumps.App, '*app_instance', app)
+    try:
+        cls = type(app)
+        targets = [
+            ('first method', cls.method_000),
+            ('last method', getattr(cls, 'method_%03d' % (n_methods - 1))),
+            ('plain function', lambda sender: None),
+        ]
+        banner('{0} methods on App subclass, {1} calls each'.format(n_methods, number))
+        print('{0:<16} {1:>14} {2:>14} {3:>9}'.format('callback', 'scan (us)', 'cached (us)', 'speedup'))
+        for label, func in targets:
+            scan = per_call_us(lambda: scan_call(func, None), number)
+            cached = per_call_us(lambda: _internal.call_as_function_or_method(func, None), number)
+            print('{0:<16} {1:>14.2f} {2:>14.2f} {3:>8.0f}x'.format(label, scan, cached, scan / cached))
+    finally:
+        delattr(rumps.App, '*app_instance')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""A wake handler of twenty reconnect routines, each blocking for 50 ms: how long the main thread is held up and how
+long until every routine has run, subscribed as usual vs. with ``executor='thread'`` and different numbers of worker
+threads.
+
+Usage::
+
+    python benchmarks/bench_event_delivery.py [number-of-routines] [milliseconds-each]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+os.environ['RUMPS_BACKEND'] = 'fake'
+
+from _bench import banner
+
+import rumps
+from rumps.backends import fake
+from rumps.events import EventEmitter
+
+
+def measure(routines, seconds, **options):
+    emitter = EventEmitter('on_wake')
+    for _ in range(routines):
+        emitter.register(lambda: time.sleep(seconds), **options)
+    start = time.perf_counter()
+    future = emitter.emit_async()
+    fake.run_pending()
+    blocked = time.perf_counter() - start
+    future.result()
+    stats = emitter.stats()
+    return blocked, time.perf_counter() - start, stats.latency, stats.max_latency
+
+
+def main(routines=20, milliseconds=50):
+    seconds = milliseconds / 1e3
+    banner('{0} wake routines of {1} ms'.format(routines, milliseconds))
+    print('{0:<26} {1:>18} {2:>16} {3:>19} {4:>18}'.format(
+        'subscription', 'main thread (ms)', 'all done (ms)', 'mean latency (ms)', 'max latency (ms)'))
+    cases = [('main thread', None, {})] + [
+        ('thread, {0} workers'.format(workers), workers, {'executor': 'thread'}) for workers in (4, 10, 20)]
+    for label, workers, options in cases:
+        if workers is not None:
+            rumps.configure_workers(threads=workers)
+        print('{0:<26} {1:>18.1f} {2:>16.1f} {3:>19.1f} {4:>18.1f}'.format(
+            label, *[value * 1e3 for value in measure(routines, seconds, **options)]))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
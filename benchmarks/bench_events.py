@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""Cost of EventEmitter.emit with 1, 10 and 1000 subscribers: a set of callbacks each dispatched through
+``call_callback``, as before, vs. the ordered snapshot of pre-resolved callables, with and without a running
+application whose methods are looked up.
+
+Usage::
+
+    python benchmarks/bench_events.py [number-of-emits]
+"""
+
+from __future__ import print_function
+
+import sys
+import traceback
+
+from _bench import banner, per_call_us
+
+import rumps
+from rumps import _internal
+from rumps.events import EventEmitter
+
+
+class SetEmitter(object):
+    """The emitter as it was before subscriptions were ordered."""
+
+    def __init__(self, name):
+        self.callbacks = set()
+        self._site = 'event:' + name
+
+    def register(self, func):
+        self.callbacks.add(func)
+        return func
+
+    def emit(self, *args, **kwargs):
+        for callback in self.callbacks:
+            try:
+                _internal.call_callback(self._site, callback, *args, **kwargs)
+            except Exception:
+                traceback.print_exc()
+
+
+def measure(make, subscribers, number):
+    emitter = make('bench')
+    for _ in range(subscribers):
+        emitter.register(lambda value: None)
+    return per_call_us(lambda: emitter.emit(1), max(1, number // subscribers))
+
+
+def main(number=200000):
+    banner('emit cost')
+    print('{0:<30} {1:>14} {2:>16} {3:>18}'.format('emitter', 'subscribers', 'us/emit', 'us/subscriber'))
+    for running in (False, True):
+        if running:
+            app = rumps.App('bench')
+            setattr(rumps.App, '*app_instance', app)  # callbacks are then looked up as methods of app
+        for label, make in (('set + call_callback', SetEmitter), ('ordered snapshot', EventEmitter)):
+            label += ', app running' if running else ''
+            for subscribers in (1, 10, 1000):
+                cost = measure(make, subscribers, number)
+                print('{0:<30} {1:>14} {2:>16.2f} {3:>18.3f}'.format(label, subscribers, cost, cost / subscribers))
+    delattr(rumps.App, '*app_instance')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""Import time of rumps in fresh interpreters: ``import rumps`` alone, as a script sending notifications needs it, vs.
+with the whole of the API loaded, and which modules the time goes to (from ``python -X importtime``).
+
+Usage::
+
+    python benchmarks/bench_import.py [number-of-runs] [number-of-modules-listed]
+"""
+
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+
+from _bench import banner
+
+from rumps import backends
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ('import rumps', 'import rumps'),
+    ('... and use rumps.notification', 'import rumps; rumps.notification'),
+    ('... and use rumps.App', 'import rumps; rumps.App'),
+    ('... and make every widget', 'import rumps; rumps.CircularProgressMenuItem(value=0.5); '
+                                  'rumps.TextFieldMenuItem()'),
+]
+
+
+def importtime(code):
+    """Return ``{module: (self, cumulative)}`` in microseconds for running `code` in a new interpreter."""
+    env = dict(os.environ, RUMPS_BACKEND=backends.name, PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, cwd=ROOT,
+                            stderr=subprocess.PIPE, check=True).stderr.decode()
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(own), int(cumulative)
+    return times
+
+
+def main(runs=5, listed=12):
+    banner('import time over {0} fresh interpreters'.format(runs))
+    print('{0:<36} {1:>14} {2:>9}'.format('code', 'median (ms)', 'modules'))
+    breakdowns = {}
+    for label, code in CASES:
+        samples = [importtime(code) for _ in range(runs)]
+        totals = sorted(sum(own for own, _ in times.values()) for times in samples)
+        print('{0:<36} {1:>14.1f} {2:>9}'.format(label, totals[len(totals) // 2] / 1e3, len(samples[0])))
+        breakdowns[label] = samples[0]
+    for label in (CASES[0][0], CASES[-1][0]):
+        print()
+        print('slowest modules, cumulative: {0}'.format(label))
+        times = breakdowns[label]
+        for name in sorted(times, key=lambda name: -times[name][1])[:listed]:
+            print('  {0:<40} {1:>9.1f} ms'.format(name, times[name][1] / 1e3))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
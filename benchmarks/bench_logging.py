@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""Cost of a debug message on a hot path: the eager formatting rumps used to do before calling a no-op ``_log``
+vs. a lazy :mod:`rumps.log` call, disabled and enabled, and with a synchronous and an asynchronous sink.
+
+Usage::
+
+    python benchmarks/bench_logging.py [number-of-calls]
+"""
+
+from __future__ import print_function
+
+import sys
+
+from _bench import banner, per_call_us
+
+import rumps
+from rumps import log
+
+
+def _log(*_):
+    pass
+
+
+def main(number=200000):
+    item = rumps.MenuItem('Hot item', callback=len)
+    path = '/Users/someone/Pictures/icon.png'
+    banner('{0} log calls'.format(number))
+    print('{0:<44} {1:>12}'.format('call', 'us/call'))
+
+    def report(label, func):
+        print('{0:<44} {1:>12.3f}'.format(label, per_call_us(func, number)))
+
+    report('eager f-string to no-op _log (before)', lambda: _log(f'ImageMenuItem: loaded image from {path}'))
+    report('log.widget.debug, disabled', lambda: log.widget.debug('ImageMenuItem: loaded image from {0}', path))
+    report('log.menu.debug(item), disabled', lambda: log.menu.debug('{0}', item))
+    report('guarded by log.menu.enabled(), disabled', lambda: log.menu.enabled() and log.menu.debug('{0}', item))
+
+    rumps.set_log_level('debug', 'menu')
+    report('log.menu.debug(item), ring buffer only', lambda: log.menu.debug('{0}', item))
+    sink = rumps.add_log_sink(str)
+    report('... with a sink formatting every record', lambda: log.menu.debug('{0}', item))
+    rumps.remove_log_sink(sink)
+    sink = rumps.add_log_sink(str, asynchronous=True)
+    report('... with the same sink, asynchronous', lambda: log.menu.debug('{0}', item))
+    sink.flush()
+    rumps.remove_log_sink(sink)
+    print('records dropped by the asynchronous sink: {0}'.format(sink.dropped))
+    rumps.set_log_level('warning')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""Worker threads updating menu items: :func:`rumps.call_on_main` vs. one ``AppHelper.callAfter`` per update.
+
+Eight producer threads each set the title of their own menu item while the main thread runs the run loop.
+
+Usage::
+
+    python benchmarks/bench_main_queue.py [updates-per-thread]
+"""
+
+from __future__ import print_function
+
+import sys
+import threading
+import time
+
+from concurrent.futures import Future
+
+from _bench import banner
+
+import rumps
+from rumps import backends, dispatch
+
+from PyObjCTools import AppHelper  # after rumps, which selects the backend
+
+PRODUCERS = 8
+
+
+def call_after(func, *args):
+    future = Future()
+
+    def run():
+        future.set_result(func(*args))
+    AppHelper.callAfter(run)
+    return future
+
+
+def pump():
+    if backends.name == 'fake':
+        from rumps.backends import fake
+        fake.run_pending()
+    else:
+        from Foundation import NSDate, NSRunLoop, NSDefaultRunLoopMode
+        NSRunLoop.currentRunLoop().runMode_beforeDate_(NSDefaultRunLoopMode, NSDate.dateWithTimeIntervalSinceNow_(0.001))
+
+
+def measure(submit, updates):
+    items = [rumps.MenuItem('item %d' % i) for i in range(PRODUCERS)]
+    futures = []
+
+    def produce(item):
+        mine = [submit(setattr, item, 'title', str(n)) for n in range(updates)]
+        futures.extend(mine)
+
+    threads = [threading.Thread(target=produce, args=(item,)) for item in items]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads) or not all(f.done() for f in futures):
+        pump()
+    elapsed = time.perf_counter() - start
+    assert all(item.title == str(updates - 1) for item in items)
+    return PRODUCERS * updates / elapsed
+
+
+def main(updates=20000):
+    banner('{0} producer threads, {1} title updates each'.format(PRODUCERS, updates))
+    queue = dispatch.MainThreadQueue()
+    naive = measure(call_after, updates)
+    queued = measure(queue.submit, updates)
+    print('{0:<14} {1:>12,.0f} updates/s'.format('callAfter', naive))
+    print('{0:<14} {1:>12,.0f} updates/s   {2} run loop passes'.format('call_on_main', queued, queue.stats().passes))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
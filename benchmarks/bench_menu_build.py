@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""Menu construction time: one NSMenu call per item vs. a :meth:`rumps.Menu.batch` transaction.
+
+Every tenth row is a progress bar, an item with a custom view whose width is taken from the menu.
+
+Usage::
+
+    python benchmarks/bench_menu_build.py [size ...]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+from _bench import banner
+
+import rumps
+
+
+def rows(n):
+    return [rumps.ProgressBarMenuItem(value=0.5) if i % 10 == 9 else rumps.MenuItem('row %d' % i)
+            for i in range(n)]
+
+
+def build_each(items):
+    menu = rumps.MenuItem('root')
+    for item in items:
+        menu.add(item)
+
+
+def build_batched(items):
+    menu = rumps.MenuItem('root')
+    with menu.batch():
+        for item in items:
+            menu.add(item)
+
+
+def timed(build, n):
+    items = rows(n)  # construction of the items themselves is not measured
+    start = time.perf_counter()
+    build(items)
+    return time.perf_counter() - start
+
+
+def main(sizes=(100, 1000, 10000)):
+    banner('menu construction, every 10th row has a custom view')
+    print('{0:>8} {1:>14} {2:>14} {3:>9}'.format('items', 'per item (ms)', 'batched (ms)', 'speedup'))
+    for n in sizes:
+        each = timed(build_each, n)
+        batched = timed(build_batched, n)
+        print('{0:>8} {1:>14.2f} {2:>14.2f} {3:>8.1f}x'.format(n, each * 1e3, batched * 1e3, each / batched))
+
+
+if __name__ == '__main__':
+    main(*([tuple(map(int, sys.argv[1:]))] if sys.argv[1:] else []))
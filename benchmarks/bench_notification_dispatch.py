@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""A burst of alerts from monitors of twenty hosts: the time the caller and the main thread spend on them and how many
+notifications reach Notification Center, sent one by one with ``rumps.notification`` vs. through a
+:class:`rumps.NotificationDispatcher` that rate limits, deduplicates by host and summarizes.
+
+Usage::
+
+    python benchmarks/bench_notification_dispatch.py [number-of-alerts]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+os.environ['RUMPS_BACKEND'] = 'fake'
+
+from _bench import banner
+
+import rumps
+from rumps.backends import fake
+from rumps.backends.fake import Foundation
+
+HOSTS = 20
+
+
+def alerts(number):
+    return [('Monitor', 'host-{0}'.format(n % HOSTS), 'check {0} failed'.format(n)) for n in range(number)]
+
+
+def delivered():
+    return len(Foundation.NSUserNotificationCenter.defaultUserNotificationCenter().scheduledNotifications())
+
+
+def direct(number):
+    fake.reset()
+    start = time.perf_counter()
+    for title, subtitle, message in alerts(number):
+        rumps.notification(title, subtitle, message, data={'host': subtitle})
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, delivered()
+
+
+def dispatched(number, **options):
+    fake.reset()
+    dispatcher = rumps.NotificationDispatcher(**options)
+    start = time.perf_counter()
+    for title, subtitle, message in alerts(number):
+        dispatcher.notify(title, subtitle, message, data={'host': subtitle}, key=subtitle, group=title)
+    caller = time.perf_counter() - start
+    start = time.perf_counter()
+    fake.run_for(120)
+    return caller, time.perf_counter() - start, delivered()
+
+
+def main(number=10000):
+    banner('{0} alerts from {1} hosts'.format(number, HOSTS))
+    print('{0:<44} {1:>12} {2:>18} {3:>11}'.format('sent with', 'caller (ms)', 'main thread (ms)', 'delivered'))
+    cases = [
+        ('rumps.notification', direct, {}),
+        ('dispatcher, rate 1/s, burst 5', dispatched, {'rate': 1, 'burst': 5}),
+        ('dispatcher, + 10 s summarize window', dispatched, {'rate': 1, 'burst': 5, 'summarize_window': 10}),
+    ]
+    for label, run, options in cases:
+        caller, main_thread, count = run(number, **options)
+        print('{0:<44} {1:>12.1f} {2:>18.1f} {3:>11}'.format(label, caller * 1e3, main_thread * 1e3, count))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+"""Submenu over a large data source: one menu item per element vs. a :class:`rumps.PagedMenuItem` window.
+
+Usage::
+
+    python benchmarks/bench_paged_menu.py [size ...]
+"""
+
+from __future__ import print_function
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from _bench import banner
+
+import rumps
+
+
+def build_eager(n):
+    menu = rumps.MenuItem('root')
+    menu.update(['row %d' % i for i in range(n)])
+    return menu
+
+
+def build_paged(n):
+    return rumps.PagedMenuItem('root', range(n), page_size=25, formatter=lambda i: 'row %d' % i)
+
+
+def measure(build, n):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    menu = build(n)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del menu
+    return elapsed, peak
+
+
+def main(sizes=(1000, 10000, 100000)):
+    # the paged variant goes first: items of the eager menus stay alive in the callback table and would slow down
+    # the garbage collector for everything measured after them
+    paged = [measure(build_paged, n) for n in sizes + (1000000,)]
+    banner('submenu over N elements, 25 rows per page')
+    print('{0:>8} {1:>11} {2:>11} {3:>11} {4:>11}'.format(
+        'elements', 'eager (ms)', 'eager (MB)', 'paged (ms)', 'paged (MB)'))
+    for n, (paged_time, paged_mem) in zip(sizes, paged):
+        eager_time, eager_mem = measure(build_eager, n)
+        print('{0:>8} {1:>11.1f} {2:>11.1f} {3:>11.2f} {4:>11.2f}'.format(
+            n, eager_time * 1e3, eager_mem / 1e6, paged_time * 1e3, paged_mem / 1e6))
+    paged_time, paged_mem = paged[-1]
+    print('{0:>8} {1:>11} {2:>11} {3:>11.2f} {4:>11.2f}'.format(1000000, '-', '-', paged_time * 1e3, paged_mem / 1e6))
+
+if __name__ == '__main__':
+    main(*([tuple(map(int, sys.argv[1:]))] if sys.argv[1:] else []))
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""Cost of dispatching a callback without a profiler, with rumps.set_profiler() and with a profiling hook, next to
+calling rumps' dispatch directly.
+
+Usage::
+
+    python benchmarks/bench_profiler.py [number-of-calls]
+"""
+
+from __future__ import print_function
+
+import sys
+
+from _bench import banner, per_call_us
+
+import rumps
+from rumps import _internal
+
+
+def callback(sender):
+    pass
+
+
+def main(number=200000):
+    banner('{0} dispatches of a menu callback'.format(number))
+    cases = [
+        ('direct', None, lambda: _internal.call_as_function_or_method(callback, None)),
+        ('profiler off', None, lambda: _internal.call_callback('menu', callback, None)),
+        ('set_profiler()', True, lambda: _internal.call_callback('menu', callback, None)),
+        ('profiling hook', lambda *args: None, lambda: _internal.call_callback('menu', callback, None)),
+    ]
+    baseline = None
+    for label, profiler, call in cases:
+        rumps.set_profiler(profiler)
+        us = per_call_us(call, number)
+        baseline = baseline or us
+        print('{0:<16} {1:>8.3f} us/call  {2:>+7.3f} us'.format(label, us, us - baseline))
+    s = rumps.stats()[_internal.callback_name(callback)]
+    rumps.set_profiler(None)
+    print('{0} calls  p50 {1:.2f} us  p99 {2:.2f} us  max {3:.2f} us'.format(s.calls, s.p50 * 1e6, s.p99 * 1e6,
+                                                                            s.max * 1e6))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""Menu refresh: :meth:`rumps.Menu.clear` and :meth:`rumps.Menu.update` vs. :meth:`rumps.Menu.reconcile`.
+
+Each refresh changes a few rows of the menu: two titles, one insertion, one removal and one move. Native call counts
+are only available on the in-memory backend.
+
+Usage::
+
+    python benchmarks/bench_reconcile.py [size ...]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+from _bench import banner
+
+import rumps
+from rumps import backends
+
+
+def key(title):
+    return title.split(':')[0]
+
+
+def spec(n, generation):
+    rows = ['host{0}: {1} ms'.format(i, (i * 7 + generation) % 50 if i in (3, n // 2) else 1) for i in range(n)]
+    rows.insert(generation % n, 'extra{0}: 0 ms'.format(generation))
+    rows.append(rows.pop(n // 3))
+    return rows
+
+
+def rebuild(menu, rows):
+    menu.clear()
+    menu.update(rows)
+
+
+def reconcile(menu, rows):
+    menu.reconcile(rows, key=key)
+
+
+def measure(refresh, n, generations=20):
+    menu = rumps.MenuItem('root')
+    menu.reconcile(spec(n, 0), key=key)
+    calls = 0
+    start = time.perf_counter()
+    for generation in range(1, generations + 1):
+        if backends.name == 'fake':
+            from rumps.backends import fake
+            fake.native_calls.clear()
+        refresh(menu, spec(n, generation))
+        if backends.name == 'fake':
+            calls += sum(fake.native_calls.values())
+    elapsed = time.perf_counter() - start
+    return elapsed / generations, calls / float(generations)
+
+
+def main(sizes=(50, 500, 5000)):
+    banner('refreshing a menu with a handful of changed rows')
+    print('{0:>6} {1:>14} {2:>15} {3:>16} {4:>16}'.format(
+        'rows', 'rebuild calls', 'reconcile calls', 'rebuild (ms)', 'reconcile (ms)'))
+    for n in sizes:
+        rebuild_time, rebuild_calls = measure(rebuild, n)
+        reconcile_time, reconcile_calls = measure(reconcile, n)
+        print('{0:>6} {1:>14.0f} {2:>15.0f} {3:>16.2f} {4:>16.2f}'.format(
+            n, rebuild_calls, reconcile_calls, rebuild_time * 1e3, reconcile_time * 1e3))
+
+
+if __name__ == '__main__':
+    main(*([tuple(map(int, sys.argv[1:]))] if sys.argv[1:] else []))
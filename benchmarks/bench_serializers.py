@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""Size of notification data once serialized, and the time to serialize and read it back, for each format of
+:mod:`rumps.serializers` against the default (the :mod:`pickle` module), for a small dict, a typical one and a list of
+records.
+
+Usage::
+
+    python benchmarks/bench_serializers.py [number-of-calls]
+"""
+
+from __future__ import print_function
+
+import pickle
+import sys
+
+from _bench import banner, per_call_us
+
+from rumps import serializers
+
+PAYLOADS = [
+    ('small', {'id': 1234, 'action': 'open', 'url': 'https://example.com/item/1234'}),
+    ('typical', {'id': 1234, 'title': u'Build finished – 3 warnings', 'tags': ['ci', 'main'], 'ratio': 0.5,
+                 'done': False, 'parent': None, 'items': list(range(20))}),
+    ('records', [{'id': n, 'name': 'item {0}'.format(n), 'ok': True} for n in range(30)]),
+]
+
+
+def main(number=20000):
+    names = [name + compression for compression in ('', '+zlib') for name in serializers.formats()]
+    banner('notification data serializers')
+    print('{0:<10} {1:<16} {2:>8} {3:>10} {4:>10} {5:>10}'.format(
+        'payload', 'serializer', 'bytes', 'under 1 KB', 'us/dumps', 'us/loads'))
+    for label, data in PAYLOADS:
+        for name, serializer in [('pickle (default)', pickle)] + [(n, serializers.get_serializer(n)) for n in names]:
+            dumped = serializer.dumps(data)
+            print('{0:<10} {1:<16} {2:>8} {3:>10} {4:>10.2f} {5:>10.2f}'.format(
+                label, name, len(dumped), 'yes' if len(dumped) <= serializers.USER_INFO_LIMIT else 'no',
+                per_call_us(lambda: serializer.dumps(data), number),
+                per_call_us(lambda: serializer.loads(dumped), number)))
+        print()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+"""Creating SF Symbols for a dynamic status icon: interned instances vs. building every symbol from scratch.
+
+Usage::
+
+    python benchmarks/bench_sfsymbol.py [number-of-distinct-symbols]
+"""
+
+from __future__ import print_function
+
+import sys
+
+from _bench import banner, per_call_us
+
+import rumps
+
+
+def uncached(name, color):
+    rumps.SFSymbol.cache_clear()
+    return rumps.SFSymbol(name, color=color, point_size=14, weight='bold', scale='medium')()
+
+
+def interned(name, color):
+    return rumps.SFSymbol(name, color=color, point_size=14, weight='bold', scale='medium')()
+
+
+def main(distinct=4, number=5000):
+    states = [('battery.{0}'.format(25 * i), '#{0:02x}8040'.format(40 * i)) for i in range(distinct)]
+    banner('{0} calls cycling through {1} symbol states'.format(number, distinct))
+    for label, make in (('uncached', uncached), ('interned', interned)):
+        rumps.SFSymbol.cache_clear()
+        counter = iter(range(sys.maxsize))
+        us = per_call_us(lambda: make(*states[next(counter) % distinct]), number)
+        print('{0:<10} {1:>8.2f} us/symbol   {2}'.format(label, us, rumps.SFSymbol.cache_info()))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""Startup profile of an app with an icon, a menu and decorator-built submenus: the time spent in each phase and until
+the status item is shown, with and without ``defer_startup``.
+
+Runs against the in-memory backend, so that an app can be started over and over in one process; the numbers are those
+of the Python side of startup.
+
+Usage::
+
+    python benchmarks/bench_startup.py [number-of-decorated-items] [number-of-runs]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import tempfile
+
+os.environ['RUMPS_BACKEND'] = 'fake'
+
+from _bench import banner
+
+import rumps
+from rumps.backends import fake
+
+
+def profile(icon, decorated, **options):
+    fake.reset()
+    rumps.clicked.__dict__.pop('*buttons', None)
+    for n in range(decorated):
+        rumps.clicked('Group {0}'.format(n // 10), 'Item {0}'.format(n))(len)
+    app = rumps.App('bench', icon=icon, menu=['Item {0}'.format(n) for n in range(20)])
+    fake.launch(app, **options)
+    fake.run_pending()
+    return app.startup_profile
+
+
+def main(decorated=200, runs=5):
+    icon = os.path.join(tempfile.mkdtemp(), 'icon.png')
+    with open(icon, 'wb'):
+        pass
+    banner('startup with {0} decorated items, median of {1} runs'.format(decorated, runs))
+    for label, options in (('eager', {}), ('defer_startup=True', {'defer_startup': True})):
+        profiles = sorted((profile(icon, decorated, **options) for _ in range(runs)), key=lambda p: p.status_item)
+        median = profiles[len(profiles) // 2]
+        print()
+        print('{0}: status item after {1:.2f} ms, complete after {2:.2f} ms'.format(
+            label, median.status_item * 1e3, median.complete * 1e3))
+        for phase in median.phases:
+            print('  {0:<20} {1:>9.3f} ms{2}'.format(phase.name, phase.duration * 1e3,
+                                                     '  (deferred)' if phase.deferred else ''))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
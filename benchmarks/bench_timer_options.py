@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""Fifty timers at 5 seconds started together: wakeups, the largest burst of callbacks run in one wakeup and the drift
+of the calls for combinations of the `tolerance` and `jitter` timer options.
+
+Runs against the in-memory backend, whose run loop counts wakeups and fires timers at the end of their tolerance
+window, the latest macOS may fire them; the drift reported is therefore the worst case.
+
+Usage::
+
+    python benchmarks/bench_timer_options.py [number-of-timers] [interval]
+"""
+
+from __future__ import print_function
+
+import collections
+import os
+import random
+import sys
+
+os.environ['RUMPS_BACKEND'] = 'fake'
+
+from _bench import banner
+
+import rumps
+from rumps.backends import fake
+from Foundation import NSRunLoop
+
+MINUTES = 10
+
+
+def measure(count, interval, **options):
+    fake.reset()
+    random.seed(0)
+    run_loop = NSRunLoop.currentRunLoop()
+    bursts = collections.Counter()
+    timers = [rumps.Timer(lambda sender: bursts.update([fake.now()]), interval, **options) for _ in range(count)]
+    for t in timers:
+        t.start()
+    wakeups = run_loop.wakeups
+    fake.run_for(MINUTES * 60)
+    for t in timers:
+        t.stop()
+    drifts = [t.drift for t in timers]
+    return ((run_loop.wakeups - wakeups) / float(MINUTES), max(bursts.values()),
+            sum(d.mean for d in drifts) / count * 1e3, max(d.max for d in drifts) * 1e3)
+
+
+def main(count=50, interval=5):
+    banner('{0} timers every {1} s, started together'.format(count, interval))
+    print('{0:<26} {1:>12} {2:>12} {3:>16} {4:>15}'.format(
+        'options', 'wakeups/min', 'peak burst', 'mean drift (ms)', 'max drift (ms)'))
+    for options in ({}, {'jitter': 1}, {'jitter': 1, 'tolerance': 0.1}, {'jitter': 1, 'tolerance': 0.5},
+                    {'jitter': 4, 'tolerance': 1}):
+        label = ', '.join('{0}={1}'.format(k, v) for k, v in sorted(options.items())) or 'none'
+        print('{0:<26} {1:>12.0f} {2:>12} {3:>16.1f} {4:>15.1f}'.format(label, *measure(count, interval, **options)))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""Run loop wakeups of many polling timers: one NSTimer per rumps.Timer, as before, vs. the shared timer wheel with
+different coalescing tolerances.
+
+Wakeups are counted by the in-memory backend over ten minutes of virtual time, so this always runs against it.
+
+Usage::
+
+    python benchmarks/bench_timer_wheel.py [number-of-timers] [interval]
+"""
+
+from __future__ import print_function
+
+import os
+import random
+import sys
+import time
+
+os.environ['RUMPS_BACKEND'] = 'fake'
+
+from _bench import banner
+
+import rumps
+from rumps.backends import fake
+from Foundation import NSDate, NSTimer, NSRunLoop, NSDefaultRunLoopMode
+
+MINUTES = 10
+
+
+class NativeTimer(object):
+    """A timer with its own NSTimer, the way rumps.Timer.start worked before the timer wheel."""
+
+    def __init__(self, callback, interval):
+        self._callback = callback
+        self._nstimer = NSTimer.alloc().initWithFireDate_interval_target_selector_userInfo_repeats_(
+            NSDate.date(), interval, self, 'callback:', None, True)
+        NSRunLoop.currentRunLoop().addTimer_forMode_(self._nstimer, NSDefaultRunLoopMode)
+
+    def callback_(self, _):
+        self._callback(self)
+
+    def stop(self):
+        self._nstimer.invalidate()
+
+
+def measure(make, count, interval):
+    fake.reset()
+    run_loop = NSRunLoop.currentRunLoop()
+    fired = [0]
+
+    def poll(sender):
+        fired[0] += 1
+
+    rng = random.Random(0)
+    timers = []
+    for _ in range(count):  # hosts are added over the first interval
+        fake.run_for(rng.uniform(0, interval / float(count)))
+        timers.append(make(poll, interval))
+    wakeups, fired[0] = run_loop.wakeups, 0
+    started = time.process_time()
+    fake.run_for(MINUTES * 60)
+    cpu = time.process_time() - started
+    for t in timers:
+        t.stop()
+    return (run_loop.wakeups - wakeups) / float(MINUTES), fired[0] / float(MINUTES), cpu / MINUTES * 1e3
+
+
+def wheel(tolerance):
+    def make(callback, interval):
+        rumps.set_timer_tolerance(tolerance)
+        t = rumps.Timer(callback, interval)
+        t.start()
+        return t
+    return make
+
+
+def main(count=300, interval=30):
+    banner('{0} timers every {1} s'.format(count, interval))
+    print('{0:<22} {1:>14} {2:>14} {3:>16}'.format('scheduling', 'wakeups/min', 'fires/min', 'cpu (ms/min)'))
+    for label, make in [('NSTimer per timer', NativeTimer)] + [
+            ('wheel, tolerance {0:g} s'.format(tolerance), wheel(tolerance)) for tolerance in (0, 0.1, 1, 5)]:
+        wakeups, fires, cpu = measure(make, count, interval)
+        print('{0:<22} {1:>14.0f} {2:>14.0f} {3:>16.1f}'.format(label, wakeups, fires, cpu))
+    rumps.set_timer_tolerance(0)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
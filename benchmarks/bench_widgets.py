@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""Construction and click-dispatch latency of the menu item classes.
+
+Usage::
+
+    python benchmarks/bench_widgets.py [number]
+"""
+
+from __future__ import print_function
+
+import sys
+
+from _bench import banner, per_call_us
+
+import rumps
+
+WIDGETS = [
+    ('MenuItem', lambda: rumps.MenuItem('item')),
+    ('SliderMenuItem', lambda: rumps.SliderMenuItem()),
+    ('TextFieldMenuItem', lambda: rumps.TextFieldMenuItem(text='text')),
+    ('ImageMenuItem', lambda: rumps.ImageMenuItem(dimensions=(50, 50))),
+    ('ListMenuItem', lambda: rumps.ListMenuItem(items=['a', 'b', 'c'])),
+    ('ListView', lambda: rumps.ListView(items=['a', 'b', 'c'])),
+    ('CardMenuItem', lambda: rumps.CardMenuItem(title='card')),
+    ('ProgressBarMenuItem', lambda: rumps.ProgressBarMenuItem(value=0.5)),
+    ('CircularProgressMenuItem', lambda: rumps.CircularProgressMenuItem(value=0.5)),
+    ('CheckboxMenuItem', lambda: rumps.CheckboxMenuItem(title='check')),
+]
+
+
+def main(number=2000):
+    banner('widget latency, {0} iterations'.format(number))
+    print('{0:<26} {1:>12}'.format('construct', 'us'))
+    for name, factory in WIDGETS:
+        print('{0:<26} {1:>12.2f}'.format(name, per_call_us(factory, number)))
+
+    app = rumps.App('rumps-bench')
+    item = rumps.MenuItem('click me', callback=lambda sender: None)
+    app.menu = [item]
+    setattr(rumps.App, '*app_instance', app)
+    try:
+        callback = rumps.rumps.NSApp.callback_
+        native = item._menuitem
+        print('{0:<26} {1:>12.2f}'.format('NSApp.callback_ dispatch', per_call_us(lambda: callback(native), number)))
+    finally:
+        delattr(rumps.App, '*app_instance')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
@@ -22,10 +22,43 @@ __author__ = 'Jared Suttles'
 __license__ = 'Modified BSD'
 __copyright__ = 'Copyright 2020 Jared Suttles'
 
+from . import backends as _backends  # must come first: selects the modules imported as Foundation, AppKit, ...
 from . import notifications as _notifications
-from .rumps import (separator, debug_mode, alert, application_support, timers, quit_application, timer,
-                    clicked, MenuItem, SliderMenuItem, TextFieldMenuItem, ImageMenuItem, ListMenuItem, ListView,
-                    CardMenuItem, ProgressBarMenuItem, CircularProgressMenuItem, CheckboxMenuItem, Timer, Window, App, slider, textfield, image, checkbox, list_menu, card, SFSymbol)
 
 notifications = _notifications.on_notification
 notification = _notifications.notify
+NotificationDispatcher = _notifications.NotificationDispatcher
+
+# Everything else is imported on first access (see __getattr__) so that `import rumps` does not load AppKit, or define
+# the Objective-C classes of rumps, for a script that only sends notifications.
+_EXPORTS = {
+    'dispatch': ('call_on_main', 'execution_policy', 'configure_workers', 'set_main_thread_budget',
+                 'main_thread_overruns'),
+    'scheduling': ('set_timer_tolerance', 'timer_stats'),
+    'profiling': ('set_profiler', 'stats'),
+    'log': ('set_log_level', 'log_levels', 'log_events', 'set_log_capacity', 'add_log_sink', 'remove_log_sink'),
+    'rumps': ('separator', 'debug_mode', 'alert', 'application_support', 'timers', 'quit_application', 'timer',
+              'clicked', 'MenuItem', 'PagedMenuItem', 'SliderMenuItem', 'TextFieldMenuItem', 'ImageMenuItem',
+              'ListMenuItem', 'ListView', 'CardMenuItem', 'ProgressBarMenuItem', 'CircularProgressMenuItem',
+              'CheckboxMenuItem', 'Timer', 'Backoff', 'NO_CHANGE', 'Window', 'App', 'slider', 'textfield', 'image',
+              'checkbox', 'list_menu', 'card', 'SFSymbol', 'image_cache', 'callback_registry'),
+}
+_LAZY = dict((name, module) for module, names in _EXPORTS.items() for name in names)
+_SUBMODULES = ('rumps', 'dispatch', 'events', 'scheduling', 'profiling', 'log', 'serializers', 'utils', 'exceptions',
+               'compat')
+
+
+def __getattr__(name):
+    import importlib
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)  # which also sets it as an attribute of the package
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
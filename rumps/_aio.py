@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps._aio
+~~~~~~~~~~
+
+Running an asyncio event loop on the main thread together with the Cocoa run loop, for ``App.run(loop='asyncio')``.
+
+The Cocoa run loop stays in charge. The asyncio loop is advanced one iteration at a time, never blocking, from
+
+    - an ``NSTimer`` registered for the common run loop modes, so that it also fires while a menu is open, set after
+      every iteration to the time the loop's earliest ``call_later`` handle is due, and removed while there is none:
+      an idle loop doesn't wake the application,
+    - right after a coroutine is scheduled by a callback, or an iteration leaves callbacks ready to run,
+    - whenever a file descriptor watched by the loop (sockets, the loop's own wakeup pipe) becomes ready. A helper
+      thread waits on the loop's selector and only posts an iteration to the main thread; all callbacks and
+      coroutines run on the main thread. An event loop passed in rather than created here has no selector we can
+      wait on, so the timer also fires every `interval` seconds to notice its I/O.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import asyncio
+import selectors
+import threading
+import traceback
+
+from Foundation import NSDate, NSTimer, NSRunLoop, NSRunLoopCommonModes
+from PyObjCTools import AppHelper
+
+_driver = None
+
+
+class AsyncioDriver(object):
+    _IDLE_INTERVAL = 365 * 24 * 60 * 60.0  # the native timer repeats so that it stays valid; it is always moved
+
+    def __init__(self, loop=None, interval=0.01):
+        if loop is None:
+            self._selector = selectors.DefaultSelector()
+            self.loop = asyncio.SelectorEventLoop(self._selector)
+        else:  # a loop we didn't create: no access to its selector, so I/O is only noticed by polling
+            self._selector = None
+            self.loop = loop
+        self._owns_loop = loop is None
+        self._interval = interval
+        self._nstimer = None
+        self._stepping = False
+        self._running = False
+        self._ready_for_wait = threading.Event()
+        self._waiter = None
+
+    def start(self):
+        asyncio.set_event_loop(self.loop)
+        self._running = True
+        AppHelper.callAfter(self.step)
+        if self._selector is not None:
+            self._ready_for_wait.set()
+            self._waiter = threading.Thread(target=self._wait_for_io, name='rumps-asyncio-io')
+            self._waiter.daemon = True
+            self._waiter.start()
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        if self._nstimer is not None:
+            self._nstimer.invalidate()
+            self._nstimer = None
+        if self._waiter is not None:
+            self._ready_for_wait.set()
+            self.loop.call_soon_threadsafe(lambda: None)  # wake the helper thread from its select
+            self._waiter.join()
+        if not self._stepping:  # otherwise called from a callback, shut down once the current iteration returns
+            self._shutdown()
+
+    def _shutdown(self):
+        loop = self.loop
+        tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        if self._owns_loop:
+            loop.close()
+        asyncio.set_event_loop(None)
+
+    def tick_(self, nstimer):
+        self.step()
+
+    def step(self):
+        """Run one non-blocking iteration of the asyncio loop: callbacks that are ready and I/O that is ready."""
+        if not self._running or self._stepping or self.loop.is_running():  # re-entered from a nested run loop
+            return
+        self._stepping = True
+        try:
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+        finally:
+            self._stepping = False
+            if self._running:
+                self._ready_for_wait.set()
+                self._arm()
+            else:
+                self._shutdown()
+
+    def _arm(self):
+        # wake up for the next iteration with something to do; I/O is left to the helper thread
+        loop = self.loop
+        if loop._ready:
+            AppHelper.callAfter(self.step)
+            return
+        delay = loop._scheduled[0].when() - loop.time() if loop._scheduled else None
+        if self._selector is None:
+            delay = self._interval if delay is None else min(delay, self._interval)
+        if delay is None:
+            if self._nstimer is not None:
+                self._nstimer.invalidate()
+                self._nstimer = None
+            return
+        fire_date = NSDate.dateWithTimeIntervalSinceNow_(max(delay, 0.0))
+        if self._nstimer is None:
+            self._nstimer = NSTimer.alloc().initWithFireDate_interval_target_selector_userInfo_repeats_(
+                fire_date, self._IDLE_INTERVAL, self, 'tick:', None, True)
+            NSRunLoop.currentRunLoop().addTimer_forMode_(self._nstimer, NSRunLoopCommonModes)
+        else:
+            self._nstimer.setFireDate_(fire_date)
+
+    def schedule(self, coroutine):
+        task = self.loop.create_task(coroutine)
+        task.add_done_callback(_report_exception)
+        AppHelper.callAfter(self.step)  # start it now rather than on the next tick
+        return task
+
+    def _wait_for_io(self):
+        while True:
+            self._ready_for_wait.wait()
+            self._ready_for_wait.clear()
+            if not self._running:
+                return
+            try:
+                ready = self._selector.select(timeout=None)
+            except (OSError, ValueError):  # selector closed
+                return
+            if not self._running:
+                return
+            if ready:
+                # readiness is level-triggered: the next iteration's own select sees the same events. Wait for it to
+                # happen before selecting again
+                AppHelper.callAfter(self.step)
+            else:
+                self._ready_for_wait.set()
+
+
+def _report_exception(task):
+    if not task.cancelled() and task.exception() is not None:
+        exc = task.exception()
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+
+def start(loop=None, interval=0.01):
+    global _driver
+    stop()
+    _driver = AsyncioDriver(loop, interval)
+    _driver.start()
+    return _driver
+
+
+def stop():
+    global _driver
+    driver, _driver = _driver, None
+    if driver is not None:
+        driver.stop()
+
+
+def run_coroutine(coroutine):
+    """Schedule a coroutine returned by a callback on the running asyncio loop and return its task."""
+    if _driver is None:
+        coroutine.close()
+        raise RuntimeError('coroutine callbacks require the application to run with App.run(loop="asyncio")')
+    return _driver.schedule(coroutine)
@@ -2,13 +2,20 @@
 
 from __future__ import print_function
 
-import inspect
+import collections
+import functools
+import sys
+import threading
+import time
 import traceback
+import types
+import weakref
 
 import Foundation
 
 from . import compat
 from . import exceptions
+from . import log
 
 
 def require_string(*objs):
@@ -27,23 +34,207 @@ def require_string_or_none(*objs):
             )
 
 
+class _MethodTable(dict):
+    """Maps the functions of the methods of an instance to ``None``, or to the method itself if it is not bound to the
+    instance (a classmethod). Methods of the instance are bound when looked up with :meth:`get`, so that the table
+    does not keep the instance alive."""
+
+    def __init__(self, app):
+        super(_MethodTable, self).__init__()
+        self.app = weakref.ref(app)
+
+    def get(self, func, default=None):
+        method = dict.get(self, func, default)
+        if method is None and func in self:
+            app = self.app()
+            return default if app is None else types.MethodType(func, app)
+        return method
+
+
+class _MethodResolver(object):
+    """Maps callback functions to the bound methods of an :class:`rumps.App` instance.
+
+    The table is built with a single scan of the instance the first time a callback is dispatched and is reused until
+    :meth:`invalidate` is called or a different instance becomes the running application. It only keeps a weak
+    reference to the instance.
+    """
+
+    def __init__(self):
+        self._table = None
+
+    def invalidate(self):
+        self._table = None
+
+    def _build(self, app):
+        import inspect
+        table = _MethodTable(app)
+        for name, method in inspect.getmembers(app, predicate=inspect.ismethod):
+            try:
+                table.setdefault(method.__func__, None if method.__self__ is app else method)
+            except TypeError:  # unhashable __func__
+                pass
+        self._table = table
+        return table
+
+    def table(self, app):
+        """Return the table of `app`, a new one whenever it is built again."""
+        table = self._table
+        if table is None or table.app() is not app:
+            table = self._build(app)
+        return table
+
+    def resolve(self, app, func):
+        try:
+            return self.table(app).get(func, func)
+        except TypeError:  # unhashable callable can't be a method of app
+            return func
+
+
+_method_resolver = _MethodResolver()
+
+
+def method_table():
+    """Return the bound methods of the running :class:`rumps.App` by function, or ``None`` if no application is
+    running. The same dict is returned until callbacks may resolve differently, so that callers can cache what
+    :func:`resolve_callback` returns for as long as it is.
+    """
+    rumps = sys.modules.get(__package__ + '.rumps')  # not imported: no application
+    app = None if rumps is None else getattr(rumps.App, '*app_instance', None)
+    return None if app is None else _method_resolver.table(app)
+
+
+def resolve_callback(func, table):
+    """Return a callable running `func` as :func:`call_as_function_or_method` would for the :func:`method_table`
+    `table`, except that coroutines it returns are not scheduled and the main thread budget is not checked."""
+    if getattr(func, '*policy', None) is not None:
+        return functools.partial(call_as_function_or_method, func)
+    if table is None:
+        return func
+    try:
+        return table.get(func, func)
+    except TypeError:
+        return func
+
+
+def run_coroutine(coroutine):
+    """Run `coroutine`, returned by a callback, as a task on the asyncio loop and return the task."""
+    from . import _aio
+    return _aio.run_coroutine(coroutine)
+
+
+def invalidate_method_cache():
+    """Forget the bound methods found for the running application. Called whenever a callable attribute of an
+    :class:`rumps.App` instance is set or deleted.
+    """
+    _method_resolver.invalidate()
+
+
+OverrunStats = collections.namedtuple('OverrunStats', 'count worst total')
+
+
+class _BlockingMonitor(object):
+    """Times callbacks run on the main thread and reports those taking longer than `budget` seconds. A callback
+    running another one is not reported when the other one already was."""
+
+    def __init__(self, budget, on_exceed=None):
+        self.budget = budget
+        self.on_exceed = on_exceed or self._log
+        self.overruns = {}
+        self._reported = False  # whether a callback run by the current one was reported
+
+    def call(self, func, resolved, args, kwargs):
+        if threading.current_thread() is not threading.main_thread():
+            return resolved(*args, **kwargs)
+        reported, self._reported = self._reported, False
+        start = time.perf_counter()
+        try:
+            return resolved(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            if elapsed > self.budget and not self._reported:
+                self._record(func, elapsed)
+                self._reported = True
+            self._reported = reported or self._reported
+
+    def _record(self, func, elapsed):
+        name = callback_name(func)
+        count, worst, total = self.overruns.get(name, (0, 0.0, 0.0))
+        self.overruns[name] = OverrunStats(count + 1, max(worst, elapsed), total + elapsed)
+        try:
+            self.on_exceed(func, elapsed)
+        except Exception:
+            traceback.print_exc()
+
+    def _log(self, func, elapsed):
+        log.app.warning('{0} blocked the main thread for {1:.0f} ms (budget {2:.0f} ms); consider '
+                        '@rumps.execution_policy(\'thread\')', callback_name(func), elapsed * 1e3, self.budget * 1e3,
+                        callback=func, elapsed=elapsed, budget=self.budget)
+
+
+_blocking_monitor = None
+_profiler = None  # a rumps.profiling.Profiler while profiling
+
+
+def callback_name(func):
+    func = getattr(func, '__func__', func)
+    module = getattr(func, '__module__', None)
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', None) or repr(func)
+    return name if module is None else '{0}.{1}'.format(module, name)
+
+
 def call_as_function_or_method(func, *args, **kwargs):
     # The idea here is that when using decorators in a class, the functions passed are not bound so we have to
     # determine later if the functions we have (those saved as callbacks) for particular events need to be passed
     # 'self'.
     #
     # This works for an App subclass method or a standalone decorated function. Will attempt to find function as
-    # a bound method of the App instance. If it is found, use it, otherwise simply call function.
+    # a bound method of the App instance. If it is found, use it, otherwise simply call function. Lookups go through
+    # a table of the instance's bound methods so dispatch does not reflect over the App on every call.
+    #
+    # A callback that is a coroutine function (``async def``) is run as a task on the asyncio loop driven by
+    # App.run(loop='asyncio') and the task is returned. A callback with an execution policy other than 'main' is handed
+    # to rumps.dispatch, which returns a future.
     from . import rumps
     try:
         app = getattr(rumps.App, '*app_instance')
     except AttributeError:
-        pass
+        resolved = func
     else:
-        for name, method in inspect.getmembers(app, predicate=inspect.ismethod):
-            if method.__func__ is func:
-                return method(*args, **kwargs)
-    return func(*args, **kwargs)
+        resolved = _method_resolver.resolve(app, func)
+    policy = getattr(func, '*policy', None)
+    if policy is not None:
+        from . import dispatch
+        return dispatch.run_with_policy(policy, func, resolved, args, kwargs)
+    if _blocking_monitor is None:
+        result = resolved(*args, **kwargs)
+    else:
+        result = _blocking_monitor.call(func, resolved, args, kwargs)
+    if isinstance(result, types.CoroutineType):
+        return run_coroutine(result)
+    return result
+
+
+def call_callback(site, func, *args, **kwargs):
+    """Run a user callback with :func:`call_as_function_or_method`, measured by the profiler if one is set. `site`
+    names the kind of callback, e.g. ``'menu'`` or ``'timer'``."""
+    if _profiler is None:
+        return call_as_function_or_method(func, *args, **kwargs)
+    return _profiler.call(site, func, call_as_function_or_method, args, kwargs)
+
+
+def profiled(site):
+    """Decorator measuring an internal handler with the profiler, if one is set."""
+    def decorator(func):
+        def call(func, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            return _profiler.call(site, func, call, args, kwargs)
+        return wrapper
+    return decorator
 
 
 def guard_unexpected_errors(func):
@@ -90,3 +281,16 @@ def string_to_objc(x):
                 type(x).__name__
             )
         )
+
+
+def call_later(delay, func, *args, **kwargs):
+    """Call `func` on the main thread after `delay` seconds. Safe to call from any thread, unlike
+    ``AppHelper.callLater``, whose timer is added to the run loop of the calling thread -- which, on any thread but the
+    main one, never runs."""
+    from PyObjCTools import AppHelper
+    if delay <= 0:
+        AppHelper.callAfter(func, *args, **kwargs)
+    elif Foundation.NSThread.isMainThread():
+        AppHelper.callLater(delay, func, *args, **kwargs)
+    else:
+        AppHelper.callAfter(AppHelper.callLater, delay, func, *args, **kwargs)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.backends
+~~~~~~~~~~~~~~
+
+Selection of the Objective-C bridge rumps talks to.
+
+``pyobjc``
+    The default. ``Foundation``, ``AppKit``, ``objc`` and ``PyObjCTools.AppHelper`` are the real PyObjC modules.
+
+``fake``
+    In-memory stand-ins for those modules (see :mod:`rumps.backends.fake`) so that applications, menus, widgets and
+    timers can be built, driven and profiled in a plain Python process without macOS, e.g. on CI boxes.
+
+The backend is chosen with the ``RUMPS_BACKEND`` environment variable, which must be set before :mod:`rumps` is first
+imported.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import os
+
+BACKENDS = ('pyobjc', 'fake')
+
+#: Name of the backend in use.
+name = os.environ.get('RUMPS_BACKEND') or 'pyobjc'
+
+if name not in BACKENDS:
+    raise ValueError('unknown rumps backend {0!r}; RUMPS_BACKEND must be one of {1}'.format(name, ', '.join(BACKENDS)))
+
+if name == 'fake':
+    from . import fake as _fake
+    _fake.install()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.backends.fake.AppHelper
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+In-memory stand-in for ``PyObjCTools.AppHelper``.
+
+:func:`runEventLoop` runs the fake run loop over virtual time. It returns when :func:`stopEventLoop` is called (e.g.
+by :func:`rumps.quit_application`) or when there is nothing left to do: no timer is scheduled and no call is pending.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+from .Foundation import NSRunLoop
+from .AppKit import NSApplication
+
+_running = []
+
+
+def callAfter(func, *args, **kwargs):
+    """Call `func` on the next pass of the main run loop. Safe to call from any thread."""
+    NSRunLoop.mainRunLoop()._post(func, args, kwargs)
+
+
+def callLater(delay, func, *args, **kwargs):
+    """Call `func` after `delay` seconds of (virtual) run loop time. Like PyObjC's, the timer is added to the run loop
+    of the calling thread, so that called from any thread but the main one `func` is never called.
+    """
+    from .Foundation import NSTimer
+
+    class _Later(object):
+        def fire_(self, timer):
+            func(*args, **kwargs)
+
+    NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(delay, _Later(), 'fire:', None, False)
+
+
+def installMachInterrupt():
+    pass
+
+
+def stopEventLoop():
+    if _running:
+        _running[-1] = False
+
+
+def runEventLoop(argv=None, unexpectedErrorAlert=None, installInterrupt=None, pdb=None, main=None):
+    run_loop = NSRunLoop.mainRunLoop()
+    NSApplication.sharedApplication()._finish_launching()
+    _running.append(True)
+    try:
+        while _running[-1]:
+            if not run_loop._run_once(float('inf')) and not run_loop.has_timers():
+                break
+    finally:
+        _running.pop()
+
+
+runConsoleEventLoop = runEventLoop
+
+
+__all__ = ('callAfter', 'callLater', 'installMachInterrupt', 'stopEventLoop', 'runEventLoop', 'runConsoleEventLoop')
@@ -0,0 +1,889 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.backends.fake.AppKit
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+In-memory stand-in for the parts of PyObjC's ``AppKit`` used by rumps. Like the real module it re-exports
+:mod:`rumps.backends.fake.Foundation`.
+
+Menus, menu items and the status item are modelled faithfully enough to inspect what an application built and to
+dispatch clicks through the same target-action path Cocoa uses. Views and controls keep whatever is set on them (see
+:class:`rumps.backends.fake.Foundation._Stub`) and draw nothing.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+from .Foundation import *  # noqa: F401,F403  AppKit re-exports Foundation
+from .Foundation import (NSObject, NSNotificationCenter, NSSize, NSRect, NSMakeRect, native_calls, _Stub, _as_rect,
+                         _as_size, _perform, _selector_name)
+
+NSFontWeightUltraLight = -0.8
+NSFontWeightThin = -0.6
+NSFontWeightLight = -0.4
+NSFontWeightRegular = 0.0
+NSFontWeightMedium = 0.23
+NSFontWeightSemibold = 0.3
+NSFontWeightBold = 0.4
+NSFontWeightHeavy = 0.56
+NSFontWeightBlack = 0.62
+
+NSLineBreakByTruncatingTail = 4
+NSRoundLineCapStyle = 1
+
+NSTrackingMouseEnteredAndExited = 0x01
+NSTrackingActiveInKeyWindow = 0x20
+
+NSKeyDown = 10
+NSShiftKeyMask = 1 << 17
+NSControlKeyMask = 1 << 18
+NSCommandKeyMask = 1 << 20
+NSDeviceIndependentModifierFlagsMask = 0xffff0000
+
+NSVariableStatusItemLength = -1
+NSAlertDefaultReturn = 1
+NSAlertAlternateReturn = 0
+NSAlertOtherReturn = -1
+
+NSWorkspaceWillSleepNotification = 'NSWorkspaceWillSleepNotification'
+NSWorkspaceDidWakeNotification = 'NSWorkspaceDidWakeNotification'
+
+_MENU_MIN_WIDTH = 100
+_MENU_CHAR_WIDTH = 7
+_MENU_ITEM_PADDING = 40
+_MENU_ITEM_HEIGHT = 22
+
+
+def _counted(func):
+    key = func.__qualname__ if hasattr(func, '__qualname__') else func.__name__
+
+    def wrapper(*args, **kwargs):
+        native_calls[key] += 1
+        return func(*args, **kwargs)
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+# Application
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class NSApplication(_Stub):
+    _shared = None
+
+    @classmethod
+    def sharedApplication(cls):
+        if cls._shared is None:
+            cls._shared = cls.alloc().init()
+        return cls._shared
+
+    def init(self):
+        self._delegate = None
+        self._launched = False
+        return self
+
+    def setDelegate_(self, delegate):
+        self._delegate = delegate
+
+    def delegate(self):
+        return self._delegate
+
+    def activateIgnoringOtherApps_(self, flag):
+        pass
+
+    def sendAction_to_from_(self, action, target, sender):
+        if target is None or not hasattr(target, _selector_name(action)):
+            return False
+        _perform(target, action, sender)
+        return True
+
+    def _finish_launching(self):
+        if not self._launched:
+            self._launched = True
+            if self._delegate is not None and hasattr(self._delegate, 'applicationDidFinishLaunching_'):
+                self._delegate.applicationDidFinishLaunching_(None)
+
+    def terminate_(self, sender):
+        from . import AppHelper
+        if self._delegate is not None and hasattr(self._delegate, 'applicationWillTerminate_'):
+            self._delegate.applicationWillTerminate_(None)
+        AppHelper.stopEventLoop()
+
+
+NSApp = NSApplication.sharedApplication()
+
+
+class NSAppearance(_Stub):
+    @classmethod
+    def appearanceNamed_(cls, name):
+        appearance = cls.alloc().init()
+        appearance.setName_(name)
+        return appearance
+
+
+class NSWorkspace(NSObject):
+    _shared = None
+
+    @classmethod
+    def sharedWorkspace(cls):
+        if cls._shared is None:
+            cls._shared = cls.alloc().init()
+            cls._shared._center = NSNotificationCenter.alloc().init()
+        return cls._shared
+
+    def notificationCenter(self):
+        return self._center
+
+
+# Menus
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class NSMenu(NSObject):
+    def init(self):
+        self._items = []
+        self._delegate = None
+        self._parent_item = None
+        return self
+
+    def initWithTitle_(self, title):
+        self.init()
+        self._props['title'] = title
+        return self
+
+    @_counted
+    def addItem_(self, item):
+        self._attach(item)
+        self._items.append(item)
+
+    @_counted
+    def insertItem_atIndex_(self, item, index):
+        if not 0 <= index <= len(self._items):
+            raise IndexError('menu index {0} out of bounds [0, {1}]'.format(index, len(self._items)))
+        self._attach(item)
+        self._items.insert(index, item)
+
+    @_counted
+    def removeItem_(self, item):
+        self._items.remove(item)
+        item._menu = None
+
+    @_counted
+    def removeItemAtIndex_(self, index):
+        self._items.pop(index)._menu = None
+
+    @_counted
+    def removeAllItems(self):
+        for item in self._items:
+            item._menu = None
+        del self._items[:]
+
+    def _attach(self, item):
+        if item._menu is not None:
+            raise ValueError('Item to be inserted into menu already is in another menu')
+        item._menu = self
+
+    @_counted
+    def indexOfItem_(self, item):
+        for i, existing in enumerate(self._items):
+            if existing is item:
+                return i
+        return -1
+
+    def indexOfItemWithTitle_(self, title):
+        for i, existing in enumerate(self._items):
+            if existing._title == title:
+                return i
+        return -1
+
+    def itemAtIndex_(self, index):
+        return self._items[index]
+
+    def itemWithTitle_(self, title):
+        index = self.indexOfItemWithTitle_(title)
+        return None if index < 0 else self._items[index]
+
+    def itemArray(self):
+        return list(self._items)
+
+    def numberOfItems(self):
+        return len(self._items)
+
+    @_counted
+    def size(self):
+        # a layout pass: every item is measured
+        width = _MENU_MIN_WIDTH
+        height = 0
+        for item in self._items:
+            view = item._view
+            if view is not None:
+                frame = view.frame()
+                width = max(width, frame.size.width)
+                height += frame.size.height
+            else:
+                width = max(width, len(item._title) * _MENU_CHAR_WIDTH + _MENU_ITEM_PADDING)
+                height += _MENU_ITEM_HEIGHT
+        return NSSize(width, height)
+
+    def setDelegate_(self, delegate):
+        self._delegate = delegate
+
+    def delegate(self):
+        return self._delegate
+
+    def supermenu(self):
+        return None if self._parent_item is None else self._parent_item._menu
+
+    def setAutoenablesItems_(self, flag):
+        self._props['autoenablesItems'] = flag
+
+    def title(self):
+        return self._props.get('title', '')
+
+    def setTitle_(self, title):
+        self._props['title'] = title
+
+    def update(self):
+        if self._delegate is not None and hasattr(self._delegate, 'menuNeedsUpdate_'):
+            self._delegate.menuNeedsUpdate_(self)
+
+    def performActionForItemAtIndex_(self, index):
+        item = self._items[index]
+        if item._action is not None and item._enabled:
+            _perform(item._target, item._action, item)
+
+    def _open(self):
+        """Fake-only: the user started tracking this menu."""
+        delegate = self._delegate
+        if delegate is not None:
+            if hasattr(delegate, 'menuNeedsUpdate_'):
+                delegate.menuNeedsUpdate_(self)
+            if hasattr(delegate, 'menuWillOpen_'):
+                delegate.menuWillOpen_(self)
+
+    def _close(self):
+        """Fake-only: the user stopped tracking this menu."""
+        delegate = self._delegate
+        if delegate is not None and hasattr(delegate, 'menuDidClose_'):
+            delegate.menuDidClose_(self)
+
+
+class NSMenuItem(NSObject):
+    def init(self):
+        return self.initWithTitle_action_keyEquivalent_('', None, '')
+
+    def initWithTitle_action_keyEquivalent_(self, title, action, key):
+        self._title = title
+        self._action = action
+        self._key = key
+        self._target = None
+        self._image = None
+        self._state = 0
+        self._hidden = False
+        self._enabled = True
+        self._submenu = None
+        self._view = None
+        self._menu = None
+        self._separator = False
+        return self
+
+    @classmethod
+    def separatorItem(cls):
+        item = cls.alloc().init()
+        item._separator = True
+        return item
+
+    def isSeparatorItem(self):
+        return self._separator
+
+    def title(self):
+        return self._title
+
+    @_counted
+    def setTitle_(self, title):
+        self._title = title
+
+    def action(self):
+        return self._action
+
+    @_counted
+    def setAction_(self, action):
+        self._action = action
+
+    def target(self):
+        return self._target
+
+    @_counted
+    def setTarget_(self, target):
+        self._target = target
+
+    def keyEquivalent(self):
+        return self._key
+
+    @_counted
+    def setKeyEquivalent_(self, key):
+        self._key = key
+
+    def image(self):
+        return self._image
+
+    @_counted
+    def setImage_(self, image):
+        self._image = image
+
+    def state(self):
+        return self._state
+
+    @_counted
+    def setState_(self, state):
+        self._state = state
+
+    def isHidden(self):
+        return self._hidden
+
+    @_counted
+    def setHidden_(self, hidden):
+        self._hidden = bool(hidden)
+
+    def isEnabled(self):
+        return self._enabled
+
+    @_counted
+    def setEnabled_(self, enabled):
+        self._enabled = bool(enabled)
+
+    def submenu(self):
+        return self._submenu
+
+    def hasSubmenu(self):
+        return self._submenu is not None
+
+    @_counted
+    def setSubmenu_(self, submenu):
+        if self._submenu is not None:
+            self._submenu._parent_item = None
+        self._submenu = submenu
+        if submenu is not None:
+            submenu._parent_item = self
+
+    def view(self):
+        return self._view
+
+    @_counted
+    def setView_(self, view):
+        self._view = view
+
+    def menu(self):
+        return self._menu
+
+    def setToolTip_(self, tip):
+        self._props['toolTip'] = tip
+
+    def toolTip(self):
+        return self._props.get('toolTip')
+
+    def setRepresentedObject_(self, obj):
+        self._props['representedObject'] = obj
+
+    def representedObject(self):
+        return self._props.get('representedObject')
+
+    def __repr__(self):
+        return '<NSMenuItem {0!r}>'.format(self._title)
+
+
+class NSStatusBar(NSObject):
+    _system = None
+
+    @classmethod
+    def systemStatusBar(cls):
+        if cls._system is None:
+            cls._system = cls.alloc().init()
+            cls._system._items = []
+        return cls._system
+
+    def statusItemWithLength_(self, length):
+        item = NSStatusItem.alloc().init()
+        item._length = length
+        self._items.append(item)
+        return item
+
+    def removeStatusItem_(self, item):
+        self._items.remove(item)
+
+    def statusItems(self):
+        """Fake-only: status items currently in the status bar."""
+        return list(self._items)
+
+
+class NSStatusItem(NSObject):
+    def init(self):
+        self._title = None
+        self._image = None
+        self._menu = None
+        self._button = NSStatusBarButton.alloc().initWithFrame_(NSMakeRect(0, 0, 22, 22))
+        self._button._status_item = self
+        return self
+
+    def title(self):
+        return self._title
+
+    @_counted
+    def setTitle_(self, title):
+        self._title = title
+
+    def image(self):
+        return self._image
+
+    @_counted
+    def setImage_(self, image):
+        self._image = image
+
+    def menu(self):
+        return self._menu
+
+    @_counted
+    def setMenu_(self, menu):
+        self._menu = menu
+
+    def setHighlightMode_(self, flag):
+        self._props['highlightMode'] = flag
+
+    def button(self):
+        return self._button
+
+    def length(self):
+        return self._length
+
+
+# Views and controls
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class CALayer(_Stub):
+    pass
+
+
+class NSView(_Stub):
+    def init(self):
+        return self.initWithFrame_(NSMakeRect(0, 0, 0, 0))
+
+    def initWithFrame_(self, frame):
+        self._frame = _as_rect(frame)
+        self._subviews = []
+        self._superview = None
+        self._layer = None
+        self._tracking_areas = []
+        return self
+
+    def frame(self):
+        return self._frame
+
+    def bounds(self):
+        return NSRect((0, 0), self._frame.size)
+
+    def setFrame_(self, frame):
+        self._frame = _as_rect(frame)
+
+    def setFrameSize_(self, size):
+        self._frame = NSRect(self._frame.origin, _as_size(size))
+
+    def setFrameOrigin_(self, origin):
+        self._frame = NSRect(tuple(origin), self._frame.size)
+
+    def addSubview_(self, view):
+        if view._superview is not None:
+            view.removeFromSuperview()
+        view._superview = self
+        self._subviews.append(view)
+
+    def subviews(self):
+        return list(self._subviews)
+
+    def superview(self):
+        return self._superview
+
+    def removeFromSuperview(self):
+        if self._superview is not None:
+            self._superview._subviews.remove(self)
+            self._superview = None
+
+    def setWantsLayer_(self, flag):
+        self._props['wantsLayer'] = flag
+        if flag and self._layer is None:
+            self._layer = CALayer.alloc().init()
+
+    def layer(self):
+        return self._layer
+
+    def addTrackingArea_(self, area):
+        self._tracking_areas.append(area)
+
+    def trackingAreas(self):
+        return list(self._tracking_areas)
+
+    def setNeedsDisplay_(self, flag):
+        self._props['needsDisplay'] = flag
+
+
+class NSCell(_Stub):
+    pass
+
+
+class NSControl(NSView):
+    def initWithFrame_(self, frame):
+        super(NSControl, self).initWithFrame_(frame)
+        self._target = None
+        self._action = None
+        self._cell = NSCell.alloc().init()
+        self._props['enabled'] = True
+        self._props['doubleValue'] = 0.0
+        self._props['stringValue'] = ''
+        return self
+
+    def target(self):
+        return self._target
+
+    def setTarget_(self, target):
+        self._target = target
+
+    def action(self):
+        return self._action
+
+    def setAction_(self, action):
+        self._action = action
+
+    def cell(self):
+        return self._cell
+
+    def intValue(self):
+        return int(self._props.get('doubleValue') or 0)
+
+    def sendAction_to_(self, action, target):
+        if action is None:
+            return False
+        _perform(target, action, self)
+        return True
+
+    def performClick_(self, sender):
+        if self._props.get('enabled'):
+            self.sendAction_to_(self._action, self._target)
+
+
+class NSSlider(NSControl):
+    def init(self):
+        self.initWithFrame_(NSMakeRect(0, 0, 0, 0))
+        self._props.update(minValue=0.0, maxValue=1.0)
+        return self
+
+    def setDoubleValue_(self, value):
+        lo, hi = self._props.get('minValue', 0.0), self._props.get('maxValue', 1.0)
+        self._props['doubleValue'] = float(min(max(value, lo), hi))
+
+
+class NSTextField(NSControl):
+    def validateEditing(self):
+        pass
+
+    def stringValue(self):
+        return self._props.get('stringValue', '')
+
+
+class NSSecureTextField(NSTextField):
+    pass
+
+
+class NSButton(NSControl):
+    pass
+
+
+class NSStatusBarButton(NSButton):
+    def performClick_(self, sender):
+        # clicking the status item opens its menu
+        menu = self._status_item._menu
+        if menu is not None:
+            menu._open()
+            menu._close()
+
+
+class NSImageView(NSControl):
+    pass
+
+
+class NSComboBox(NSTextField):
+    def initWithFrame_(self, frame):
+        super(NSComboBox, self).initWithFrame_(frame)
+        self._values = []
+        self._selected = -1
+        return self
+
+    def addItemWithObjectValue_(self, value):
+        self._values.append(value)
+
+    def removeAllItems(self):
+        del self._values[:]
+        self._selected = -1
+
+    def removeItemAtIndex_(self, index):
+        del self._values[index]
+        if self._selected >= len(self._values):
+            self._selected = len(self._values) - 1
+
+    def numberOfItems(self):
+        return len(self._values)
+
+    def objectValues(self):
+        return list(self._values)
+
+    def selectItemAtIndex_(self, index):
+        self._selected = index
+        if 0 <= index < len(self._values):
+            self._props['stringValue'] = self._values[index]
+
+    def indexOfSelectedItem(self):
+        return self._selected
+
+
+class NSTableColumn(_Stub):
+    def initWithIdentifier_(self, identifier):
+        self._props['identifier'] = identifier
+        return self
+
+
+class NSTableView(NSControl):
+    def init(self):
+        self.initWithFrame_(NSMakeRect(0, 0, 0, 0))
+        self._columns = []
+        return self
+
+    def addTableColumn_(self, column):
+        self._columns.append(column)
+
+    def tableColumns(self):
+        return list(self._columns)
+
+    def selectedRow(self):
+        return -1
+
+    def reloadData(self):
+        pass
+
+
+class NSOutlineView(NSTableView):
+    pass
+
+
+class NSBrowserCell(NSCell):
+    pass
+
+
+class NSScrollView(NSView):
+    pass
+
+
+class NSProgressIndicator(NSView):
+    def initWithFrame_(self, frame):
+        super(NSProgressIndicator, self).initWithFrame_(frame)
+        self._props.update(minValue=0.0, maxValue=100.0, doubleValue=0.0, indeterminate=True, animating=False)
+        return self
+
+    def startAnimation_(self, sender):
+        self._props['animating'] = True
+
+    def stopAnimation_(self, sender):
+        self._props['animating'] = False
+
+
+class NSTrackingArea(_Stub):
+    def initWithRect_options_owner_userInfo_(self, rect, options, owner, user_info):
+        self._props.update(rect=rect, options=options, owner=owner, userInfo=user_info)
+        return self
+
+
+class NSWindow(_Stub):
+    pass
+
+
+class NSAlert(_Stub):
+    #: Fake-only: what :meth:`runModal` returns (the "ok" button by default).
+    next_response = NSAlertDefaultReturn
+
+    @classmethod
+    def alertWithMessageText_defaultButton_alternateButton_otherButton_informativeTextWithFormat_(
+            cls, title, ok, cancel, other, message):
+        alert = cls.alloc().init()
+        alert._props.update(messageText=title, informativeText=message % () if message else message,
+                            buttons=[b for b in (ok, cancel, other) if b])
+        alert._window = NSWindow.alloc().init()
+        return alert
+
+    def window(self):
+        return self._window
+
+    def addButtonWithTitle_(self, title):
+        self._props['buttons'].append(title)
+
+    def runModal(self):
+        return type(self).next_response
+
+
+# Drawing
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class NSColor(_Stub):
+    @classmethod
+    def colorWithRed_green_blue_alpha_(cls, r, g, b, a):
+        color = cls.alloc().init()
+        color._rgba = (r, g, b, a)
+        return color
+
+    colorWithSRGBRed_green_blue_alpha_ = colorWithRed_green_blue_alpha_
+    colorWithCalibratedRed_green_blue_alpha_ = colorWithRed_green_blue_alpha_
+
+    @classmethod
+    def colorWithCalibratedWhite_alpha_(cls, white, alpha):
+        return cls.colorWithRed_green_blue_alpha_(white, white, white, alpha)
+
+    def colorWithAlphaComponent_(self, alpha):
+        return type(self).colorWithRed_green_blue_alpha_(*(self._rgba[:3] + (alpha,)))
+
+    def CGColor(self):
+        return self._rgba
+
+    def set(self):
+        pass
+
+    def __repr__(self):
+        return '<NSColor rgba={0!r}>'.format(self._rgba)
+
+
+def _named_color(r, g, b, a=1.0):
+    return classmethod(lambda cls: cls.colorWithRed_green_blue_alpha_(r, g, b, a))
+
+
+for _name, _rgba in (('systemBlueColor', (0.0, 0.48, 1.0)), ('labelColor', (0.0, 0.0, 0.0)),
+                     ('secondaryLabelColor', (0.5, 0.5, 0.5)), ('controlAccentColor', (0.0, 0.48, 1.0)),
+                     ('clearColor', (0.0, 0.0, 0.0, 0.0)), ('whiteColor', (1.0, 1.0, 1.0)),
+                     ('blackColor', (0.0, 0.0, 0.0)), ('redColor', (1.0, 0.0, 0.0))):
+    setattr(NSColor, _name, _named_color(*_rgba))
+del _name, _rgba
+
+
+class NSFont(_Stub):
+    @classmethod
+    def systemFontOfSize_(cls, size):
+        return cls.systemFontOfSize_weight_(size, NSFontWeightRegular)
+
+    @classmethod
+    def systemFontOfSize_weight_(cls, size, weight):
+        font = cls.alloc().init()
+        font._props.update(pointSize=size, weight=weight)
+        return font
+
+
+class NSBezierPath(_Stub):
+    @classmethod
+    def bezierPath(cls):
+        return cls.alloc().init()
+
+    def appendBezierPathWithOvalInRect_(self, rect):
+        pass
+
+    def appendBezierPathWithArcWithCenter_radius_startAngle_endAngle_clockwise_(self, center, radius, start, end,
+                                                                                 clockwise):
+        pass
+
+    def stroke(self):
+        pass
+
+    def fill(self):
+        pass
+
+
+class NSImage(_Stub):
+    _DEFAULT_SIZE = (32, 32)
+
+    def init(self):
+        self._props['size'] = NSSize(*self._DEFAULT_SIZE)
+        return self
+
+    def initByReferencingFile_(self, path):
+        self.init()
+        self._props['path'] = path
+        return self
+
+    initWithContentsOfFile_ = initByReferencingFile_
+
+    @classmethod
+    def imageNamed_(cls, name):
+        image = cls.alloc().init()
+        image._props['name'] = name
+        return image
+
+    @classmethod
+    def imageWithSystemSymbolName_accessibilityDescription_(cls, name, description):
+        image = cls.imageNamed_(name)
+        image._props['accessibilityDescription'] = description
+        return image
+
+    def imageWithSymbolConfiguration_(self, config):
+        image = type(self).alloc().init()
+        image._props.update(self._props)
+        image._props['symbolConfiguration'] = config
+        return image
+
+    def setSize_(self, size):
+        self._props['size'] = _as_size(size)
+
+    def copy(self):
+        image = type(self).alloc().init()
+        image._props.update(self._props)
+        return image
+
+    def path(self):
+        """Fake-only: file the image references."""
+        return self._props.get('path')
+
+
+class NSImageSymbolConfiguration(_Stub):
+    @classmethod
+    def _with(cls, **traits):
+        config = cls.alloc().init()
+        config._props.update(traits)
+        return config
+
+    @classmethod
+    def configurationWithPointSize_weight_scale_(cls, point_size, weight, scale):
+        return cls._with(pointSize=point_size, weight=weight, scale=scale)
+
+    @classmethod
+    def configurationWithPointSize_weight_(cls, point_size, weight):
+        return cls._with(pointSize=point_size, weight=weight)
+
+    @classmethod
+    def configurationWithTextStyle_scale_(cls, text_style, scale):
+        return cls._with(textStyle=text_style, scale=scale)
+
+    @classmethod
+    def configurationWithTextStyle_(cls, text_style):
+        return cls._with(textStyle=text_style)
+
+    @classmethod
+    def configurationWithScale_(cls, scale):
+        return cls._with(scale=scale)
+
+    @classmethod
+    def configurationWithPaletteColors_(cls, colors):
+        return cls._with(paletteColors=list(colors))
+
+    @classmethod
+    def configurationWithHierarchicalColor_(cls, color):
+        return cls._with(hierarchicalColor=color)
+
+    @classmethod
+    def preferringMulticolor(cls):
+        return cls._with(multicolor=True)
+
+    def configurationByApplyingConfiguration_(self, other):
+        config = type(self)._with(**self._props)
+        config._props.update(other._props)
+        return config
@@ -0,0 +1,656 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.backends.fake.Foundation
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+In-memory stand-in for the parts of PyObjC's ``Foundation`` used by rumps.
+
+Time is virtual: :class:`NSDate` reads a clock that only moves when the run loop is run (see
+:meth:`NSRunLoop.runUntilDate_`), so an hour of timers can be simulated in milliseconds and deterministically.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+from __future__ import print_function
+
+import collections
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+#: Number of native calls made on menu-related objects, keyed by ``'Class.selector'``.
+native_calls = collections.Counter()
+
+
+def _selector_name(selector):
+    if isinstance(selector, bytes):
+        selector = selector.decode('ascii')
+    return selector.replace(':', '_')
+
+
+def _perform(target, selector, argument):
+    """Send `selector` to `target` the way Cocoa dispatches target-action messages."""
+    if callable(selector):
+        return selector(argument)
+    return getattr(target, _selector_name(selector))(argument)
+
+
+# Structures
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class _Struct(object):
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(tuple(getattr(self, f) for f in self.__slots__))
+
+    def __getitem__(self, i):
+        return tuple(self)[i]
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        try:
+            return tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(type(self).__name__, ' '.join('{0}={1!r}'.format(f, getattr(self, f))
+                                                               for f in self.__slots__))
+
+
+class NSPoint(_Struct):
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x=0.0, y=0.0):
+        self.x, self.y = x, y
+
+
+class NSSize(_Struct):
+    __slots__ = ('width', 'height')
+
+    def __init__(self, width=0.0, height=0.0):
+        self.width, self.height = width, height
+
+
+class NSRect(_Struct):
+    __slots__ = ('origin', 'size')
+
+    def __init__(self, origin=(0.0, 0.0), size=(0.0, 0.0)):
+        self.origin = origin if isinstance(origin, NSPoint) else NSPoint(*origin)
+        self.size = size if isinstance(size, NSSize) else NSSize(*size)
+
+
+class NSRange(_Struct):
+    __slots__ = ('location', 'length')
+
+    def __init__(self, location=0, length=0):
+        self.location, self.length = location, length
+
+
+def NSMakePoint(x, y):
+    return NSPoint(x, y)
+
+
+def NSMakeSize(w, h):
+    return NSSize(w, h)
+
+
+def NSMakeRect(x, y, w, h):
+    return NSRect(NSPoint(x, y), NSSize(w, h))
+
+
+def NSMakeRange(location, length):
+    return NSRange(location, length)
+
+
+def _as_size(value):
+    return value if isinstance(value, NSSize) else NSSize(*value)
+
+
+def _as_rect(value):
+    if isinstance(value, NSRect):
+        return value
+    if len(value) == 2:
+        return NSRect(*value)
+    return NSMakeRect(*value)
+
+
+# Objects
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class NSObject(object):
+    """Root class. Instances are created with ``alloc().init...()`` like their Objective-C counterparts; Python
+    subclasses may add attributes and methods freely.
+    """
+
+    @classmethod
+    def alloc(cls):
+        self = object.__new__(cls)
+        self._props = {}
+        return self
+
+    @classmethod
+    def new(cls):
+        return cls.alloc().init()
+
+    def init(self):
+        return self
+
+    def respondsToSelector_(self, selector):
+        return hasattr(self, _selector_name(selector))
+
+    def performSelectorOnMainThread_withObject_waitUntilDone_(self, selector, argument, wait):
+        from . import AppHelper
+        if wait and threading.current_thread() is threading.main_thread():
+            _perform(self, selector, argument)
+        else:
+            AppHelper.callAfter(_perform, self, selector, argument)
+
+
+class _Stub(NSObject):
+    """Object answering any unary accessor: ``setFoo_(x)`` stores `x` so that ``foo()`` (or ``isFoo()``) returns it.
+    Accessors that were never set return ``None``.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        props = self.__dict__.get('_props')
+        if props is None:
+            raise AttributeError(name)
+        if name.startswith('set') and name[3:4].isupper() and name.endswith('_') and name.count('_') == 1:
+            key = name[3].lower() + name[4:-1]
+
+            def setter(value):
+                props[key] = value
+            return setter
+        if name.endswith('_'):
+            raise AttributeError('{0} does not respond to {1}'.format(type(self).__name__, name))
+        if name.startswith('is') and name[2:3].isupper():
+            key = name[2].lower() + name[3:]
+        else:
+            key = name
+        return lambda: props.get(key)
+
+
+class NSString(str):
+    @classmethod
+    def alloc(cls):
+        return cls()
+
+    def initWithString_(self, s):
+        return type(self)(s)
+
+    @classmethod
+    def stringWithString_(cls, s):
+        return cls(s)
+
+
+class NSData(bytes):
+    @classmethod
+    def alloc(cls):
+        return cls()
+
+    def initWithData_(self, b):
+        return type(self)(b)
+
+    def length(self):
+        return len(self)
+
+
+class NSMutableDictionary(dict):
+    @classmethod
+    def alloc(cls):
+        return cls()
+
+    def init(self):
+        return self
+
+    def setDictionary_(self, d):
+        self.clear()
+        self.update(d)
+
+
+class NSArray(list):
+    def objectAtIndex_(self, i):
+        return self[i]
+
+    def count(self, *args):
+        if args:
+            return list.count(self, *args)
+        return len(self)
+
+
+def NSLog(fmt, *args):
+    print(fmt.replace('%@', '%s') % args if args else fmt, file=sys.stderr)
+
+
+def NSSearchPathForDirectoriesInDomains(directory, domain, expand):
+    # only NSApplicationSupportDirectory/NSUserDomainMask is used; keep it out of the user's real home directory
+    path = os.environ.get('RUMPS_FAKE_APPLICATION_SUPPORT') or os.path.join(
+        tempfile.gettempdir(), 'rumps-fake-backend', 'Application Support')
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    return NSArray([path])
+
+
+class NSUserDefaults(_Stub):
+    _standard = None
+
+    @classmethod
+    def standardUserDefaults(cls):
+        if cls._standard is None:
+            cls._standard = cls.alloc().init()
+        return cls._standard
+
+    def stringForKey_(self, key):
+        value = self._props.get(key)
+        return value if isinstance(value, str) else None
+
+    def setObject_forKey_(self, value, key):
+        self._props[key] = value
+
+
+class NSThread(NSObject):
+    @classmethod
+    def isMainThread(cls):
+        return threading.current_thread() is threading.main_thread()
+
+
+# Notifications
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class NSNotification(NSObject):
+    @classmethod
+    def notificationWithName_object_userInfo_(cls, name, obj, user_info):
+        self = cls.alloc().init()
+        self._name, self._object, self._user_info = name, obj, user_info
+        return self
+
+    def name(self):
+        return self._name
+
+    def object(self):
+        return self._object
+
+    def userInfo(self):
+        return self._user_info
+
+
+class NSNotificationCenter(NSObject):
+    _default = None
+
+    @classmethod
+    def defaultCenter(cls):
+        if cls._default is None:
+            cls._default = cls.alloc().init()
+        return cls._default
+
+    def init(self):
+        self._observers = []
+        return self
+
+    def addObserver_selector_name_object_(self, observer, selector, name, obj):
+        self._observers.append((observer, selector, name, obj))
+
+    def removeObserver_(self, observer):
+        self._observers = [o for o in self._observers if o[0] is not observer]
+
+    def postNotificationName_object_userInfo_(self, name, obj, user_info):
+        notification = NSNotification.notificationWithName_object_userInfo_(name, obj, user_info)
+        for observer, selector, observed_name, observed_obj in list(self._observers):
+            if observed_name not in (None, name) or observed_obj not in (None, obj):
+                continue
+            _perform(observer, selector, notification)
+
+    def postNotificationName_object_(self, name, obj):
+        self.postNotificationName_object_userInfo_(name, obj, None)
+
+
+class NSUserNotification(_Stub):
+    def init(self):
+        self._props['activationType'] = 1  # NSUserNotificationActivationTypeContentsClicked
+        return self
+
+    def set_identityImage_(self, image):
+        self._props['identityImage'] = image
+
+    def set_showsButtons_(self, flag):
+        self._props['showsButtons'] = flag
+
+    def set_ignoresDoNotDisturb_(self, flag):
+        self._props['ignoresDoNotDisturb'] = flag
+
+    def actualDeliveryDate(self):
+        return self._props.get('actualDeliveryDate') or self._props.get('deliveryDate')
+
+
+class NSUserNotificationCenter(NSObject):
+    _default = None
+
+    @classmethod
+    def defaultUserNotificationCenter(cls):
+        if cls._default is None:
+            cls._default = cls.alloc().init()
+        return cls._default
+
+    def init(self):
+        self._delegate = None
+        self._scheduled = []
+        self._delivered = []
+        return self
+
+    def setDelegate_(self, delegate):
+        self._delegate = delegate
+
+    def delegate(self):
+        return self._delegate
+
+    def scheduleNotification_(self, notification):
+        self._scheduled.append(notification)
+
+    def deliverNotification_(self, notification):
+        self._delivered.append(notification)
+
+    def scheduledNotifications(self):
+        return NSArray(self._scheduled)
+
+    def deliveredNotifications(self):
+        return NSArray(self._delivered)
+
+    def removeDeliveredNotification_(self, notification):
+        for notifications in (self._delivered, self._scheduled):
+            if notification in notifications:
+                notifications.remove(notification)
+
+    def removeAllDeliveredNotifications(self):
+        del self._delivered[:]
+
+    def activateNotification_(self, notification):
+        """Fake-only: behave as if the user clicked `notification` in Notification Center."""
+        notification.setActualDeliveryDate_(NSDate.date())
+        self._delegate.userNotificationCenter_didActivateNotification_(self, notification)
+
+
+# Time
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+class _Clock(object):
+    """Virtual wall clock in seconds since 1970. Only the run loop moves it forward."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def advance_to(self, t):
+        if t > self.now:
+            self.now = t
+
+
+_clock = _Clock()
+
+
+class NSDate(NSObject):
+    @classmethod
+    def _at(cls, t):
+        self = cls.alloc()
+        self._t = t
+        return self
+
+    @classmethod
+    def date(cls):
+        return cls._at(_clock.now)
+
+    @classmethod
+    def dateWithTimeIntervalSinceNow_(cls, seconds):
+        return cls._at(_clock.now + seconds)
+
+    @classmethod
+    def dateWithTimeInterval_sinceDate_(cls, seconds, date):
+        return cls._at(date._t + seconds)
+
+    @classmethod
+    def dateWithTimeIntervalSince1970_(cls, seconds):
+        return cls._at(seconds)
+
+    @classmethod
+    def distantFuture(cls):
+        return cls._at(float('inf'))
+
+    def timeIntervalSinceNow(self):
+        return self._t - _clock.now
+
+    def timeIntervalSinceDate_(self, other):
+        return self._t - other._t
+
+    def timeIntervalSince1970(self):
+        return self._t
+
+    def dateByAddingTimeInterval_(self, seconds):
+        return type(self)._at(self._t + seconds)
+
+    def __repr__(self):
+        return '<NSDate {0:.6f}>'.format(self._t)
+
+
+class NSTimer(NSObject):
+    def initWithFireDate_interval_target_selector_userInfo_repeats_(self, date, interval, target, selector,
+                                                                     user_info, repeats):
+        self._fire_at = date._t
+        self._interval = max(float(interval), 0.0001) if repeats else float(interval)
+        self._target = target
+        self._selector = selector
+        self._user_info = user_info
+        self._repeats = bool(repeats)
+        self._tolerance = 0.0
+        self._valid = True
+        self._heap_seq = None
+        self._run_loop = None
+        return self
+
+    @classmethod
+    def timerWithTimeInterval_target_selector_userInfo_repeats_(cls, interval, target, selector, user_info,
+                                                                 repeats):
+        return cls.alloc().initWithFireDate_interval_target_selector_userInfo_repeats_(
+            NSDate.dateWithTimeIntervalSinceNow_(interval), interval, target, selector, user_info, repeats)
+
+    @classmethod
+    def scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(cls, interval, target, selector, user_info,
+                                                                          repeats):
+        t = cls.timerWithTimeInterval_target_selector_userInfo_repeats_(interval, target, selector, user_info,
+                                                                         repeats)
+        NSRunLoop.currentRunLoop().addTimer_forMode_(t, NSDefaultRunLoopMode)
+        return t
+
+    def timeInterval(self):
+        return self._interval if self._repeats else 0.0
+
+    def fireDate(self):
+        return NSDate._at(self._fire_at)
+
+    def setFireDate_(self, date):
+        self._fire_at = date._t
+        if self._run_loop is not None:
+            self._run_loop._reschedule(self)
+
+    def tolerance(self):
+        return self._tolerance
+
+    def setTolerance_(self, tolerance):
+        self._tolerance = max(0.0, float(tolerance))
+        if self._run_loop is not None:
+            self._run_loop._reschedule(self)
+
+    def userInfo(self):
+        return self._user_info
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+
+    def fire(self):
+        if self._valid:
+            _perform(self._target, self._selector, self)
+            if not self._repeats:
+                self._valid = False
+
+
+NSDefaultRunLoopMode = 'kCFRunLoopDefaultMode'
+NSRunLoopCommonModes = 'kCFRunLoopCommonModes'
+NSEventTrackingRunLoopMode = 'NSEventTrackingRunLoopMode'
+NSModalPanelRunLoopMode = 'NSModalPanelRunLoopMode'
+
+
+class NSRunLoop(NSObject):
+    """Run loop over the virtual clock.
+
+    Timers are kept in a heap ordered by the latest moment each may fire (fire date plus tolerance). A wakeup happens
+    at that moment and fires every timer whose fire date has been reached, so timers with overlapping tolerance windows
+    are coalesced into one wakeup like the real run loop does.
+    """
+
+    _main = None
+    _others = weakref.WeakKeyDictionary()  # thread -> its run loop, which nothing ever runs
+    _others_lock = threading.Lock()
+
+    @classmethod
+    def mainRunLoop(cls):
+        if cls._main is None:
+            cls._main = cls.alloc().init()
+        return cls._main
+
+    @classmethod
+    def currentRunLoop(cls):
+        """The main run loop on the main thread, and a run loop of its own on any other thread: as in a real app, where
+        nothing runs the run loop of a worker thread, timers added to it never fire."""
+        thread = threading.current_thread()
+        if thread is threading.main_thread():
+            return cls.mainRunLoop()
+        with cls._others_lock:
+            run_loop = cls._others.get(thread)
+            if run_loop is None:
+                run_loop = cls._others[thread] = cls.alloc().init()
+        return run_loop
+
+    @classmethod
+    def _reset(cls):
+        cls._main = None
+        with cls._others_lock:
+            cls._others.clear()
+
+    def init(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = collections.deque()
+        self._pending_event = threading.Event()
+        #: Number of times the loop woke up to fire timers.
+        self.wakeups = 0
+        return self
+
+    def addTimer_forMode_(self, timer, mode):
+        timer._run_loop = self
+        self._reschedule(timer)
+
+    def _reschedule(self, timer):
+        seq = timer._heap_seq = next(self._seq)
+        heapq.heappush(self._heap, (timer._fire_at + timer._tolerance, seq, timer))
+
+    def _post(self, func, args, kwargs):
+        self._pending.append((func, args, kwargs))
+        self._pending_event.set()
+
+    def _drain(self):
+        ran = False
+        pending = self._pending
+        self._pending_event.clear()
+        while pending:
+            func, args, kwargs = pending.popleft()
+            func(*args, **kwargs)
+            ran = True
+        return ran
+
+    @staticmethod
+    def _live(entry):
+        timer = entry[2]
+        return timer._valid and timer._heap_seq == entry[1]
+
+    def _prune(self):
+        heap = self._heap
+        while heap and not self._live(heap[0]):
+            heapq.heappop(heap)  # invalidated or rescheduled since it was pushed
+
+    def has_timers(self):
+        """Fake-only: whether any valid timer is scheduled."""
+        self._prune()
+        return bool(self._heap)
+
+    def next_wakeup(self):
+        """Fake-only: virtual time of the next wakeup, or ``None`` when no timer is scheduled."""
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def _run_once(self, limit):
+        """Run pending calls then the next wakeup if it is not later than `limit`. Return whether anything ran."""
+        ran = self._drain()
+        wake_at = self.next_wakeup()
+        if wake_at is None or wake_at > limit:
+            return ran
+        _clock.advance_to(wake_at)
+        self.wakeups += 1
+        now = _clock.now
+        due, rest = [], []
+        for entry in self._heap:
+            if self._live(entry):
+                (due if entry[2]._fire_at <= now else rest).append(entry)
+        heapq.heapify(rest)
+        self._heap = rest
+        due.sort(key=lambda entry: (entry[2]._fire_at, entry[1]))
+        for _, seq, timer in due:
+            if not timer._valid or timer._heap_seq != seq:
+                continue
+            fired_at = timer._fire_at
+            _perform(timer._target, timer._selector, timer)
+            if not timer._repeats:
+                timer._valid = False
+            elif timer._valid and timer._heap_seq == seq:  # not rescheduled by the callback
+                next_fire = fired_at + timer._interval
+                if next_fire <= _clock.now:  # skip missed fires like NSTimer
+                    missed = (_clock.now - fired_at) // timer._interval
+                    next_fire = fired_at + (missed + 1) * timer._interval
+                timer._fire_at = next_fire
+                self._reschedule(timer)
+        self._drain()
+        return True
+
+    def runUntilDate_(self, date):
+        limit = date._t
+        while self._run_once(limit):
+            pass
+        _clock.advance_to(limit)
+
+    def runMode_beforeDate_(self, mode, date):
+        ran = self._run_once(date._t)
+        if not ran:
+            _clock.advance_to(date._t)
+        return True
+
+    def run_for(self, seconds):
+        """Fake-only: run the loop for `seconds` of virtual time."""
+        self.runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(seconds))
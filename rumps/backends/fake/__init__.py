@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.backends.fake
+~~~~~~~~~~~~~~~~~~~
+
+Headless, in-memory replacement for the PyObjC modules rumps imports. Selected with ``RUMPS_BACKEND=fake`` (see
+:mod:`rumps.backends`), which registers :mod:`.Foundation`, :mod:`.AppKit`, :mod:`.objc` and :mod:`.AppHelper` under
+their PyObjC names before rumps imports them.
+
+Applications are then driven through the same Cocoa calls the real frameworks would receive, plus a few helpers:
+
+.. code-block:: python
+
+    import os
+    os.environ['RUMPS_BACKEND'] = 'fake'
+
+    import rumps
+    from rumps.backends import fake
+
+    app = rumps.App('Demo', menu=['Ping'])
+    ...
+    fake.launch(app)                # what App.run does, minus the blocking event loop
+    fake.click(app.menu['Ping'])    # dispatch a click through NSApp.callback_
+    fake.run_for(60)                # one minute of timers in virtual time
+    fake.reset()                    # start over with fresh global state
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import sys
+
+from . import Foundation, AppKit, objc, AppHelper
+
+native_calls = Foundation.native_calls
+
+_MODULES = {
+    'Foundation': Foundation,
+    'AppKit': AppKit,
+    'objc': objc,
+    'PyObjCTools.AppHelper': AppHelper,
+}
+
+
+def install():
+    """Register the fake modules under their PyObjC names. Must happen before :mod:`rumps` is imported."""
+    for name, module in _MODULES.items():
+        existing = sys.modules.get(name)
+        if existing is not None and existing is not module:
+            from ...exceptions import RumpsError
+            raise RumpsError('cannot install the fake backend: {0!r} is already imported from {1}'.format(
+                name, getattr(existing, '__file__', existing)))
+    tools = sys.modules.get('PyObjCTools')
+    if tools is None:
+        import types
+        tools = sys.modules['PyObjCTools'] = types.ModuleType('PyObjCTools')
+        tools.__path__ = []
+    tools.AppHelper = AppHelper
+    sys.modules.update(_MODULES)
+
+
+def reset():
+    """Drop all global fake state: scheduled timers and pending calls, status items, notifications, delegates and
+    native call counts. The virtual clock keeps its current time.
+    """
+    Foundation.NSRunLoop._reset()
+    Foundation.NSNotificationCenter._default = None
+    Foundation.NSUserNotificationCenter._default = None
+    Foundation.NSUserDefaults._standard = None
+    AppKit.NSStatusBar._system = None
+    AppKit.NSWorkspace._shared = None
+    AppKit.NSApp.init()
+    AppKit.NSAlert.next_response = AppKit.NSAlertDefaultReturn
+    native_calls.clear()
+    notifications = sys.modules.get('rumps.notifications')
+    if notifications is not None:  # which keeps the default notification center once looked up
+        notifications._notification_center = None
+
+
+def now():
+    """Current virtual time in seconds since 1970."""
+    return Foundation._clock.now
+
+
+def run_for(seconds):
+    """Run the main run loop for `seconds` of virtual time, firing due timers and pending calls."""
+    Foundation.NSRunLoop.mainRunLoop().run_for(seconds)
+
+
+def run_pending():
+    """Run calls posted with :func:`PyObjCTools.AppHelper.callAfter` without advancing time."""
+    Foundation.NSRunLoop.mainRunLoop()._drain()
+
+
+def launch(app, **options):
+    """Do everything :meth:`rumps.App.run` does except entering the blocking event loop: set up the delegate, start
+    decorated timers, register decorated callbacks, build the status item and emit ``before_start``.
+    """
+    runner = AppHelper.runEventLoop
+    AppHelper.runEventLoop = lambda *args, **kwargs: AppKit.NSApp._finish_launching()
+    try:
+        app.run(**options)
+    finally:
+        AppHelper.runEventLoop = runner
+
+
+def _action_target(obj):
+    """Find the control which sends the action for `obj`: a rumps widget, NSMenuItem or NSControl."""
+    native = getattr(obj, '_menuitem', obj)
+    if isinstance(native, AppKit.NSMenuItem) and native.view() is None:
+        return native
+    views = [native.view() if isinstance(native, AppKit.NSMenuItem) else native]
+    while views:
+        view = views.pop(0)
+        if getattr(view, '_action', None) is not None:
+            return view
+        views.extend(view.subviews())
+    raise ValueError('{0!r} has no control with an action'.format(obj))
+
+
+def click(obj):
+    """Click `obj` (a rumps menu item or widget, an NSMenuItem or an NSControl) and return what its callback
+    returned.
+    """
+    native = _action_target(obj)
+    if isinstance(native, AppKit.NSMenuItem):
+        if native._action is None or not native._enabled:
+            return None
+        return Foundation._perform(native._target, native._action, native)
+    if not native._props.get('enabled'):
+        return None
+    return Foundation._perform(native._target, native._action, native)
+
+
+def open_menu(obj):
+    """Simulate the user opening the menu of `obj` (a rumps ``Menu``/``MenuItem`` or an NSMenu): its delegate gets
+    ``menuNeedsUpdate:`` and ``menuWillOpen:``, then ``menuDidClose:``.
+    """
+    menu = getattr(obj, '_menu', obj)
+    if menu is not None:
+        menu._open()
+        menu._close()
+
+
+def post_workspace_notification(name):
+    """Post an ``NSWorkspace`` notification such as ``NSWorkspaceWillSleepNotification``."""
+    AppKit.NSWorkspace.sharedWorkspace().notificationCenter().postNotificationName_object_(name, None)
+
+
+def activate_notification(ns_user_notification=None):
+    """Behave as if the user clicked a notification (the most recently scheduled one by default)."""
+    center = Foundation.NSUserNotificationCenter.defaultUserNotificationCenter()
+    if ns_user_notification is None:
+        ns_user_notification = center.scheduledNotifications()[-1]
+    center.activateNotification_(ns_user_notification)
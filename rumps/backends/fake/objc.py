@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.backends.fake.objc
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+In-memory stand-in for the parts of PyObjC's ``objc`` module used by rumps.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import builtins
+
+nil = None
+YES = True
+NO = False
+
+# fake classes are plain Python classes so cooperative super() is all objc.super has to be
+super = builtins.super
+
+
+class error(Exception):
+    pass
+
+
+def python_method(func):
+    return func
+
+
+def selector(func, selector=None, signature=None, isClassMethod=False):
+    return classmethod(func) if isClassMethod else func
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.circular_progress
+~~~~~~~~~~~~~~~~~~~~~~~
+
+The view drawn by :class:`rumps.CircularProgressMenuItem`. Kept apart so that the Objective-C class is only
+registered once such a menu item is made.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import objc
+from AppKit import NSView, NSColor, NSBezierPath, NSRoundLineCapStyle, NSMakeRect, NSMakePoint
+
+
+class CircularProgressView(NSView):
+    """Custom view that draws a circular progress indicator using AppKit."""
+
+    def initWithFrame_value_color_lineWidth_(self, frame, value, color, line_width):
+        self = objc.super(CircularProgressView, self).initWithFrame_(frame)
+        if self:
+            self._value = float(value) if value is not None else 0.0   # 0..1
+            self._color = color or NSColor.colorWithSRGBRed_green_blue_alpha_(0x7F/255.0, 0x84/255.0, 0x8A/255.0, 1.0)
+            self._line_width = max(2.0, float(line_width) if line_width else 8.0)
+            self.setWantsLayer_(True)  # smoother on HiDPI
+        return self
+
+    def drawRect_(self, _rect):
+        # Geometry
+        bounds = self.bounds()
+        w, h = bounds.size.width, bounds.size.height
+        cx, cy = w * 0.5, h * 0.5
+        # Use half the stroke so the ring stays inside the view
+        radius = max(0.0, min(w, h) * 0.5 - self._line_width * 0.5)
+        if radius <= 0:
+            return
+
+        # --- Track (background ring) ---
+        track = NSBezierPath.bezierPath()
+        track.setLineWidth_(self._line_width)
+        track.appendBezierPathWithOvalInRect_(NSMakeRect(cx - radius, cy - radius, radius * 2, radius * 2))
+        NSColor.colorWithCalibratedWhite_alpha_(0.17, 1.0).set()  # light gray
+        track.stroke()
+
+        # --- Progress arc ---
+        v = max(0.0, min(1.0, float(self._value)))
+        if v > 0.0:
+            start_deg = 90.0                      # 12 o'clock
+            end_deg = start_deg - (v * 360.0)     # clockwise
+            arc = NSBezierPath.bezierPath()
+            arc.setLineWidth_(self._line_width)
+            arc.setLineCapStyle_(NSRoundLineCapStyle)
+            # IMPORTANT: angles are in DEGREES (do NOT convert to radians)
+            arc.appendBezierPathWithArcWithCenter_radius_startAngle_endAngle_clockwise_(
+                NSMakePoint(cx, cy), radius, start_deg, end_deg, True
+            )
+            (self._color or NSColor.systemBlueColor()).set()
+            arc.stroke()
+
+    # Public setters
+    def setValue_(self, value):
+        self._value = max(0.0, min(1.0, float(value)))
+        self.setNeedsDisplay_(True)
+
+    def setColor_(self, color):
+        self._color = color
+        self.setNeedsDisplay_(True)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.dispatch
+~~~~~~~~~~~~~~
+
+Running code on the main thread from other threads, and callbacks away from it.
+
+AppKit objects, and so every rumps menu item, widget and the application itself, must only be changed from the main
+thread. Worker threads hand the change to :func:`call_on_main` instead and get a future for its result.
+
+Callbacks run on the main thread by default and the menu bar is unresponsive while they do. Slow ones can be moved to
+a worker thread or process with :func:`execution_policy`; :func:`set_main_thread_budget` finds them.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import collections
+import threading
+import traceback
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from PyObjCTools import AppHelper
+
+from . import _internal
+
+QueueStats = collections.namedtuple('QueueStats', 'completed cancelled passes pending')
+
+
+class MainThreadQueue(object):
+    """Queue of calls to run on the main thread.
+
+    Submitting appends to a deque, which needs no lock, and posts a single drain to the main run loop with
+    ``AppHelper.callAfter`` unless one is already posted. Each drain runs every call queued when it starts, in
+    submission order, so calls made in quick succession by any number of threads share one run loop pass.
+    """
+
+    def __init__(self):
+        self._calls = collections.deque()
+        self._lock = threading.Lock()
+        self._posted = False
+        self.completed = self.cancelled = self.passes = 0
+
+    def submit(self, func, *args, **kwargs):
+        """Queue ``func(*args, **kwargs)`` and return a :class:`concurrent.futures.Future` for its result. `func`
+        receives the running :class:`rumps.App` as `self` if it is one of its methods.
+        """
+        future = Future()
+        self._calls.append((future, func, args, kwargs))
+        if not self._posted:
+            with self._lock:
+                post, self._posted = not self._posted, True
+            if post:
+                AppHelper.callAfter(self._drain)
+        return future
+
+    def stats(self):
+        """Return the number of calls completed and cancelled before they ran, of drain passes and of calls waiting
+        as a named tuple."""
+        return QueueStats(self.completed, self.cancelled, self.passes, len(self._calls))
+
+    def _drain(self):
+        with self._lock:
+            self._posted = False  # calls submitted from now on post another drain
+        calls = self._calls
+        for _ in range(len(calls)):
+            future, func, args, kwargs = calls.popleft()
+            if not future.set_running_or_notify_cancel():
+                self.cancelled += 1
+                continue
+            try:
+                result = _internal.call_callback('call_on_main', func, *args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            self.completed += 1
+        self.passes += 1
+
+
+main_queue = MainThreadQueue()
+
+
+def call_on_main(func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` on the main thread during the next pass of the application run loop and return a
+    :class:`concurrent.futures.Future` for the result. Safe to call from any thread.
+
+    .. code-block:: python
+
+        def download(url, item):
+            data = fetch(url)  # in a worker thread
+            rumps.call_on_main(setattr, item, 'title', '{0} bytes'.format(len(data)))
+
+    """
+    return main_queue.submit(func, *args, **kwargs)
+
+
+# Execution policies
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+POLICIES = ('main', 'thread', 'process')
+
+_workers = {'thread': 4, 'process': None}  # max_workers; None for the executor's default
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def execution_policy(policy, on_result=None, on_error=None):
+    """Decorator choosing where a callback runs. Works with every kind of callback: :func:`rumps.clicked`,
+    :func:`rumps.timer`, widgets, events and :meth:`rumps.MenuItem.set_callback`, in any order.
+
+    - ``'main'``: on the main thread, which is the default.
+    - ``'thread'``: in a shared, bounded pool of worker threads (see :func:`configure_workers`). The callback gets the
+      usual arguments; it should only read from them and hand changes to the interface back with `on_result` or
+      :func:`call_on_main`.
+    - ``'process'``: in a shared pool of worker processes. The callback is called without arguments so it must be a
+      module level function, and its return value must be picklable.
+
+    When the callback finishes, `on_result` is called on the main thread with the arguments of the callback followed
+    by the return value, or `on_error` with the arguments followed by the exception. Without `on_error`, the
+    traceback is printed. Either may be a method of the :class:`rumps.App` subclass.
+
+    .. code-block:: python
+
+        def built(sender, returncode):
+            sender.title = 'Build ({0})'.format('ok' if returncode == 0 else 'failed')
+
+        @rumps.clicked('Build')
+        @rumps.execution_policy('thread', on_result=built)
+        def build(sender):
+            return subprocess.call(['make'])
+
+    :param policy: ``'main'``, ``'thread'`` or ``'process'``.
+    :param on_result: called on the main thread with the arguments and the return value.
+    :param on_error: called on the main thread with the arguments and the exception.
+    """
+    if policy not in POLICIES:
+        raise ValueError('policy must be one of {0}, not {1!r}'.format(', '.join(POLICIES), policy))
+
+    def decorator(f):
+        if policy == 'main':
+            f.__dict__.pop('*policy', None)
+        else:
+            setattr(f, '*policy', (policy, on_result, on_error))
+        return f
+    return decorator
+
+
+def configure_workers(threads=None, processes=None):
+    """Set the maximum number of worker threads and processes running callbacks with the ``'thread'`` and
+    ``'process'`` policies. Pools already started finish their work in the background and are replaced.
+
+    :param threads: the size of the thread pool, 4 by default.
+    :param processes: the size of the process pool, the number of processors by default.
+    """
+    with _executors_lock:
+        for name, size in (('thread', threads), ('process', processes)):
+            if size is not None:
+                _workers[name] = size
+                executor = _executors.pop(name, None)
+                if executor is not None:
+                    executor.shutdown(wait=False)
+
+
+def shutdown_workers(wait=False):
+    """Stop the worker pools. Called when the application quits."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+def _executor(policy):
+    with _executors_lock:
+        executor = _executors.get(policy)
+        if executor is None:
+            if policy == 'thread':
+                executor = ThreadPoolExecutor(_workers['thread'], thread_name_prefix='rumps-callback')
+            else:
+                from concurrent.futures import ProcessPoolExecutor  # imports multiprocessing, so only when needed
+                executor = ProcessPoolExecutor(_workers['process'])
+            _executors[policy] = executor
+        return executor
+
+
+def run_with_policy(spec, func, resolved, args, kwargs):
+    policy, on_result, on_error = spec
+    if policy == 'thread':
+        future = _executor(policy).submit(resolved, *args, **kwargs)
+    else:
+        future = _executor(policy).submit(func)
+    future.add_done_callback(lambda done: call_on_main(_deliver, done, on_result, on_error, args))
+    return future
+
+
+def _deliver(future, on_result, on_error, args):
+    if future.cancelled():
+        return
+    exc = future.exception()
+    try:
+        if exc is None:
+            if on_result is not None:
+                _internal.call_callback('result', on_result, *(args + (future.result(),)))
+        elif on_error is not None:
+            _internal.call_callback('result', on_error, *(args + (exc,)))
+        else:
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+    except Exception:
+        traceback.print_exc()
+
+
+# Main thread budget
+#- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+def set_main_thread_budget(seconds, on_exceed=None):
+    """Report callbacks that keep the main thread busy for longer than `seconds`. `on_exceed` is called with the
+    callback and the time it took; by default a warning is logged on the ``app`` subsystem of :mod:`rumps.log`. ``None`` turns reporting off, which is
+    the default: callbacks are then not timed at all.
+
+    :param seconds: the budget in seconds, or ``None``.
+    :param on_exceed: a function called with the callback and the number of seconds it took.
+    """
+    _internal._blocking_monitor = None if seconds is None else _internal._BlockingMonitor(seconds, on_exceed)
+
+
+def main_thread_overruns():
+    """Return a dict mapping the qualified name of every callback that exceeded the main thread budget to a named
+    tuple with the `count` of overruns, the `worst` and the `total` time in seconds.
+    """
+    monitor = _internal._blocking_monitor
+    return {} if monitor is None else dict(monitor.overruns)
@@ -1,36 +1,322 @@
 # -*- coding: utf-8 -*-
 
+"""
+rumps.events
+~~~~~~~~~~~~
+
+Application events functions can subscribe to: ``before_start``, ``on_notification``, ``on_sleep``, ``on_wake`` and
+``before_quit``.
+
+Subscribers are called in order of priority, highest first, then in the order they subscribed. Subscribing and
+unsubscribing build a new tuple of subscribers; :meth:`EventEmitter.emit` only reads the current one, so it never sees
+a list being changed and subscriptions made from a subscriber apply from the next emission.
+
+A subscription can also skip emissions its `predicate` rejects, run on a worker thread (``executor='thread'``) so
+that slow subscribers run in parallel and do not hold up the menu, or `coalesce` a burst of emissions, such as the
+sleep and wake notifications of a lid opened and closed in quick succession, into one call with the latest
+arguments. :meth:`EventEmitter.stats` counts what happened to emissions and how long deferred calls waited.
+
+Applications define their own events with :func:`channel`: worker threads :meth:`Channel.publish` payloads into a
+bounded queue, which is drained on the main run loop in batches, so that subscribers can update menus directly.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import collections
+import itertools
+import threading
+import time
 import traceback
+import types
+
+from concurrent.futures import Future
 
 from . import _internal
 
+EXECUTORS = (None, 'main', 'thread')
+
+EventStats = collections.namedtuple('EventStats', 'emitted delivered filtered coalesced errors latency max_latency')
+ChannelStats = collections.namedtuple('ChannelStats', 'depth max_depth published dropped batches')
+
+BACKPRESSURE = ('drop-oldest', 'drop-newest', 'block')
+
+
+class _Subscription(object):
+    __slots__ = ('callback', 'priority', 'sequence', 'executor', 'coalesce', 'predicate', 'plain', 'pending')
+
+    def __init__(self, callback, priority, sequence, executor=None, coalesce=False, predicate=None):
+        self.callback = callback
+        self.priority = priority
+        self.sequence = sequence
+        self.executor = None if executor == 'main' else executor
+        self.coalesce = coalesce
+        self.predicate = predicate
+        self.plain = self.executor is None and not coalesce and predicate is None  # called right away, in emit
+        self.pending = None  # (args, kwargs, emitted) of a coalesced call waiting to run
+
+    def sort_key(self):
+        return -self.priority, self.sequence
+
+
+class _Callbacks(tuple):
+    """The subscribed functions of an emitter, in the order they are called. ``add``, ``discard`` and ``remove``
+    subscribe and unsubscribe through the emitter, as they did when :attr:`EventEmitter.callbacks` was a set."""
+
+    def __new__(cls, emitter, callbacks=()):
+        self = tuple.__new__(cls, callbacks)
+        self._emitter = emitter
+        return self
+
+    def add(self, func):
+        if func not in self._emitter.callbacks:
+            self._emitter.register(func)
+
+    def discard(self, func):
+        self._emitter.unregister(func)
+
+    def remove(self, func):
+        if not self._emitter.unregister(func):
+            raise KeyError(func)
+
 
 class EventEmitter(object):
+    """Calls the functions subscribed with :meth:`register` every time :meth:`emit` is called. Functions may be methods
+    of an :class:`rumps.App` subclass, which are then called bound to the running application.
+
+    .. code-block:: python
+
+        @rumps.events.on_wake.register(priority=10)  # before the other subscribers
+        def reconnect():
+            ...
+
+        @rumps.events.on_wake.register(executor='thread', coalesce=5.0)
+        def refresh_feeds():  # on a worker thread, once for all the wakes within 5 seconds of the first
+            ...
+    """
+
     def __init__(self, name):
         self.name = name
-        self.callbacks = set()
-        self._executor = _internal.call_as_function_or_method
+        self._site = 'event:' + name
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._subscriptions = ()
+        self._snapshot = _Callbacks(self)
+        self._targets = None  # (method table, subscriptions, ((subscription, what to call), ...))
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def callbacks(self):
+        """The subscribed functions in the order they are called, as a tuple that does not change as functions
+        subscribe and unsubscribe.
+
+        .. versionchanged:: 0.4.0
+           A tuple instead of a set. Its ``add``, ``discard`` and ``remove`` are kept and go through
+           :meth:`register` and :meth:`unregister`, but don't change the tuple they are called on.
+        """
+        return self._snapshot
+
+    def register(self, func=None, priority=0, executor=None, coalesce=False, predicate=None):
+        """Subscribe `func`, replacing its previous subscription if it has one, and return it. Without `func`, return
+        a decorator subscribing the decorated function.
 
-    def register(self, func):
-        self.callbacks.add(func)
+        :param priority: functions with a higher priority are called first; those with the same priority are called in
+                         the order they subscribed.
+        :param executor: ``'thread'`` to call `func` on a worker thread of the pool used by
+                         :func:`rumps.execution_policy` instead of where the event is emitted, or ``None``.
+        :param coalesce: ``True`` to call `func` once from the next pass of the run loop however many times the event
+                         was emitted until then, or a number of seconds to wait for further emissions first. `func`
+                         receives the arguments of the last emission.
+        :param predicate: a function called with the arguments of every emission before `func`, which is only called
+                          if it returns true.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError('executor must be one of {0}, not {1!r}'.format(EXECUTORS, executor))
+        if coalesce is not True and coalesce is not False and coalesce < 0:
+            raise ValueError('coalesce must be a boolean or a number of seconds')
+        if func is None:
+            return lambda f: self.register(f, priority, executor, coalesce, predicate)
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.callback != func]
+            subscriptions.append(_Subscription(func, priority, next(self._sequence), executor, coalesce, predicate))
+            subscriptions.sort(key=_Subscription.sort_key)
+            self._publish(subscriptions)
         return func
 
     def unregister(self, func):
-        try:
-            self.callbacks.remove(func)
-            return True
-        except KeyError:
-            return False
+        """Unsubscribe `func` and return whether it was subscribed."""
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.callback != func]
+            if len(subscriptions) == len(self._subscriptions):
+                return False
+            self._publish(subscriptions)
+        return True
 
     def emit(self, *args, **kwargs):
-        #print('EventEmitter("%s").emit called' % self.name)
-        for callback in self.callbacks:
+        """Call every subscribed function with `args` and `kwargs`. Exceptions raised are printed, and do not keep the
+        other functions from being called. Subscriptions to a worker thread or coalescing emissions return before their
+        function is called."""
+        self._emit(args, kwargs, None)
+
+    def emit_async(self, *args, **kwargs):
+        """Emit the event from the next pass of the main run loop instead of right away and return a
+        :class:`concurrent.futures.Future` which is done once every subscribed function has returned, except those
+        coalescing emissions, whose call is still to come. Safe to call from any thread."""
+        from PyObjCTools import AppHelper
+        future = Future()
+        AppHelper.callAfter(self._emit_async, future, args, kwargs, time.perf_counter())
+        return future
+
+    def stats(self):
+        """Return a named tuple with the number of times the event was `emitted`, of calls `delivered` to subscribed
+        functions, of calls `filtered` out by a predicate or `coalesced` into a later one, of `errors` raised, and the
+        mean and maximum `latency` in seconds between an emission and the start of the calls it deferred to a worker
+        thread or a later pass of the run loop."""
+        with self._stats_lock:
+            return EventStats(self._emitted, self._delivered, self._filtered, self._coalesced, self._errors,
+                              self._latency_total / self._latency_count if self._latency_count else 0.0,
+                              self._latency_max)
+
+    def reset_stats(self):
+        """Start counting :meth:`stats` afresh."""
+        with self._stats_lock:
+            self._emitted = self._delivered = self._filtered = self._coalesced = self._errors = 0
+            self._latency_total = self._latency_max = 0.0
+            self._latency_count = 0
+
+    __call__ = register
+
+    def __repr__(self):
+        return '<{0}: {1} with {2} subscribers>'.format(type(self).__name__, self.name, len(self._snapshot))
+
+    def _emit(self, args, kwargs, emitted):
+        # returns the futures of the calls handed to worker threads
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            self._count('_emitted')
+            return ()
+        futures = []
+        delivered = 0  # calls made right away, counted with the emission under one acquisition of the stats lock
+        profiling = _internal._profiler is not None or _internal._blocking_monitor is not None
+        for subscription, target in self._resolve(subscriptions):
+            if profiling:
+                target = None  # through call_callback
+            if subscription.plain and emitted is None:
+                delivered += 1
+                try:
+                    if target is None:
+                        _internal.call_callback(self._site, subscription.callback, *args, **kwargs)
+                    else:
+                        result = target(*args, **kwargs)
+                        if isinstance(result, types.CoroutineType):
+                            _internal.run_coroutine(result)
+                except Exception:
+                    self._count('_errors')
+                    traceback.print_exc()
+                continue
+            if emitted is None:
+                emitted = time.perf_counter()
+            future = self._deliver(subscription, target, args, kwargs, emitted)
+            if future is not None:
+                futures.append(future)
+        with self._stats_lock:
+            self._emitted += 1
+            self._delivered += delivered
+        return futures
+
+    def _emit_async(self, future, args, kwargs, emitted):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            futures = self._emit(args, kwargs, emitted)
+        except BaseException as e:
+            future.set_exception(e)
+            return
+        if not futures:
+            future.set_result(None)
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                last = not remaining[0]
+            if last:
+                future.set_result(None)
+        for f in futures:
+            f.add_done_callback(done)
+
+    def _deliver(self, subscription, target, args, kwargs, emitted):
+        if subscription.predicate is not None:
             try:
-                self._executor(callback, *args, **kwargs)
+                wanted = subscription.predicate(*args, **kwargs)
             except Exception:
+                self._count('_errors')
                 traceback.print_exc()
+                return None
+            if not wanted:
+                self._count('_filtered')
+                return None
+        if subscription.coalesce is not False:
+            with self._lock:
+                pending, subscription.pending = subscription.pending, (args, kwargs, emitted)
+            if pending is not None:
+                self._count('_coalesced')
+                return None
+            delay = 0 if subscription.coalesce is True else subscription.coalesce
+            _internal.call_later(delay, self._flush, subscription, target)
+            return None
+        return self._run(subscription, target, args, kwargs, emitted)
 
-    __call__ = register
+    def _flush(self, subscription, target):
+        with self._lock:
+            (args, kwargs, emitted), subscription.pending = subscription.pending, None
+        self._run(subscription, target, args, kwargs, emitted)
+
+    def _run(self, subscription, target, args, kwargs, emitted):
+        if subscription.executor == 'thread':
+            from . import dispatch
+            return dispatch._executor('thread').submit(self._call, subscription, target, args, kwargs, emitted)
+        self._call(subscription, target, args, kwargs, emitted)
+        return None
+
+    def _call(self, subscription, target, args, kwargs, emitted):
+        latency = time.perf_counter() - emitted
+        with self._stats_lock:
+            self._delivered += 1
+            self._latency_total += latency
+            self._latency_count += 1
+            if latency > self._latency_max:
+                self._latency_max = latency
+        try:
+            if target is None:
+                _internal.call_callback(self._site, subscription.callback, *args, **kwargs)
+            else:
+                result = target(*args, **kwargs)
+                if isinstance(result, types.CoroutineType):
+                    _internal.run_coroutine(result)
+        except Exception:
+            self._count('_errors')
+            traceback.print_exc()
+
+    def _count(self, counter):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _publish(self, subscriptions):
+        self._subscriptions = tuple(subscriptions)
+        self._snapshot = _Callbacks(self, (s.callback for s in subscriptions))
+
+    def _resolve(self, subscriptions):
+        # what to call for each subscriber, resolved again only when subscriptions or the application's methods change
+        table = _internal.method_table()
+        targets = self._targets
+        if targets is None or targets[0] is not table or targets[1] is not subscriptions:
+            targets = self._targets = table, subscriptions, tuple(
+                (s, _internal.resolve_callback(s.callback, table)) for s in subscriptions)
+        return targets[2]
 
 
 before_start = EventEmitter('before_start')
@@ -38,3 +324,137 @@ on_notification = EventEmitter('on_notification')
 on_sleep = EventEmitter('on_sleep')
 on_wake = EventEmitter('on_wake')
 before_quit = EventEmitter('before_quit')
+
+
+class Channel(EventEmitter):
+    """An application event carrying one payload, published from any thread and emitted on the main thread.
+
+    Payloads wait in a queue of at most `maxsize` until the main run loop drains it, `batch_size` payloads per pass so
+    that a flood of them does not keep the menu from responding. When the queue is full, `backpressure` decides:
+
+    ``'drop-oldest'``
+        The oldest waiting payload is dropped to make room. Subscribers that show the latest value want this.
+
+    ``'drop-newest'``
+        The published payload is dropped.
+
+    ``'block'``
+        :meth:`publish` waits for room; from the main thread, it drains a batch first.
+
+    Create channels with :func:`channel`.
+    """
+
+    def __init__(self, name, payload=None, maxsize=1000, backpressure='drop-oldest', batch_size=100):
+        if backpressure not in BACKPRESSURE:
+            raise ValueError('backpressure must be one of {0}, not {1!r}'.format(', '.join(BACKPRESSURE), backpressure))
+        if maxsize < 1 or batch_size < 1:
+            raise ValueError('maxsize and batch_size must be positive')
+        super(Channel, self).__init__(name)
+        self.payload = payload
+        self.maxsize = maxsize
+        self.backpressure = backpressure
+        self.batch_size = batch_size
+        self._queue = collections.deque()
+        self._room = threading.Condition(threading.Lock())
+        self._posted = False
+        self._max_depth = self._published = self._dropped = self._batches = 0
+
+    @property
+    def depth(self):
+        """The number of payloads waiting to be emitted."""
+        return len(self._queue)
+
+    def publish(self, payload, timeout=None):
+        """Queue `payload` to be emitted on the main thread and return whether it was queued rather than dropped.
+        Safe to call from any thread.
+
+        :param payload: an instance of the `payload` type of the channel, if it has one.
+        :param timeout: with the ``'block'`` policy, the maximum number of seconds to wait for room, after which the
+                        payload is dropped. Waits for as long as it takes by default.
+        """
+        if self.payload is not None and not isinstance(payload, self.payload):
+            raise TypeError('{0} payloads must be {1}, not {2}'.format(self.name, self.payload, type(payload).__name__))
+        with self._room:
+            while len(self._queue) >= self.maxsize:
+                if self.backpressure == 'drop-oldest':
+                    self._queue.popleft()
+                    self._dropped += 1
+                elif self.backpressure == 'drop-newest':
+                    self._dropped += 1
+                    return False
+                elif threading.current_thread() is threading.main_thread():  # waiting, the drain would never come
+                    self._room.release()
+                    try:
+                        self._drain(repost=False)
+                    finally:
+                        self._room.acquire()
+                elif not self._room.wait_for(lambda: len(self._queue) < self.maxsize, timeout):
+                    self._dropped += 1
+                    return False
+            self._queue.append(payload)
+            self._published += 1
+            if len(self._queue) > self._max_depth:
+                self._max_depth = len(self._queue)
+            post, self._posted = not self._posted, True
+        if post:
+            from PyObjCTools import AppHelper
+            AppHelper.callAfter(self._drain)
+        return True
+
+    def queue_stats(self):
+        """Return a named tuple with the current `depth` of the queue, the largest it has been, and the number of
+        payloads `published` and `dropped` and of `batches` drained; :meth:`stats` counts the deliveries."""
+        with self._room:
+            return ChannelStats(len(self._queue), self._max_depth, self._published, self._dropped, self._batches)
+
+    def _drain(self, repost=True):
+        with self._room:
+            queue = self._queue
+            batch = [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+            self._batches += 1
+            self._room.notify_all()
+            more = bool(queue)
+            if repost:
+                self._posted = more
+        for payload in batch:
+            self.emit(payload)
+        if repost and more:  # the rest in another pass, after the run loop has handled input
+            from PyObjCTools import AppHelper
+            AppHelper.callAfter(self._drain)
+
+
+_channels = {}
+_channels_lock = threading.Lock()
+
+
+def channel(name, payload=None, maxsize=1000, backpressure='drop-oldest', batch_size=100):
+    """Return the :class:`Channel` called `name`, creating it with the given options the first time.
+
+    .. code-block:: python
+
+        metrics_updated = rumps.events.channel('metrics_updated', payload=dict, maxsize=100)
+
+        @metrics_updated.register
+        def show(metrics):
+            app.menu['CPU'].title = 'CPU {0:.0%}'.format(metrics['cpu'])
+
+        def collect():  # in a worker thread
+            while True:
+                metrics_updated.publish({'cpu': psutil.cpu_percent(interval=1) / 100})
+
+    :param payload: a type, or tuple of types, that published payloads must be instances of.
+    :param maxsize: the maximum number of payloads waiting to be emitted.
+    :param backpressure: ``'drop-oldest'``, ``'drop-newest'`` or ``'block'``; see :class:`Channel`.
+    :param batch_size: the maximum number of payloads emitted per pass of the run loop.
+    """
+    with _channels_lock:
+        existing = _channels.get(name)
+        if existing is None:
+            existing = _channels[name] = Channel(name, payload, maxsize, backpressure, batch_size)
+        return existing
+
+
+def channels():
+    """Return a dict mapping the name of every channel made with :func:`channel` to it."""
+    with _channels_lock:
+        return dict(_channels)
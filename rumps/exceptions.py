@@ -7,3 +7,12 @@ class RumpsError(Exception):
 
 class InternalRumpsError(RumpsError):
     """Internal mechanism powering functionality of rumps failed."""
+
+
+class PayloadTooLargeError(RumpsError, ValueError):
+    """Notification data is too large for Notification Center once serialized."""
+
+    def __init__(self, message, size, limit):
+        super(PayloadTooLargeError, self).__init__(message)
+        self.size = size
+        self.limit = limit
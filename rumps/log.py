@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.log
+~~~~~~~~~
+
+What rumps has to say about the app as it runs, by subsystem: ``app``, ``menu``, ``timer``, ``image``,
+``notification`` and ``widget``.
+
+Every subsystem has its own level. A message below it is dropped by the first line of the logging call, before its
+arguments are looked at: messages are templates formatted with :meth:`str.format` only once a record is read, so that
+logging on hot paths costs a method call and a comparison while it is disabled. Records that pass are kept in a ring
+buffer of recent events (see :func:`log_events`) and handed to the sinks added with :func:`add_log_sink`, optionally
+from a background thread. :func:`rumps.debug_mode` logs every subsystem to ``NSLog``, as it always has.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import collections
+import queue
+import threading
+import time
+import traceback
+
+from Foundation import NSLog
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+_LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+_NAMES = dict((number, name.upper()) for name, number in _LEVELS.items())
+
+SUBSYSTEMS = ('app', 'menu', 'timer', 'image', 'notification', 'widget')
+
+
+class LogRecord(object):
+    """One logged event. The message is formatted from its template the first time it is read."""
+
+    __slots__ = ('time', 'subsystem', 'level', 'template', 'args', 'fields', '_message')
+
+    def __init__(self, subsystem, level, template, args, fields):
+        self.time = time.time()
+        self.subsystem = subsystem
+        self.level = level
+        self.template = template
+        self.args = args
+        self.fields = fields
+        self._message = None
+
+    @property
+    def message(self):
+        if self._message is None:
+            try:
+                self._message = self.template.format(*self.args, **self.fields) if self.args or self.fields \
+                    else str(self.template)
+            except Exception as e:
+                self._message = '{0!r} {1!r} {2!r} (formatting failed: {3})'.format(
+                    self.template, self.args, self.fields, e)
+        return self._message
+
+    @property
+    def level_name(self):
+        return _NAMES.get(self.level, str(self.level))
+
+    def __str__(self):
+        return '[{0}] {1}: {2}'.format(self.subsystem, self.level_name, self.message)
+
+    def __repr__(self):
+        return '<{0}: {1}>'.format(type(self).__name__, self)
+
+
+class Logger(object):
+    """Logs the events of one subsystem. `template` is formatted with `args` and `fields` as with
+    :meth:`str.format`, and only once the record is read; `fields` are also kept on the record as structured data.
+
+    .. code-block:: python
+
+        from rumps import log
+        log.timer.debug('timer {0} fired {late:.3f} s late', timer, late=lateness)
+    """
+
+    __slots__ = ('name', 'level')
+
+    def __init__(self, name, level=WARNING):
+        self.name = name
+        self.level = level
+
+    def enabled(self, level=DEBUG):
+        """Return whether a message at `level` would be logged, to guard work done only to build a message."""
+        return level >= self.level
+
+    def debug(self, template, *args, **fields):
+        if DEBUG >= self.level:
+            _emit(LogRecord(self.name, DEBUG, template, args, fields))
+
+    def info(self, template, *args, **fields):
+        if INFO >= self.level:
+            _emit(LogRecord(self.name, INFO, template, args, fields))
+
+    def warning(self, template, *args, **fields):
+        if WARNING >= self.level:
+            _emit(LogRecord(self.name, WARNING, template, args, fields))
+
+    def error(self, template, *args, **fields):
+        if ERROR >= self.level:
+            _emit(LogRecord(self.name, ERROR, template, args, fields))
+
+    def __repr__(self):
+        return '<{0}: {1} at {2}>'.format(type(self).__name__, self.name, _NAMES.get(self.level, self.level))
+
+
+class AsyncSink(object):
+    """Hands records to `sink` on a daemon thread, so that slow sinks (files, sockets, ``NSLog`` itself) do not hold up
+    the thread that logs. Holds at most `maxsize` records; further records are dropped and counted in `dropped`."""
+
+    def __init__(self, sink, maxsize=10000):
+        self.sink = sink
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name='rumps-log')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __call__(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Wait until every record received so far has been handed to the sink."""
+        self._queue.join()
+
+    def close(self):
+        """Hand over the remaining records and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                self.sink(record)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+
+def nslog_sink(record):
+    """Write `record` to the system log with ``NSLog``."""
+    NSLog(u'%@', str(record))
+
+
+_loggers = collections.OrderedDict((name, Logger(name)) for name in SUBSYSTEMS)
+app = _loggers['app']
+menu = _loggers['menu']
+timer = _loggers['timer']
+image = _loggers['image']
+notification = _loggers['notification']
+widget = _loggers['widget']
+
+_events = collections.deque(maxlen=1000)
+_sinks = ()  # replaced, never mutated, so that _emit can iterate without a lock
+_sinks_lock = threading.Lock()
+
+
+def _emit(record):
+    _events.append(record)
+    for sink in _sinks:
+        try:
+            sink(record)
+        except Exception:
+            traceback.print_exc()
+
+
+def _level(level):
+    if isinstance(level, str):
+        try:
+            return _LEVELS[level.lower()]
+        except KeyError:
+            raise ValueError('unknown log level {0!r}; use one of {1}'.format(level, ', '.join(_LEVELS)))
+    return int(level)
+
+
+def get_logger(subsystem):
+    """Return the :class:`Logger` of `subsystem`."""
+    try:
+        return _loggers[subsystem]
+    except KeyError:
+        raise ValueError('unknown subsystem {0!r}; use one of {1}'.format(subsystem, ', '.join(SUBSYSTEMS)))
+
+
+def set_log_level(level, subsystem=None):
+    """Log the messages of `subsystem`, or of every subsystem, from `level` up. The default is ``'warning'``.
+
+    .. code-block:: python
+
+        rumps.set_log_level('debug', 'timer')
+
+    :param level: ``'debug'``, ``'info'``, ``'warning'``, ``'error'`` or ``'off'``, or the matching constant of this
+                  module.
+    :param subsystem: one of ``'app'``, ``'menu'``, ``'timer'``, ``'image'``, ``'notification'`` or ``'widget'``.
+    """
+    level = _level(level)
+    for logger in (_loggers.values() if subsystem is None else [get_logger(subsystem)]):
+        logger.level = level
+
+
+def log_levels():
+    """Return a dict mapping every subsystem to the name of its level."""
+    return dict((name, _NAMES.get(logger.level, str(logger.level)).lower()) for name, logger in _loggers.items())
+
+
+def log_events(count=None, subsystem=None, level=DEBUG):
+    """Return the most recent logged :class:`LogRecord` objects, oldest first.
+
+    :param count: return no more than this many records.
+    :param subsystem: only return the records of this subsystem.
+    :param level: only return the records at this level or above.
+    """
+    level = _level(level)
+    records = [r for r in list(_events) if r.level >= level and (subsystem is None or r.subsystem == subsystem)]
+    return records[-count:] if count else records
+
+
+def set_log_capacity(capacity):
+    """Keep the last `capacity` logged records for :func:`log_events`; ``1000`` by default."""
+    global _events
+    _events = collections.deque(_events, maxlen=capacity)
+
+
+def add_log_sink(sink, asynchronous=False):
+    """Call `sink` with every :class:`LogRecord` logged from now on and return the function actually added, to pass
+    to :func:`remove_log_sink`.
+
+    :param sink: a function taking a record.
+    :param asynchronous: call `sink` on a background thread through an :class:`AsyncSink`.
+    """
+    global _sinks
+    if asynchronous:
+        sink = AsyncSink(sink)
+    with _sinks_lock:
+        _sinks = _sinks + (sink,)
+    return sink
+
+
+def remove_log_sink(sink):
+    """Stop calling `sink`, as returned by :func:`add_log_sink`; asynchronous sinks hand over their pending records
+    first."""
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+    if isinstance(sink, AsyncSink):
+        sink.close()
+
+
+_debug_sink = None
+
+
+def _set_debug(choice):
+    global _debug_sink
+    if choice:
+        set_log_level(DEBUG)
+        if _debug_sink is None:
+            _debug_sink = add_log_sink(nslog_sink)
+    else:
+        set_log_level(WARNING)
+        if _debug_sink is not None:
+            remove_log_sink(_debug_sink)
+            _debug_sink = None
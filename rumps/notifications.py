@@ -6,16 +6,27 @@ try:
 except ImportError:
     _ENABLED = False
 
+import collections
 import datetime
 import os
 import sys
+import threading
+import time
 import traceback
+import uuid
 
 import Foundation
 
 from . import _internal
 from . import compat
 from . import events
+from . import log
+from . import serializers
+from .exceptions import PayloadTooLargeError
+
+#: Data stored by ``rumps.notification(..., oversized='store')`` that is still there after this many seconds belongs to
+#: a notification that was never clicked and is removed.
+STORED_DATA_MAX_AGE = 7 * 24 * 60 * 60
 
 
 def on_notification(f):
@@ -73,7 +84,13 @@ def _gather_info_issue_9():  # pragma: no cover
     return info % {'info_plist_path': info_plist_path, 'confidence': confidence}
 
 
+_notification_center = None  # the default center never changes for the life of the process; look it up once
+
+
 def _default_user_notification_center():
+    global _notification_center
+    if _notification_center is not None:
+        return _notification_center
     notification_center = NSUserNotificationCenter.defaultUserNotificationCenter()
     if notification_center is None:  # pragma: no cover
         info = (
@@ -86,6 +103,7 @@ def _default_user_notification_center():
             pass
         raise RuntimeError(info)
     else:
+        _notification_center = notification_center
         return notification_center
 
 
@@ -100,26 +118,27 @@ def _init_nsapp(nsapp):
 
 
 @_internal.guard_unexpected_errors
+@_internal.profiled('notification')
 def _clicked(ns_user_notification_center, ns_user_notification):
-    from . import rumps
-
     ns_user_notification_center.removeDeliveredNotification_(ns_user_notification)
     ns_dict = ns_user_notification.userInfo()
     if ns_dict is None:
         data = None
     else:
-        dumped = ns_dict['value']
-        app = getattr(rumps.App, '*app_instance', rumps.App)
         try:
-            data = app.serializer.loads(dumped)
+            if 'key' in ns_dict:
+                dumped = _load_stored(ns_dict['key'])
+            else:
+                dumped = ns_dict['value']
+            data = _serializer().loads(dumped)
         except Exception:
             traceback.print_exc()
             return
 
     # notification center function not specified => no error but log warning
     if not events.on_notification.callbacks:
-        rumps._log(
-            'WARNING: notification received but no function specified for '
+        log.notification.warning(
+            'notification received but no function specified for '
             'answering it; use @notifications decorator to register a function.'
         )
     else:
@@ -127,9 +146,73 @@ def _clicked(ns_user_notification_center, ns_user_notification):
         events.on_notification.emit(notification)
 
 
+def _serializer():
+    # there is no App to take the serializer from unless rumps.rumps, and so AppKit, has been imported; a script that
+    # only sends notifications needn't import either
+    rumps = sys.modules.get(__package__ + '.rumps')
+    if rumps is None:
+        import pickle
+        return pickle
+    return serializers.resolve(getattr(rumps.App, '*app_instance', rumps.App).serializer)
+
+
+def _stored_data_folder():
+    rumps = sys.modules.get(__package__ + '.rumps')
+    app = None if rumps is None else getattr(rumps.App, '*app_instance', None)
+    if app is None:
+        raise RuntimeError('oversized="store" keeps notification data in the folder of the running App; there is none')
+    folder = os.path.join(rumps.application_support(app.name), 'notifications')
+    if not os.path.isdir(folder):
+        os.mkdir(folder)
+    return folder
+
+
+def _store(dumped):
+    folder = _stored_data_folder()
+    key = uuid.uuid4().hex
+    if isinstance(dumped, compat.text_type):
+        dumped = dumped.encode('utf-8')
+        key += '.txt'
+    with open(os.path.join(folder, key), 'wb') as f:
+        f.write(dumped)
+    expired = time.time() - STORED_DATA_MAX_AGE
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < expired:
+                os.remove(path)
+        except OSError:
+            pass
+    log.notification.debug('stored {0} bytes of notification data as {1}', len(dumped), key)
+    return key
+
+
+def _load_stored(key):
+    if os.path.basename(key) != key:
+        raise ValueError('invalid key for stored notification data: {0!r}'.format(key))
+    path = os.path.join(_stored_data_folder(), key)
+    with open(path, 'rb') as f:
+        dumped = f.read()
+    os.remove(path)
+    if key.endswith('.txt'):
+        return dumped.decode('utf-8')
+    return dumped
+
+
+def _user_info(data, oversized):
+    dumped = _serializer().dumps(data)
+    try:
+        serializers.check_size(dumped)
+    except PayloadTooLargeError:
+        if oversized != 'store':
+            raise
+        return {'key': _store(dumped)}
+    return {'value': _internal.string_to_objc(dumped)}
+
+
 def notify(title, subtitle, message, data=None, sound=True,
            action_button=None, other_button=None, has_reply_button=False,
-           icon=None, ignoreDnD=False):
+           icon=None, ignoreDnD=False, oversized='raise'):
     """Send a notification to Notification Center (OS X 10.8+). If running on a
     version of macOS that does not support notifications, a ``RuntimeError``
     will be raised. Apple says,
@@ -137,7 +220,8 @@ def notify(title, subtitle, message, data=None, sound=True,
         "The userInfo content must be of reasonable serialized size (less than
         1k) or an exception will be thrown."
 
-    So don't do that!
+    Data over the limit raises :class:`rumps.exceptions.PayloadTooLargeError` before anything is sent, unless
+    `oversized` is ``'store'``. A compact serializer (see :mod:`rumps.serializers`) fits more under it.
 
     :param title: text in a larger font.
     :param subtitle: text in a smaller font below the `title`.
@@ -153,13 +237,21 @@ def notify(title, subtitle, message, data=None, sound=True,
                  replace the default.
     :param ignoreDnD: whether the notification should ignore do not disturb,
                  e.g., appear also while screen sharing.
-    """
-    from . import rumps
+    :param oversized: what to do with `data` over the limit once serialized: ``'raise'``, or ``'store'`` it in the
+                      application support folder of the running app and send only a key to it, so that it is read
+                      back when the notification is clicked. Stored data of notifications never clicked is removed
+                      after :data:`STORED_DATA_MAX_AGE`.
 
+    .. versionchanged:: 0.4.0
+       `oversized`, and data over the limit is refused before the notification is built.
+    """
     if not _ENABLED:
         raise RuntimeError('OS X 10.8+ is required to send notifications')
 
     _internal.require_string_or_none(title, subtitle, message)
+    if oversized not in ('raise', 'store'):
+        raise ValueError("oversized must be 'raise' or 'store', not {0!r}".format(oversized))
+    user_info = None if data is None else _user_info(data, oversized)
 
     notification = NSUserNotification.alloc().init()
 
@@ -167,15 +259,13 @@ def notify(title, subtitle, message, data=None, sound=True,
     notification.setSubtitle_(subtitle)
     notification.setInformativeText_(message)
 
-    if data is not None:
-        app = getattr(rumps.App, '*app_instance', rumps.App)
-        dumped = app.serializer.dumps(data)
-        objc_string = _internal.string_to_objc(dumped)
+    if user_info is not None:
         ns_dict = Foundation.NSMutableDictionary.alloc().init()
-        ns_dict.setDictionary_({'value': objc_string})
+        ns_dict.setDictionary_(user_info)
         notification.setUserInfo_(ns_dict)
 
     if icon is not None:
+        from . import rumps
         notification.set_identityImage_(rumps._nsimage_from_file(icon))
     if sound:
         notification.setSoundName_("NSUserNotificationDefaultSoundName")
@@ -195,6 +285,204 @@ def notify(title, subtitle, message, data=None, sound=True,
     notification_center.scheduleNotification_(notification)
 
 
+DispatcherStats = collections.namedtuple('DispatcherStats', 'requested sent deduplicated summarized dropped pending')
+
+
+def _now():
+    return Foundation.NSDate.date().timeIntervalSince1970()
+
+
+def summarize_latest(notifications):
+    """The default `summarize` of :class:`NotificationDispatcher`: the latest of `notifications`, with the number of
+    them as its subtitle."""
+    latest = notifications[-1]
+    return dict(latest, subtitle='{0} notifications'.format(len(notifications)))
+
+
+class _Group(object):
+    __slots__ = ('due', 'entries')
+
+    def __init__(self, due):
+        self.due = due
+        self.entries = []
+
+
+class NotificationDispatcher(object):
+    """Sends notifications no faster than Notification Center, and whoever reads them, can take.
+
+    :meth:`notify` takes the arguments of :func:`rumps.notification` and returns at once, from any thread;
+    notifications are built and sent later, on the main run loop. Sending is rate limited by a token bucket: up to
+    `burst` notifications go out at once, after which they go out at `rate` per second, and notifications over
+    `max_pending` waiting for their turn drop the oldest.
+
+    .. code-block:: python
+
+        alerts = rumps.NotificationDispatcher(rate=0.2, burst=3, summarize_window=10)
+
+        def on_check_failed(host, error):  # called from a monitoring thread
+            alerts.notify('Monitor', host, str(error), key=host, group='monitor')
+
+    A notification with a `key` replaces one with the same key still waiting to be sent, and is dropped if one with
+    that key was sent less than `dedup_window` seconds ago. With a `summarize_window`, notifications of the same
+    `group` (their title, by default) are held for that many seconds after the first of them arrives and are then
+    sent as one notification, made by ``summarize(notifications)`` from the list of their :func:`rumps.notification`
+    arguments, oldest first (see :func:`summarize_latest`).
+
+    :param rate: notifications sent per second once the burst is spent.
+    :param burst: notifications that can be sent at once.
+    :param dedup_window: seconds during which a notification with the key of one already sent is dropped.
+    :param summarize_window: seconds during which notifications of a group are collected into one, or ``None`` to send
+                             each on its own.
+    :param summarize: makes the arguments of the notification that stands for a group of them.
+    :param max_pending: notifications that can wait to be sent.
+    """
+
+    def __init__(self, rate=1.0, burst=5, dedup_window=60.0, summarize_window=None, summarize=summarize_latest,
+                 max_pending=100):
+        if rate <= 0 or burst < 1 or max_pending < 1:
+            raise ValueError('rate must be positive, burst and max_pending at least 1')
+        if dedup_window < 0 or (summarize_window is not None and summarize_window < 0):
+            raise ValueError('windows must not be negative')
+        self.rate = rate
+        self.burst = burst
+        self.dedup_window = dedup_window
+        self.summarize_window = summarize_window
+        self.summarize = summarize
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled = _now()
+        self._groups = collections.OrderedDict()  # group -> _Group, in order of arrival
+        self._keys = {}  # key -> the entry of a pending notification with that key
+        self._sent = collections.OrderedDict()  # key -> time sent, oldest first
+        self._scheduled = None  # when the next _drain is due, if one is
+        self.requested = self.sent = self.deduplicated = self.summarized = self.dropped = 0
+
+    def notify(self, title, subtitle, message, key=None, group=None, **options):
+        """Queue a notification; the arguments, apart from `key` and `group`, are those of :func:`rumps.notification`.
+
+        :param key: identifies notifications that are the same, for deduplication.
+        :param group: identifies notifications that are alike, to be summarized together; the title by default.
+        :return: ``False`` if the notification was dropped as a duplicate, ``True`` otherwise.
+        """
+        entry = dict(options, title=title, subtitle=subtitle, message=message)
+        with self._lock:
+            self.requested += 1
+            now = _now()
+            if key is not None:
+                sent = self._sent.get(key)
+                if sent is not None and now - sent < self.dedup_window:
+                    self.deduplicated += 1
+                    return False
+                pending = self._keys.get(key)
+                if pending is not None:
+                    self.deduplicated += 1
+                    pending.clear()
+                    pending.update(entry, **{'*key': key})
+                    return True
+                entry['*key'] = key
+                self._keys[key] = entry
+            if self.summarize_window is None:
+                group, due = object(), now
+            else:
+                group, due = title if group is None else group, now + self.summarize_window
+            pending = self._groups.get(group)
+            if pending is None:
+                pending = self._groups[group] = _Group(due)
+            pending.entries.append(entry)
+            if self._pending() > self.max_pending:
+                self._drop_oldest()
+            self._schedule(now)
+        return True
+
+    def flush(self):
+        """Send every pending notification now, summarizing groups whose window is still open and regardless of the
+        rate limit. Safe to call from any thread.
+
+        :return: a :class:`concurrent.futures.Future` for the number of notifications sent.
+        """
+        from . import dispatch
+        return dispatch.call_on_main(self._drain, True)
+
+    def stats(self):
+        """Return the counters of the dispatcher as a ``DispatcherStats(requested, sent, deduplicated, summarized,
+        dropped, pending)``: notifications summarized are counted apart from the one sent for them."""
+        with self._lock:
+            return DispatcherStats(self.requested, self.sent, self.deduplicated, self.summarized, self.dropped,
+                                   self._pending())
+
+    def _pending(self):
+        return sum(len(group.entries) for group in self._groups.values())
+
+    def _drop_oldest(self):
+        group_id, group = next(iter(self._groups.items()))
+        entry = group.entries.pop(0)
+        self._keys.pop(entry.get('*key'), None)
+        if not group.entries:
+            del self._groups[group_id]
+        self.dropped += 1
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _schedule(self, now):
+        if not self._groups:
+            return
+        self._refill(now)
+        due = min(group.due for group in self._groups.values())
+        if self._tokens < 1:
+            due = max(due, now + (1 - self._tokens) / self.rate)
+        if self._scheduled is not None and self._scheduled <= due:
+            return
+        self._scheduled = due
+        _internal.call_later(due - now, self._drain)
+
+    def _drain(self, everything=False):
+        ready = []
+        with self._lock:
+            now = _now()
+            self._scheduled = None
+            self._refill(now)
+            for group_id, group in list(self._groups.items()):
+                if not everything:
+                    if group.due > now:
+                        continue
+                    if self._tokens < 1:
+                        break
+                    self._tokens -= 1
+                del self._groups[group_id]
+                for entry in group.entries:
+                    self._keys.pop(entry.get('*key'), None)
+                ready.append(group.entries)
+            self._schedule(now)
+        for entries in ready:
+            self._send(entries, now)
+        return len(ready)
+
+    def _send(self, entries, now):
+        keys = [entry.pop('*key') for entry in entries if '*key' in entry]
+        try:
+            if len(entries) == 1:
+                options = entries[0]
+            else:
+                options = self.summarize(entries)
+            notify(**options)
+        except Exception:
+            traceback.print_exc()
+            return
+        with self._lock:
+            self.sent += 1
+            self.summarized += len(entries) - 1
+            for key in keys:
+                self._sent.pop(key, None)
+                self._sent[key] = now
+            expired = now - self.dedup_window
+            while self._sent and next(iter(self._sent.values())) <= expired:
+                self._sent.popitem(last=False)
+        log.notification.debug('sent a notification for {0} requested', len(entries))
+
+
 class Notification(compat.collections_abc.Mapping):
     def __init__(self, ns_user_notification, data):
         self._ns = ns_user_notification
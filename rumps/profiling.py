@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.profiling
+~~~~~~~~~~~~~~~
+
+Call counts, exceptions and latency histograms of the callbacks rumps runs: menu items and widgets, timers, event
+handlers and notification clicks.
+
+Nothing is measured until :func:`set_profiler` is called; until then dispatching a callback costs a single check.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import collections
+import threading
+import time
+import traceback
+
+from . import _internal
+
+CallbackStats = collections.namedtuple('CallbackStats', 'site calls errors mean p50 p99 max')
+
+
+class LatencyHistogram(object):
+    """Histogram of durations with a constant relative precision, like HdrHistogram.
+
+    Durations are counted in whole microseconds. Below ``2 ** sub_bucket_bits`` microseconds every value has its own
+    bucket; above, every power of two is split into ``2 ** (sub_bucket_bits - 1)`` buckets, so that values are told
+    apart to within ``2 ** (1 - sub_bucket_bits)`` of their size (under 2% with the default of 7 bits) whatever their
+    magnitude. Buckets are only allocated once used.
+    """
+
+    def __init__(self, sub_bucket_bits=7):
+        self._bits = sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Count a duration of `seconds`."""
+        value = int(seconds * 1e6)
+        shift = value.bit_length() - self._bits
+        index = value if shift <= 0 else shift * self._half + (value >> shift)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """Return the duration in seconds that `percent` percent of the recorded durations do not exceed, as the
+        highest value of its bucket, or ``0.0`` if nothing was recorded."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(-(-percent * self.count // 100)))  # ceil
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._highest(index) / 1e6, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        """The mean duration in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def _highest(self, index):
+        if index < 2 * self._half:
+            return index + 1
+        shift = index // self._half - 1
+        return ((index - shift * self._half) + 1) << shift
+
+
+class Profiler(object):
+    """Records every callback run through :func:`rumps._internal.call_callback` and passes it on to `hook`."""
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self._histograms = {}  # qualified name -> (site, histogram, [errors])
+        self._lock = threading.Lock()
+
+    def call(self, site, func, invoke, args, kwargs):
+        error = None
+        start = time.perf_counter()
+        try:
+            return invoke(func, *args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.record(site, func, time.perf_counter() - start, error)
+
+    def record(self, site, func, elapsed, error=None):
+        name = _internal.callback_name(func)
+        with self._lock:
+            entry = self._histograms.get(name)
+            if entry is None:
+                entry = self._histograms[name] = site, LatencyHistogram(), [0]
+            entry[1].record(elapsed)
+            if error is not None:
+                entry[2][0] += 1
+        if self.hook is not None:
+            try:
+                self.hook(site, func, elapsed, error)
+            except Exception:
+                traceback.print_exc()
+
+    def stats(self):
+        with self._lock:
+            return dict((name, CallbackStats(site, histogram.count, errors[0], histogram.mean,
+                                             histogram.percentile(50), histogram.percentile(99), histogram.max))
+                        for name, (site, histogram, errors) in self._histograms.items())
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+def set_profiler(profiler=True):
+    """Start measuring the callbacks run by rumps; see :func:`stats`.
+
+    `profiler` can also be a function, which is then called after every callback with the kind of callback (such as
+    ``'menu'``, ``'timer'`` or ``'event:on_wake'``), the callback, the time it took in seconds and the exception it
+    raised or ``None``, for instance to feed another profiling tool. ``None`` or ``False`` stops measuring and drops
+    the statistics.
+
+    .. code-block:: python
+
+        rumps.set_profiler()
+        ...
+        for name, s in sorted(rumps.stats().items(), key=lambda item: -item[1].p99):
+            print('{0:<40} {1.calls:>6} calls  p50 {1.p50:.4f} s  p99 {1.p99:.4f} s'.format(name, s))
+
+    :param profiler: ``True``, a function or ``None``.
+    """
+    if profiler is None or profiler is False:
+        _internal._profiler = None
+    elif profiler is True:
+        _internal._profiler = Profiler()
+    elif callable(profiler):
+        _internal._profiler = Profiler(hook=profiler)
+    else:
+        raise TypeError('profiler must be True, None or a callable, not {0!r}'.format(profiler))
+
+
+def stats(reset=False):
+    """Return a dict mapping the qualified name of every callback run since :func:`set_profiler` was called to a
+    named tuple with its `site` (the kind of callback), the number of `calls` and of `errors` raised, and the `mean`,
+    median (`p50`), 99th percentile (`p99`) and `max` time in seconds it took. Empty while not profiling.
+
+    :param reset: start counting afresh after returning the statistics.
+    """
+    profiler = _internal._profiler
+    if profiler is None:
+        return {}
+    result = profiler.stats()
+    if reset:
+        profiler.reset()
+    return result
@@ -11,42 +11,50 @@ import Foundation
 import AppKit
 
 from Foundation import (NSDate, NSTimer, NSRunLoop, NSDefaultRunLoopMode, NSSearchPathForDirectoriesInDomains,
-                        NSMakeRect, NSLog, NSObject, NSMutableDictionary, NSString, NSUserDefaults, NSPoint, NSMakeRange)
+                        NSMakeRect, NSObject, NSMutableDictionary, NSString, NSUserDefaults, NSPoint, NSMakeRange,
+                        NSThread)
 from AppKit import NSApplication, NSStatusBar, NSMenu, NSMenuItem, NSAlert, NSTextField, NSSecureTextField, NSImage, NSImageSymbolConfiguration, NSSlider, NSSize, NSWorkspace, NSWorkspaceWillSleepNotification, NSWorkspaceDidWakeNotification, NSView
-from AppKit import (
-    NSView, NSColor, NSBezierPath, NSRoundLineCapStyle,
-    NSMakeRect, NSMakePoint
-)
+from AppKit import NSColor, NSMakeRect
 from PyObjCTools import AppHelper
 
+import collections
+import contextlib
+import importlib
+import math
 import os
 import pickle
+import random
+import sys
+import threading
+import time
 import traceback
 import weakref
-import objc
 
 from .compat import text_type, string_types, iteritems, collections_abc
-from .text_field import Editing, SecureEditing
-from .utils import ListDict
+from .utils import ListDict, LRUCache, CallbackRegistry, longest_increasing_subsequence
 
 from . import _internal
+from . import dispatch
 from . import events
-from . import notifications
+from . import log
+from . import scheduling
+
+# the package binds rumps.notifications to the decorator before this module is first imported, so `from . import
+# notifications` would get the decorator rather than the module
+notifications = importlib.import_module('.notifications', __package__)
 
 _TIMERS = weakref.WeakKeyDictionary()
 separator = object()
 
 
 def debug_mode(choice):
-    """Enable/disable printing helpful information for debugging the program. Default is off."""
-    global _log
-    if choice:
-        def _log(*args):
-            NSLog(' '.join(map(str, args)))
-    else:
-        def _log(*_):
-            pass
-debug_mode(False)
+    """Enable/disable printing helpful information for debugging the program. Default is off.
+
+    .. versionchanged:: 0.4.0
+        Logs every subsystem at debug level to ``NSLog`` through :mod:`rumps.log`; see :func:`rumps.set_log_level`
+        to log only some of them.
+    """
+    log._set_debug(choice)
 
 
 def alert(title=None, message='', ok=None, cancel=None, other=None, icon_path=None):
@@ -88,7 +96,7 @@ def alert(title=None, message='', ok=None, cancel=None, other=None, icon_path=No
     if icon_path is not None:
         icon = _nsimage_from_file(icon_path)
         alert.setIcon_(icon)
-    _log('alert opened with message: {0}, title: {1}'.format(repr(message), repr(title)))
+    log.app.debug('alert opened with message: {0!r}, title: {1!r}', message, title)
     return alert.runModal()
 
 
@@ -108,7 +116,7 @@ def timers():
 def quit_application(sender=None):
     """Quit the application. Some menu item should call this function so that the application can exit gracefully."""
     nsapplication = NSApplication.sharedApplication()
-    _log('closing application')
+    log.app.debug('closing application')
     nsapplication.terminate_(sender)
 
 
@@ -117,13 +125,20 @@ def _nsimage_from_file(filename, dimensions=None, template=None):
     # Handle SFSymbol instances
     if isinstance(filename, SFSymbol):
         image = filename()  # Call SFSymbol to get NSImage
-        if image is not None:
-            image.setScalesWhenResized_(True)
+        if image is None or (dimensions is None and template is None):
+            return image
+        # the image of a symbol is shared, so resize a copy
+        key = filename, tuple(dimensions) if dimensions is not None else None, template
+        resized = image_cache.get(key)
+        if resized is None:
+            resized = image.copy()
+            resized.setScalesWhenResized_(True)
             if dimensions is not None:
-                image.setSize_(dimensions)
+                resized.setSize_(dimensions)
             if template is not None:
-                image.setTemplate_(template)
-        return image
+                resized.setTemplate_(template)
+            image_cache.put(key, resized)
+        return resized
 
     # Handle NSImage instances directly
     if hasattr(filename, 'setScalesWhenResized_'):  # It's already an NSImage
@@ -135,38 +150,90 @@ def _nsimage_from_file(filename, dimensions=None, template=None):
         return image
 
     # Handle file paths (original behavior)
+    filename, stat = _locate_image_file(filename)
+    path = os.path.abspath(filename)
+    key = path, stat.st_mtime, stat.st_size, None if dimensions is None else tuple(dimensions), template
+    image = image_cache.get(key)
+    if image is not None:
+        return image
+    if image_cache.discard(lambda cached: cached[0] == path and cached[1:3] != key[1:3]):
+        log.image.debug('image at {0} changed on disk', path)
+    image = NSImage.alloc().initByReferencingFile_(filename)
+    image.setScalesWhenResized_(True)
+    image.setSize_((20, 20) if dimensions is None else dimensions)
+    if not template is None:
+        image.setTemplate_(template)
+    image_cache.put(key, image)
+    return image
+
+
+def _locate_image_file(filename):
+    """Return the path of the image file `filename` and its :func:`os.stat`, raising :class:`IOError` if it doesn't
+    exist."""
     try:
-        _log('attempting to open image at {0}'.format(filename))
-        with open(filename):
-            pass
-    except IOError:  # literal file path didn't work -- try to locate image based on main script path
+        log.image.debug('attempting to open image at {0}', filename)
+        return filename, os.stat(filename)
+    except (IOError, OSError):  # literal file path didn't work -- try to locate image based on main script path
         try:
             from __main__ import __file__ as main_script_path
             main_script_path = os.path.dirname(main_script_path)
             filename = os.path.join(main_script_path, filename)
         except ImportError:
             pass
-        _log('attempting (again) to open image at {0}'.format(filename))
+        log.image.debug('attempting (again) to open image at {0}', filename)
         with open(filename):  # file doesn't exist
             pass              # otherwise silently errors in NSImage which isn't helpful for debugging
-    image = NSImage.alloc().initByReferencingFile_(filename)
-    image.setScalesWhenResized_(True)
-    image.setSize_((20, 20) if dimensions is None else dimensions)
-    if not template is None:
-        image.setTemplate_(template)
-    return image
+        return filename, os.stat(filename)
+
+
+def _nsimage_size(image):
+    # bytes of a decoded RGBA bitmap at 2x scale
+    size = image.size()
+    return int(size.width * size.height * 16)
+
+
+# The LRU cache of images loaded from files by rumps, shared by menu items, the status bar icon, windows,
+# alerts and notifications. An image is reused while its file is unchanged and it is requested with the same
+# dimensions and template mode. ``image_cache.info()`` returns hit, miss and eviction counts; ``max_entries`` and
+# ``max_size`` (an estimate in bytes of the decoded images) can be changed at any time.
+image_cache = LRUCache(max_entries=256, max_size=32 * 1024 * 1024, sizeof=_nsimage_size)
+
+# Native controls -> the menu items and widgets owning them, for the action methods of NSApp. Owners are weakly
+# referenced and menus detach the items removed from them; ``callback_registry.stats()`` reports the live entries.
+callback_registry = CallbackRegistry()
+
+
+def _attach_callbacks(value):
+    callback_registry.attach(value)
+    if isinstance(value, Menu) and len(value):
+        for child in value.values():
+            _attach_callbacks(child)
+
+
+def _detach_callbacks(value):
+    callback_registry.detach(value)
+    if isinstance(value, Menu) and len(value):
+        for child in value.values():
+            _detach_callbacks(child)
 
 
 # Assuming this is part of a rumps-based application where these are imported elsewhere:
 # from AppKit import NSImage, NSImageSymbolConfiguration, NSColor
-# And _log is defined somewhere in the parent module
+# And log is imported in the parent module
 
 class SFSymbol:
     """Helper class for creating SF Symbol images with extensive customization options.
     
     SF Symbols are Apple's system-provided icons that automatically adapt to the current appearance
     and accessibility settings. They are available on macOS 11.0 and later.
+
+    Instances are immutable and interned: creating a symbol with the same parameters as a recently created one
+    returns that same instance, and its image is only built the first time it is called. See
+    :meth:`SFSymbol.cache_info`.
     """
+
+    # interned instances by parameters; bounded so that symbols with ever changing colors don't pile up
+    _instances = LRUCache(max_entries=512)
     
     # Constants for weight values (NSFont.Weight equivalents)
     WEIGHT_MAP = {
@@ -210,23 +277,58 @@ class SFSymbol:
         :param scale: Symbol scale - "small", "medium", "large"
         :param text_style: Text style - "body", "caption1", "caption2", "footnote", "headline", "subheadline", "title1", "title2", "title3"
         """
-        self.name = name
-        self.rendering = rendering
-        self.color = color
-        self.point_size = point_size
-        self.weight = weight
-        self.scale = scale
-        self.text_style = text_style
-        self.accessibility_description = accessibility_description or name.replace('.', ' ').replace('_', ' ')
-        
-        self._nsimage = self._create_nsimage()
+        if '_nsimage' in self.__dict__:  # don't initialize already existing instances
+            return
+        set_attribute = super(SFSymbol, self).__setattr__
+        set_attribute('name', name)
+        set_attribute('rendering', rendering)
+        set_attribute('color', _freeze_color(color))
+        set_attribute('point_size', point_size)
+        set_attribute('weight', weight)
+        set_attribute('scale', scale)
+        set_attribute('text_style', text_style)
+        set_attribute('accessibility_description',
+                      accessibility_description or name.replace('.', ' ').replace('_', ' '))
+        set_attribute('_nsimage', None)
+        set_attribute('_built', False)
+
+    def __new__(cls, name, rendering="automatic", color=None, accessibility_description=None,
+                point_size=None, weight=None, scale=None, text_style=None):
+        key = (cls, name, rendering, _freeze_color(color), accessibility_description, point_size, weight, scale,
+               text_style)
+        try:
+            symbol = cls._instances.get(key)
+        except TypeError:  # unhashable parameters can't be interned
+            return super(SFSymbol, cls).__new__(cls)
+        if symbol is None:
+            symbol = super(SFSymbol, cls).__new__(cls)
+            cls._instances.put(key, symbol)
+        return symbol
+
+    def __setattr__(self, name, value):
+        raise AttributeError('SFSymbol instances are immutable; create a new one with the desired parameters')
+
+    __delattr__ = __setattr__
+
+    @classmethod
+    def cache_info(cls):
+        """Return statistics of the interned symbols as a named tuple: `hits` and `misses` count the symbols that were
+        reused or created, `evictions` those dropped to stay within `max_entries`, and `entries` the symbols currently
+        interned.
+        """
+        return cls._instances.info()
+
+    @classmethod
+    def cache_clear(cls):
+        """Forget all interned symbols and reset the statistics."""
+        cls._instances.clear()
 
     def _create_nsimage(self):
         """Create the NSImage from the SF Symbol with applied customizations."""
         try:
             # Check if SF Symbols are available (macOS 11.0+)
             if not hasattr(NSImage, 'imageWithSystemSymbolName_accessibilityDescription_'):
-                _log('SFSymbol: System symbols not available on this macOS version (requires 11.0+)')
+                log.image.warning('SFSymbol: System symbols not available on this macOS version (requires 11.0+)')
                 return None
 
             # Create base image using the class factory method
@@ -235,7 +337,7 @@ class SFSymbol:
             )
 
             if image is None:
-                _log(f'SFSymbol: System symbol "{self.name}" not found')
+                log.image.warning('SFSymbol: System symbol "{0}" not found', self.name)
                 return None
 
             # Apply symbol configuration if we have any customizations
@@ -250,10 +352,10 @@ class SFSymbol:
             return image
 
         except AttributeError:
-            _log('SFSymbol: System symbols not available on this macOS version (requires 11.0+)')
+            log.image.warning('SFSymbol: System symbols not available on this macOS version (requires 11.0+)')
             return None
         except Exception as e:
-            _log(f'SFSymbol: Error creating symbol "{self.name}": {e}')
+            log.image.warning('SFSymbol: Error creating symbol "{0}": {1}', self.name, e)
             return None
 
     def _build_configuration(self):
@@ -288,7 +390,7 @@ class SFSymbol:
             return config
             
         except Exception as e:
-            _log(f'SFSymbol: Error creating configuration for "{self.name}": {e}')
+            log.image.warning('SFSymbol: Error creating configuration for "{0}": {1}', self.name, e)
             return None
 
     def _create_size_weight_scale_config(self):
@@ -340,7 +442,7 @@ class SFSymbol:
                     return NSImageSymbolConfiguration.configurationWithScale_(ns_scale)
             
         except Exception as e:
-            _log(f'SFSymbol: Error creating size/weight/scale config: {e}')
+            log.image.warning('SFSymbol: Error creating size/weight/scale config: {0}', e)
         
         return None
 
@@ -349,8 +451,6 @@ class SFSymbol:
         if self.rendering == "automatic":
             return None
 
-        print(hasattr(NSImageSymbolConfiguration, 'configurationWithColorRenderingMode_'))
-        
         try:
             # Try convenience methods first (various macOS versions)
             if self.rendering == "multicolor" and hasattr(NSImageSymbolConfiguration, 'preferringMulticolor'):
@@ -360,14 +460,12 @@ class SFSymbol:
                 # macOS 16+ (Ventura)
                 return NSImageSymbolConfiguration.preferringMonochrome()
             elif hasattr(NSImageSymbolConfiguration, 'configurationWithColorRenderingMode_'):
-                print("rendering mode is supported")
                 mode = self.RENDERING_MODE_MAP.get(self.rendering)
-                print(mode)
                 if mode is not None:
                     return NSImageSymbolConfiguration.configurationWithColorRenderingMode_(mode)
                     
         except Exception as e:
-            _log(f'SFSymbol: Error creating rendering config: {e}')
+            log.image.warning('SFSymbol: Error creating rendering config: {0}', e)
         
         return None
 
@@ -399,7 +497,7 @@ class SFSymbol:
                         return NSImageSymbolConfiguration.configurationWithPaletteColors_([ns_color])
                         
         except Exception as e:
-            _log(f'SFSymbol: Error creating color config: {e}')
+            log.image.warning('SFSymbol: Error creating color config: {0}', e)
         
         return None
 
@@ -431,11 +529,14 @@ class SFSymbol:
                     a = a/255.0
                 return NSColor.colorWithRed_green_blue_alpha_(r, g, b, a)
         except Exception as e:
-            _log(f'SFSymbol: Error parsing color "{color}": {e}')
+            log.image.warning('SFSymbol: Error parsing color "{0}": {1}', color, e)
         return None
 
     def __call__(self):
-        """Return the NSImage for use in rumps components."""
+        """Return the NSImage for use in rumps components, building it on the first call."""
+        if not self._built:
+            super(SFSymbol, self).__setattr__('_nsimage', self._create_nsimage())
+            super(SFSymbol, self).__setattr__('_built', True)
         return self._nsimage
 
     def __repr__(self):
@@ -453,24 +554,42 @@ class SFSymbol:
         return symbol()
 
 
+def _freeze_color(color):
+    # lists of components or of palette colors become (nested) tuples so that they can be part of a cache key
+    if isinstance(color, list):
+        return tuple(_freeze_color(c) for c in color)
+    return color
+
+
 # Decorators and helper function serving to register functions for dealing with interaction and events
 #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-def timer(interval):
+def timer(interval, tolerance=None, jitter=0, align_to=None, policy=None):
     """Decorator for registering a function as a callback in a new thread. The function will be repeatedly called every
     `interval` seconds. This decorator accomplishes the same thing as creating a :class:`rumps.Timer` object by using
     the decorated function and `interval` as parameters and starting it on application launch.
 
+    .. versionchanged:: 0.4.0
+       Accepts `tolerance`, `jitter`, `align_to` and `policy` keyword arguments.
+
     .. code-block:: python
 
         @rumps.timer(2)
         def repeating_function(sender):
             print 'hi'
 
+        @rumps.timer(60, tolerance=5, align_to=60)
+        def every_minute(sender):
+            print 'on the minute, give or take 5 seconds'
+
     :param interval: a number representing the time in seconds before the decorated function should be called.
+    :param tolerance: see :class:`rumps.Timer`.
+    :param jitter: see :class:`rumps.Timer`.
+    :param align_to: see :class:`rumps.Timer`.
+    :param policy: see :class:`rumps.Timer`.
     """
     def decorator(f):
         timers = timer.__dict__.setdefault('*timers', [])
-        timers.append(Timer(f, interval))
+        timers.append(Timer(f, interval, tolerance=tolerance, jitter=jitter, align_to=align_to, policy=policy))
         return f
     return decorator
 
@@ -774,6 +893,8 @@ class Menu(ListDict):
 
     def __init__(self):
         self._counts = {}
+        self._batch_depth = 0
+        self._batch_views = []
         if not hasattr(self, '_menu'):
             self._menu = NSMenu.alloc().init()
         super(Menu, self).__init__()
@@ -781,15 +902,22 @@ class Menu(ListDict):
     def __setitem__(self, key, value):
         if key not in self:
             key, value = self._process_new_menuitem(key, value)
-            self._menu.addItem_(value._menuitem)
-            if isinstance(value, (SliderMenuItem, TextFieldMenuItem, ImageMenuItem, ListMenuItem, ListView, CardMenuItem, ProgressBarMenuItem, CircularProgressMenuItem)):
-                self._set_subview_dimensions(self, value)
+            if self._batch_depth:
+                if isinstance(value, _VIEW_MENUITEM_TYPES):
+                    self._batch_views.append(value)
+            else:
+                self._menu.addItem_(value._menuitem)
+                if isinstance(value, _VIEW_MENUITEM_TYPES):
+                    self._set_subview_dimensions(self, value)
             super(Menu, self).__setitem__(key, value)
+            _attach_callbacks(value)
 
     def __delitem__(self, key):
         value = self[key]
-        self._menu.removeItem_(value._menuitem)
+        if not self._batch_depth:
+            self._menu.removeItem_(value._menuitem)
         super(Menu, self).__delitem__(key)
+        _detach_callbacks(value)
 
     def add(self, menuitem):
         """Adds the object to the menu as a :class:`rumps.MenuItem` using the :attr:`rumps.MenuItem.title` as the
@@ -799,8 +927,12 @@ class Menu(ListDict):
 
     def clear(self):
         """Remove all `MenuItem` objects from within the menu of this `MenuItem`."""
-        self._menu.removeAllItems()
+        if not self._batch_depth and self._menu is not None:
+            self._menu.removeAllItems()
+        values = list(self.values())
         super(Menu, self).clear()
+        for value in values:
+            _detach_callbacks(value)
 
     def copy(self):
         raise NotImplementedError
@@ -809,9 +941,10 @@ class Menu(ListDict):
     def fromkeys(cls, *args, **kwargs):
         raise NotImplementedError
 
-    def _set_subview_dimensions(self, menu, ele):
+    def _set_subview_dimensions(self, menu, ele, menu_width=None):
             # Ensure the item view spans the full width of the menu
-            menu_width = max(menu._menu.size().width, 200)
+            if menu_width is None:
+                menu_width = max(menu._menu.size().width, 200)
             view = ele._menuitem.view()
             view_height = view.frame().size.height
             view.setFrameSize_((menu_width, view_height))
@@ -820,6 +953,67 @@ class Menu(ListDict):
             subview = view.subviews()[0]
             subview.setFrame_(AppKit.NSMakeRect((menu_width - menu_width * 0.9) / 2, (view_height - view_height * 0.9) / 2, menu_width * 0.9, view_height * 0.9))
 
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager deferring changes to the underlying NSMenu. Items added, inserted or removed within the
+        block only update this `Menu` object; the NSMenu is brought in line with it in one pass when the outermost
+        block exits, and the menu width for items with custom views is computed once rather than for every item.
+
+        .. code-block:: python
+
+            with app.menu.batch():
+                for host in hosts:
+                    app.menu.add(rumps.MenuItem(host))
+
+        Only this menu is batched; use the `batch` of a submenu for changes made to it. :meth:`update` batches every
+        menu it populates.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._commit_batch()
+
+    def _commit_batch(self):
+        views, self._batch_views = self._batch_views, []
+        if self._menu is None:  # MenuItem without a submenu
+            return
+        self._sync_nsmenu()
+        present = set(map(id, self.values()))
+        views = [view for view in views if id(view) in present]  # not removed again within the batch
+        if views:
+            menu_width = max(self._menu.size().width, 200)
+            for view in views:
+                self._set_subview_dimensions(self, view, menu_width)
+
+    def _sync_nsmenu(self):
+        # order the NSMenu items like the values of this ListDict using as few NSMenu calls as possible: the largest
+        # set of items already in the right relative order stays put, everything else is removed and (re)inserted
+        nsmenu = self._menu
+        current = nsmenu.itemArray()
+        desired = [value._menuitem for value in self.values()]
+        position = dict((nsmenuitem, index) for index, nsmenuitem in enumerate(current))
+        present = [index for index, nsmenuitem in enumerate(desired) if nsmenuitem in position]
+        keep = set(desired[present[i]] for i in
+                   longest_increasing_subsequence([position[desired[index]] for index in present]))
+        if not keep and current:
+            nsmenu.removeAllItems()
+        else:
+            for nsmenuitem in current:
+                if nsmenuitem not in keep:
+                    nsmenu.removeItem_(nsmenuitem)
+        count = len(keep)
+        for index, nsmenuitem in enumerate(desired):
+            if nsmenuitem in keep:
+                continue
+            if index == count:
+                nsmenu.addItem_(nsmenuitem)
+            else:
+                nsmenu.insertItem_atIndex_(nsmenuitem, index)
+            count += 1
+
     def update(self, iterable, **kwargs):
         """Update with objects from `iterable` after each is converted to a :class:`rumps.MenuItem`, ignoring
         existing keys. This update is a bit different from the usual ``dict.update`` method. It works recursively and
@@ -860,15 +1054,121 @@ class Menu(ListDict):
                                          'submenu'.format(n, depth, len(tuple(ele))))
                     menuitem = MenuItem(menuitem)
                     menu.add(menuitem)
-                    parse_menu(submenu, menuitem, depth+1)
+                    with menuitem.batch():
+                        parse_menu(submenu, menuitem, depth+1)
 
                 # menu item / could be visual separator where ele is None or separator
                 else:
                     menu.add(ele)
-                    if isinstance(ele, (SliderMenuItem, TextFieldMenuItem, ImageMenuItem, ListMenuItem, ListView, CardMenuItem, ProgressBarMenuItem, CircularProgressMenuItem)):
-                        self._set_subview_dimensions(menu, ele)
-        parse_menu(iterable, self, 0)
-        parse_menu(kwargs, self, 0)
+        with self.batch():
+            parse_menu(iterable, self, 0)
+            parse_menu(kwargs, self, 0)
+
+    def reconcile(self, iterable, key=None):
+        """Make the menu match `iterable` by changing only what differs, instead of rebuilding it with :meth:`clear`
+        and :meth:`update`. Accepts the same containers as :meth:`update`.
+
+        Every element is matched with an existing menu item by key: its title, or the return value of `key` called
+        with the element if given. Matching menu items are kept along with their callbacks, icons and states. Their
+        title is changed if the element's string representation differs, and they are moved if the order changed.
+        Other elements are added as new menu items, menu items without a match are removed and submenus given as
+        pairs are reconciled recursively. `MenuItem` instances and widgets in `iterable` are also matched by
+        identity; separators are reused in order.
+
+        .. code-block:: python
+
+            def refresh(sender):
+                app.menu['Hosts'].reconcile(['{0}  {1} ms'.format(host, ping(host)) for host in hosts],
+                                            key=lambda title: title.split()[0])
+
+        :param iterable: the desired contents of the menu.
+        :param key: a function returning the key of an element.
+        """
+        with self.batch():
+            self._reconcile(iterable, key, 0)
+
+    def _reconcile(self, iterable, key, depth):
+        keys = dict((id(value), k) for k, value in iteritems(self))
+        separators = [k for k, value in iteritems(self) if isinstance(value, SeparatorMenuItem)]
+        separators.reverse()
+        wanted = ListDict()  # key -> (menu item, submenu or None, whether the element was a title)
+        for ele, submenu in self._spec_elements(iterable, depth):
+            is_title = False
+            if ele is None or ele is separator or isinstance(ele, SeparatorMenuItem):
+                if id(ele) in keys:
+                    k, value = keys[id(ele)], ele
+                elif separators:
+                    k = separators.pop()
+                    value = self[k]
+                else:
+                    k, value = self._process_new_menuitem(self._choose_key, ele)
+            elif hasattr(ele, '_menuitem'):
+                if id(ele) in keys:
+                    k, value = keys[id(ele)], ele
+                else:
+                    k, value = self._process_new_menuitem(self._choose_key if key is None else key(ele), ele)
+            else:
+                is_title = True
+                title = text_type(ele)
+                k = title if key is None else key(ele)
+                value = dict.get(self, k)
+                if isinstance(value, MenuItem) and not isinstance(value, SeparatorMenuItem):
+                    if value.title != title:
+                        value.title = title
+                else:
+                    k, value = self._process_new_menuitem(k, ele)
+            if k not in wanted:
+                wanted[k] = value, submenu, is_title
+
+        for k, value in list(iteritems(self)):
+            if k not in wanted or wanted[k][0] is not value:
+                del self[k]
+        if wanted and self._menu is None:
+            self._ensure_submenu()
+
+        previous = None
+        for k, (value, submenu, is_title) in iteritems(wanted):
+            following = next(iter(self), None) if previous is None else self.key_after(previous)
+            if following != k:
+                if k in self:
+                    super(ListDict, self).__delitem__(k)  # moved, the NSMenu is synced when the batch ends
+                else:
+                    _attach_callbacks(value)
+                    if isinstance(value, _VIEW_MENUITEM_TYPES):
+                        self._batch_views.append(value)
+                if previous is not None:
+                    super(Menu, self).insert_after(previous, (k, value))
+                elif following is not None:
+                    super(Menu, self).insert_before(following, (k, value))
+                else:
+                    super(ListDict, self).__setitem__(k, value)
+            previous = k
+            if submenu is not None:
+                with value.batch():
+                    value._reconcile(submenu, key, depth + 1)
+            elif is_title and len(value) and value.populate is None:
+                value.reconcile([])
+
+    @staticmethod
+    def _spec_elements(iterable, depth):
+        # yields (element, submenu or None) pairs from anything accepted by update
+        if isinstance(iterable, MenuItem):
+            yield iterable, None
+            return
+        for n, ele in enumerate(iteritems(iterable) if isinstance(iterable, collections_abc.Mapping) else iterable):
+            if not isinstance(ele, MenuItem) and isinstance(ele, collections_abc.Mapping):
+                for pair in Menu._spec_elements(ele, depth):
+                    yield pair
+            elif not isinstance(ele, (string_types, MenuItem)) and isinstance(ele, collections_abc.Iterable):
+                try:
+                    menuitem, submenu = ele
+                except (TypeError, ValueError):
+                    raise ValueError('menu iterable element #{0} at depth {1} has length {2}; must be a single '
+                                     'menu item or a pair consisting of a menu item and its '
+                                     'submenu'.format(n, depth, len(tuple(ele))))
+                yield menuitem, submenu
+            else:
+                yield ele, None
 
     # ListDict insertion methods
     #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -882,6 +1182,7 @@ class Menu(ListDict):
         key, menuitem = self._process_new_menuitem(self._choose_key, menuitem)
         self._insert_helper(existing_key, key, menuitem, 1)
         super(Menu, self).insert_after(existing_key, (key, menuitem))
+        _attach_callbacks(menuitem)
 
     def insert_before(self, existing_key, menuitem):
         """Insert a :class:`rumps.MenuItem` in the menu before the `existing_key`.
@@ -892,14 +1193,19 @@ class Menu(ListDict):
         key, menuitem = self._process_new_menuitem(self._choose_key, menuitem)
         self._insert_helper(existing_key, key, menuitem, 0)
         super(Menu, self).insert_before(existing_key, (key, menuitem))
+        _attach_callbacks(menuitem)
 
     def _insert_helper(self, existing_key, key, menuitem, pos):
         if existing_key == key:  # this would mess stuff up...
             raise ValueError('same key provided for location and insertion')
         existing_menuitem = self[existing_key]
+        if self._batch_depth:
+            if isinstance(menuitem, _VIEW_MENUITEM_TYPES):
+                self._batch_views.append(menuitem)
+            return
         index = self._menu.indexOfItem_(existing_menuitem._menuitem)
         self._menu.insertItem_atIndex_(menuitem._menuitem, index + pos)
-        if isinstance(menuitem, (SliderMenuItem, TextFieldMenuItem, ImageMenuItem, ListMenuItem, ListView, CardMenuItem, ProgressBarMenuItem, CircularProgressMenuItem)):
+        if isinstance(menuitem, _VIEW_MENUITEM_TYPES):
             self._set_subview_dimensions(self, menuitem)
 
     # Processing MenuItems
@@ -921,9 +1227,9 @@ class Menu(ListDict):
                 key = '%s_%d' % (cls.__name__, count)
 
         if hasattr(value, 'title') and key != value.title:
-            _log('WARNING: key {0} is not the same as the title of the corresponding MenuItem {1}; while this '
-                 'would occur if the title is dynamically altered, having different names at the time of menu '
-                 'creation may not be desired '.format(repr(key), repr(value.title)))
+            log.menu.warning('key {0!r} is not the same as the title of the corresponding MenuItem {1!r}; while this '
+                             'would occur if the title is dynamically altered, having different names at the time of '
+                             'menu creation may not be desired', key, value.title)
 
         return key, value
 
@@ -955,8 +1261,14 @@ class MenuItem(Menu):
     :param icon: a path to an image. If set to ``None``, the current image (if any) is removed.
     :param dimensions: a sequence of numbers whose length is two, specifying the dimensions of the icon.
     :param template: a boolean, specifying template mode for a given icon (proper b/w display in dark menu bar)
+    :param populate: a function building the submenu of this menu item when it is about to open. See
+                     :meth:`rumps.MenuItem.set_populate`.
+    :param ttl: the number of seconds the submenu built by `populate` is kept before being built again.
     """
 
+    _populate = None
+    _populating = None  # the future of a populate function with an execution policy or an async def one
+
     # NOTE:
     # Because of the quirks of PyObjC, a class level dictionary **inside an NSObject subclass for 10.9.x** is required
     # in order to have callback_ be a @classmethod. And we need callback_ to be class level because we can't use
@@ -971,7 +1283,8 @@ class MenuItem(Menu):
             return args[0]
         return super(MenuItem, cls).__new__(cls, *args, **kwargs)
 
-    def __init__(self, title, callback=None, key=None, icon=None, dimensions=None, template=None):
+    def __init__(self, title, callback=None, key=None, icon=None, dimensions=None, template=None, populate=None,
+                 ttl=None):
         if isinstance(title, MenuItem):  # don't initialize already existing instances
             return
         self._menuitem = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(text_type(title), None, '')
@@ -981,12 +1294,17 @@ class MenuItem(Menu):
         self._template = template
         self.set_icon(icon, dimensions, template)
         super(MenuItem, self).__init__()
+        if populate is not None:
+            self.set_populate(populate, ttl)
 
     def __setitem__(self, key, value):
+        self._ensure_submenu()
+        super(MenuItem, self).__setitem__(key, value)
+
+    def _ensure_submenu(self):
         if self._menu is None:
             self._menu = NSMenu.alloc().init()
             self._menuitem.setSubmenu_(self._menu)
-        super(MenuItem, self).__setitem__(key, value)
 
     def __repr__(self):
         return '<{0}: [{1} -> {2}; callback: {3}]>'.format(type(self).__name__, repr(self.title), list(map(str, self)),
@@ -1115,7 +1433,7 @@ class MenuItem(Menu):
         _internal.require_string_or_none(key)
         if key is not None:
             self._menuitem.setKeyEquivalent_(key)
-        NSApp._ns_to_py_and_callback[self._menuitem] = self, callback
+        callback_registry.register(self._menuitem, self, callback)
         self._menuitem.setAction_('callback:' if callback is not None else None)
 
     @property
@@ -1125,7 +1443,7 @@ class MenuItem(Menu):
         .. versionadded:: 0.2.0
 
         """
-        return NSApp._ns_to_py_and_callback[self._menuitem][1]
+        return callback_registry.callback(self, self._menuitem)
 
     @property
     def key(self):
@@ -1136,6 +1454,249 @@ class MenuItem(Menu):
         """
         return self._menuitem.keyEquivalent()
 
+    def set_populate(self, populate, ttl=None):
+        """Build the submenu of this menu item only when it is about to open instead of up front.
+
+        `populate` is called with this menu item right before its submenu is displayed for the first time. It can
+        either add items itself or return anything accepted by :meth:`rumps.Menu.update`. Previous contents are removed
+        first. The result is kept until :meth:`rumps.MenuItem.invalidate` is called or, if `ttl` is given, until it is
+        `ttl` seconds old; the submenu is then built again the next time it opens.
+
+        A `populate` function with a ``'thread'`` or ``'process'`` :func:`rumps.execution_policy`, or a coroutine
+        function run with ``App.run(loop='asyncio')``, leaves the submenu empty until it returns; what it returns is
+        then added on the main thread. If it fails, the submenu is built again the next time it opens.
+
+        .. code-block:: python
+
+            def recent_files(sender):
+                return [os.path.basename(path) for path in load_history()]
+
+            app.menu = [rumps.MenuItem('Open Recent', populate=recent_files, ttl=60)]
+
+        :param populate: the function building the submenu, or ``None`` to stop building it lazily.
+        :param ttl: the number of seconds the built submenu is kept, or ``None`` to keep it until invalidated.
+        """
+        self._ensure_submenu()
+        self._populate = populate
+        self._populate_ttl = ttl
+        self._populated_at = self._populating = None
+        callback_registry.register(self._menu, self, populate)
+        self._menu.setDelegate_(None if populate is None else _MenuDelegate.shared())
+
+    @property
+    def populate(self):
+        """The function building the submenu of this menu item when it is about to open, or ``None``."""
+        return self._populate
+
+    def invalidate(self):
+        """Discard the submenu built by :attr:`populate` so that it is built again the next time it opens."""
+        self._populated_at = self._populating = None
+
+    def _populate_if_stale(self):
+        if self._populate is None:
+            return
+        if self._populated_at is not None:
+            if self._populate_ttl is None or time.monotonic() - self._populated_at < self._populate_ttl:
+                return
+        with self.batch():
+            self.clear()
+            items = _internal.call_callback('populate', self._populate, self)
+            if hasattr(items, 'add_done_callback'):  # a future or task: added once it is done
+                self._populating = items
+                items.add_done_callback(lambda done: dispatch.call_on_main(self._populated, done))
+            elif items is not None:
+                self.update(items)
+        self._populated_at = time.monotonic()
+
+    def _populated(self, future):
+        if future is not self._populating:  # invalidated or started again since
+            return
+        self._populating = None
+        if future.cancelled() or future.exception() is not None:  # already reported by the policy or the loop
+            self._populated_at = None
+            return
+        items = future.result()
+        if items is not None:
+            with self.batch():
+                self.clear()
+                self.update(items)
+
+
+class PagedMenuItem(MenuItem):
+    """A :class:`rumps.MenuItem` whose submenu shows a window of a possibly very large data source, one page at a
+    time, with "Previous" and "More…" entries to move the window.
+
+    Only `page_size` row menu items are ever created. They are reused as the window moves so that memory use and
+    construction time do not depend on the size of the data source.
+
+    `source` is either a sequence (anything supporting ``len`` and slicing, e.g. a list or ``range``) or a callable
+    ``source(offset, limit)`` returning the elements of one page. For a callable, `total` may give the number of
+    elements (or be a callable returning it); if it is ``None``, every page is requested with one element more than
+    `page_size`, and the window can move forward as long as that element is returned.
+
+    The `callback` is called with the row :class:`rumps.MenuItem` that was clicked. Its ``data`` attribute is the
+    element of the data source it currently displays and ``index`` the position of that element in the source.
+
+    .. code-block:: python
+
+        def fetch_tickets(offset, limit):
+            return api.tickets(start=offset, count=limit)
+
+        app.menu = [rumps.PagedMenuItem('Tickets', fetch_tickets, callback=open_ticket,
+                                        formatter=lambda ticket: ticket['subject'])]
+
+    :param title: the name of this menu item.
+    :param source: a sequence or a callable ``source(offset, limit)`` returning a page of elements.
+    :param page_size: the number of elements displayed at once.
+    :param callback: the function called when a row is clicked.
+    :param formatter: a function returning the row title for an element. Defaults to the string representation.
+    :param total: for a callable `source`, the number of elements or a callable returning it.
+    :param previous_title: the title of the entry moving the window back.
+    :param more_title: the title of the entry moving the window forward.
+    """
+
+    def __init__(self, title, source, page_size=25, callback=None, formatter=None, total=None,
+                 previous_title='Previous', more_title=u'More…', **kwargs):
+        if isinstance(title, MenuItem):  # don't initialize already existing instances
+            return
+        if page_size < 1:
+            raise ValueError('page_size must be at least 1')
+        super(PagedMenuItem, self).__init__(title, **kwargs)
+        self._source = source
+        self._page_size = page_size
+        self._row_callback = callback
+        self._formatter = formatter or text_type
+        self._total = total
+        self._offset = 0
+        self._rows = []
+        self._previous = MenuItem(previous_title, callback=self._previous_clicked)
+        self._more = MenuItem(more_title, callback=self._more_clicked)
+        self._ensure_submenu()
+        with self.batch():
+            self._place('previous', self._previous)
+            self._place('more', self._more)
+        self._render()
+
+    def __repr__(self):
+        return '<{0}: [{1} -> offset {2}, page size {3}; callback: {4}]>'.format(
+            type(self).__name__, repr(self.title), self._offset, self._page_size, repr(self._row_callback))
+
+    def _place(self, key, menuitem, before=None):
+        # rows are keyed by their position in the window rather than by title so they bypass Menu.__setitem__
+        if before is None:
+            super(Menu, self).__setitem__(key, menuitem)
+        else:
+            super(Menu, self).insert_before(before, (key, menuitem))
+        if not self._batch_depth:
+            self._sync_nsmenu()
+
+    # Data source
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def _fetch(self, offset, limit):
+        if callable(self._source):
+            return list(self._source(offset, limit))
+        return list(self._source[offset:offset + limit])
+
+    def _known_total(self):
+        if not callable(self._source):
+            return len(self._source)
+        return self._total() if callable(self._total) else self._total
+
+    @property
+    def source(self):
+        """The data source. Setting it moves the window back to the start."""
+        return self._source
+
+    @source.setter
+    def source(self, new_source):
+        self._source = new_source
+        self._offset = 0
+        self._render()
+
+    @property
+    def page_size(self):
+        """The number of elements displayed at once."""
+        return self._page_size
+
+    @property
+    def offset(self):
+        """The position in the data source of the first displayed element."""
+        return self._offset
+
+    # Moving the window
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def scroll_to(self, offset):
+        """Move the window so that it starts at `offset`."""
+        total = self._known_total()
+        if total is not None:
+            offset = min(offset, max(total - 1, 0) // self._page_size * self._page_size)
+        self._offset = max(0, offset)
+        self._render()
+
+    def next_page(self):
+        """Move the window forward by one page."""
+        if self._has_more:
+            self.scroll_to(self._offset + self._page_size)
+
+    def previous_page(self):
+        """Move the window back by one page."""
+        self.scroll_to(self._offset - self._page_size)
+
+    def refresh(self):
+        """Read the current window from the data source again."""
+        self._render()
+
+    def _previous_clicked(self, _):
+        self.previous_page()
+
+    def _more_clicked(self, _):
+        self.next_page()
+
+    def _row_clicked(self, row):
+        if self._row_callback is not None:
+            # not through call_callback: NSApp.callback_ already measured this click
+            return _internal.call_as_function_or_method(self._row_callback, row)
+
+    def _render(self):
+        total = self._known_total()
+        if total is None:  # ask for one more element to find out whether there is a next page
+            page = self._fetch(self._offset, self._page_size + 1)
+            self._has_more = len(page) > self._page_size
+            del page[self._page_size:]
+        else:
+            page = self._fetch(self._offset, self._page_size)
+            self._has_more = self._offset + len(page) < total
+
+        with self.batch():
+            while len(self._rows) < len(page):  # rows are only ever created for the largest page seen
+                row = MenuItem('', callback=self._row_clicked)
+                self._place(len(self._rows), row, before='more')
+                self._rows.append(row)
+
+        for i, row in enumerate(self._rows):
+            if i < len(page):
+                element = page[i]
+                row.data = element
+                row.index = self._offset + i
+                title = text_type(self._formatter(element))
+                if row.title != title:
+                    row.title = title
+                if row.hidden:
+                    row.show()
+            else:
+                row.data = row.index = None
+                if not row.hidden:
+                    row.hide()
+        self._set_hidden(self._previous, self._offset == 0)
+        self._set_hidden(self._more, not self._has_more)
+
+    @staticmethod
+    def _set_hidden(menuitem, hidden):
+        if menuitem.hidden != hidden:
+            menuitem.hidden = hidden
+
 
 class SliderMenuItem(object):
     """Represents a slider menu item within the application's menu.
@@ -1175,12 +1736,12 @@ class SliderMenuItem(object):
 
         :param callback: the function to be called when the user drags the marker on the slider.
         """
-        NSApp._ns_to_py_and_callback[self._slider] = self, callback
+        callback_registry.register(self._slider, self, callback)
         self._slider.setAction_('callback:' if callback is not None else None)
 
     @property
     def callback(self):
-        return NSApp._ns_to_py_and_callback[self._slider][1]
+        return callback_registry.callback(self, self._slider)
 
     @property
     def value(self):
@@ -1257,13 +1818,13 @@ class TextFieldMenuItem(object):
 
         :param callback: the function to be called when the user types or presses Enter.
         """
-        NSApp._ns_to_py_and_callback[self._textfield] = self, callback
+        callback_registry.register(self._textfield, self, callback)
         self._textfield.setAction_('textFieldCallback:' if callback is not None else None)
 
     @property
     def callback(self):
         """Return the current callback function."""
-        return NSApp._ns_to_py_and_callback.get(self._textfield, (None, None))[1]
+        return callback_registry.callback(self, self._textfield)
 
     @property
     def text(self):
@@ -1317,15 +1878,15 @@ class ImageMenuItem(object):
                 if temp_image:
                     image_size = temp_image.size()
                     view_width, view_height = int(image_size.width), int(image_size.height)
-                    _log(f'ImageMenuItem: using natural image size {view_width}x{view_height}')
+                    log.widget.debug('ImageMenuItem: using natural image size {0}x{1}', view_width, view_height)
                 else:
                     # Fallback if image can't be loaded
                     view_width, view_height = 150, 100
-                    _log('ImageMenuItem: failed to load image, using fallback size')
+                    log.widget.warning('ImageMenuItem: failed to load image, using fallback size')
             except Exception as e:
                 # Fallback if image can't be loaded
                 view_width, view_height = 150, 100
-                _log(f'ImageMenuItem: error loading image {e}, using fallback size')
+                log.widget.warning('ImageMenuItem: error loading image {0}, using fallback size', e)
         elif dimensions is None:
             # No image and no dimensions - use default
             view_width, view_height = 150, 100
@@ -1412,11 +1973,11 @@ class ImageMenuItem(object):
             if image:
                 self._image_view.setImage_(image)
                 self._image_path = image_path
-                _log(f'ImageMenuItem: loaded image from {image_path}')
+                log.widget.debug('ImageMenuItem: loaded image from {0}', image_path)
             else:
-                _log(f'ImageMenuItem: failed to load image from {image_path}')
+                log.widget.warning('ImageMenuItem: failed to load image from {0}', image_path)
         except Exception as e:
-            _log(f'ImageMenuItem: error loading image from {image_path}: {e}')
+            log.widget.warning('ImageMenuItem: error loading image from {0}: {1}', image_path, e)
 
     def set_callback(self, callback):
         """Set the function serving as callback for when the image is clicked.
@@ -1424,17 +1985,17 @@ class ImageMenuItem(object):
         :param callback: the function to be called when the user clicks on the image.
         """
         if hasattr(self, '_button'):
-            NSApp._ns_to_py_and_callback[self._button] = self, callback
+            callback_registry.register(self._button, self, callback)
         else:
-            NSApp._ns_to_py_and_callback[self._image_view] = self, callback
+            callback_registry.register(self._image_view, self, callback)
 
     @property
     def callback(self):
         """Return the current callback function."""
         if hasattr(self, '_button'):
-            return NSApp._ns_to_py_and_callback.get(self._button, (None, None))[1]
+            return callback_registry.callback(self, self._button)
         else:
-            return NSApp._ns_to_py_and_callback.get(self._image_view, (None, None))[1]
+            return callback_registry.callback(self, self._image_view)
 
     @property
     def image_path(self):
@@ -1609,7 +2170,7 @@ class ListMenuItem(object):
         :param callback: the function to be called when an item is selected.
         """
         self._callback = callback
-        NSApp._ns_to_py_and_callback[self._combo] = self, callback
+        callback_registry.register(self._combo, self, callback)
 
     @property
     def callback(self):
@@ -1686,7 +2247,7 @@ class ListView(object):
         self._menuitem.setView_(self._view)
 
         # Store callback
-        NSApp._ns_to_py_and_callback[self._table_view] = self, callback
+        callback_registry.register(self._table_view, self, callback)
 
     def _populate_table(self):
         """Populate the table with items using a simple approach."""
@@ -1740,7 +2301,7 @@ class ListView(object):
     def set_callback(self, callback):
         """Set the function serving as callback for when an item is selected."""
         self._callback = callback
-        NSApp._ns_to_py_and_callback[self._table_view] = self, callback
+        callback_registry.register(self._table_view, self, callback)
 
     @property
     def callback(self):
@@ -1922,60 +2483,6 @@ class ProgressBarMenuItem(object):
             self._progress.stopAnimation_(None)
 
 
-class CircularProgressView(NSView):
-    """Custom view that draws a circular progress indicator using AppKit."""
-
-    def initWithFrame_value_color_lineWidth_(self, frame, value, color, line_width):
-        self = objc.super(CircularProgressView, self).initWithFrame_(frame)
-        if self:
-            self._value = float(value) if value is not None else 0.0   # 0..1
-            self._color = color or NSColor.colorWithSRGBRed_green_blue_alpha_(0x7F/255.0, 0x84/255.0, 0x8A/255.0, 1.0)
-            self._line_width = max(2.0, float(line_width) if line_width else 8.0)
-            self.setWantsLayer_(True)  # smoother on HiDPI
-        return self
-
-    def drawRect_(self, _rect):
-        # Geometry
-        bounds = self.bounds()
-        w, h = bounds.size.width, bounds.size.height
-        cx, cy = w * 0.5, h * 0.5
-        # Use half the stroke so the ring stays inside the view
-        radius = max(0.0, min(w, h) * 0.5 - self._line_width * 0.5)
-        if radius <= 0:
-            return
-
-        # --- Track (background ring) ---
-        track = NSBezierPath.bezierPath()
-        track.setLineWidth_(self._line_width)
-        track.appendBezierPathWithOvalInRect_(NSMakeRect(cx - radius, cy - radius, radius * 2, radius * 2))
-        NSColor.colorWithCalibratedWhite_alpha_(0.17, 1.0).set()  # light gray
-        track.stroke()
-
-        # --- Progress arc ---
-        v = max(0.0, min(1.0, float(self._value)))
-        if v > 0.0:
-            start_deg = 90.0                      # 12 o'clock
-            end_deg = start_deg - (v * 360.0)     # clockwise
-            arc = NSBezierPath.bezierPath()
-            arc.setLineWidth_(self._line_width)
-            arc.setLineCapStyle_(NSRoundLineCapStyle)
-            # IMPORTANT: angles are in DEGREES (do NOT convert to radians)
-            arc.appendBezierPathWithArcWithCenter_radius_startAngle_endAngle_clockwise_(
-                NSMakePoint(cx, cy), radius, start_deg, end_deg, True
-            )
-            (self._color or NSColor.systemBlueColor()).set()
-            arc.stroke()
-
-    # Public setters
-    def setValue_(self, value):
-        self._value = max(0.0, min(1.0, float(value)))
-        self.setNeedsDisplay_(True)
-
-    def setColor_(self, color):
-        self._color = color
-        self.setNeedsDisplay_(True)
-
-
 class CircularProgressMenuItem(object):
     """Represents a circular progress indicator menu item within the application's menu.
 
@@ -2024,6 +2531,7 @@ class CircularProgressMenuItem(object):
             # Use custom view for determinate progress to avoid visual artifacts
             ns_color = self._parse_color(color) if color else None
 
+            from .circular_progress import CircularProgressView
             self._custom_view = CircularProgressView.alloc().initWithFrame_value_color_lineWidth_(
                 NSMakeRect(2, 2, width - 4, height - 4),
                 self._value,
@@ -2128,6 +2636,7 @@ class CircularProgressMenuItem(object):
             # Switch to custom view for determinate progress
             ns_color = self._parse_color(self._color) if self._color else None
 
+            from .circular_progress import CircularProgressView
             self._custom_view = CircularProgressView.alloc().initWithFrame_value_color_lineWidth_(
                 NSMakeRect(2, 2, width - 4, height - 4),
                 self._value,
@@ -2173,7 +2682,7 @@ class CheckboxMenuItem(object):
         self._update_state()
 
         # Register callback
-        NSApp._ns_to_py_and_callback[self._menuitem] = self, callback
+        callback_registry.register(self._menuitem, self, callback)
 
     def _update_state(self):
         """Update the visual state of the checkbox."""
@@ -2219,12 +2728,12 @@ class CheckboxMenuItem(object):
         :param callback: the function to be called when the user clicks the checkbox.
         """
         self._callback = callback
-        NSApp._ns_to_py_and_callback[self._menuitem] = self, callback
+        callback_registry.register(self._menuitem, self, callback)
 
     @property
     def callback(self):
         """Return the current callback function."""
-        return NSApp._ns_to_py_and_callback.get(self._menuitem, (None, None))[1]
+        return callback_registry.callback(self, self._menuitem)
 
 
 class CardMenuItem(object):
@@ -2372,7 +2881,7 @@ class CardMenuItem(object):
                 if image:
                     image_view.setImage_(image)
             except Exception as e:
-                _log(f'CardMenuItem: error loading icon from {icon_path}: {e}')
+                log.widget.warning('CardMenuItem: error loading icon from {0}: {1}', icon_path, e)
 
     def __repr__(self):
         return '<{0}: [title: {1}; icon: {2}; callback: {3}]>'.format(
@@ -2388,12 +2897,12 @@ class CardMenuItem(object):
         :param callback: the function to be called when the user clicks on the card.
         """
         self._callback = callback
-        NSApp._ns_to_py_and_callback[self._button] = self, callback
+        callback_registry.register(self._button, self, callback)
 
     @property
     def callback(self):
         """Return the current callback function."""
-        return NSApp._ns_to_py_and_callback.get(self._button, (None, None))[1]
+        return callback_registry.callback(self, self._button)
 
     @property
     def title(self):
@@ -2428,12 +2937,72 @@ class CardMenuItem(object):
             self._icon_container.layer().setBackgroundColor_(color.CGColor())
 
 
+# menu items whose NSMenuItem displays a custom view sized to the width of the menu
+_VIEW_MENUITEM_TYPES = (SliderMenuItem, TextFieldMenuItem, ImageMenuItem, ListMenuItem, ListView, CardMenuItem,
+                        ProgressBarMenuItem, CircularProgressMenuItem)
+
+
 class SeparatorMenuItem(object):
     """Visual separator between :class:`rumps.MenuItem` objects in the application menu."""
     def __init__(self):
         self._menuitem = NSMenuItem.separatorItem()
 
 
+TimerDrift = collections.namedtuple('TimerDrift', 'fires mean max last')
+IntervalStats = collections.namedtuple('IntervalStats', 'current base max backoffs resets')
+
+#: Returned by the callback of a :class:`rumps.Timer` with a :class:`rumps.Backoff` policy when it found nothing new.
+NO_CHANGE = object()
+
+
+class Backoff(object):
+    """Timer policy lengthening the interval of a :class:`rumps.Timer` while its callback finds nothing new.
+
+    Every time the callback returns :data:`rumps.NO_CHANGE` the interval is multiplied by `factor`, up to
+    `max_interval`. Any other return value, a call to :meth:`rumps.Timer.reset` and, if `reset_on_wake`, the system
+    waking from sleep bring it back to the interval the timer was created with.
+
+    .. code-block:: python
+
+        @rumps.timer(5, policy=rumps.Backoff(factor=2, max_interval=300))
+        def check_mail(sender):
+            if not fetch_new_mail():
+                return rumps.NO_CHANGE
+
+    The return value of callbacks run with :func:`rumps.execution_policy` or as coroutines is not known when the next
+    call is scheduled and counts as activity.
+
+    :param factor: how much longer the interval gets every time, a number greater than 1.
+    :param max_interval: the longest interval in seconds, or ``None`` for no limit.
+    :param reset_on_wake: whether to go back to the base interval when the system wakes up.
+    """
+
+    def __init__(self, factor=2.0, max_interval=None, reset_on_wake=True):
+        if factor <= 1:
+            raise ValueError('factor must be greater than 1')
+        self.factor = factor
+        self.max_interval = max_interval
+        self.reset_on_wake = reset_on_wake
+
+    def __repr__(self):
+        return '<{0}: [factor: {1}; max_interval: {2}]>'.format(type(self).__name__, self.factor, self.max_interval)
+
+    def next_interval(self, timer, result):
+        """Return the interval before the next call of `timer`, whose callback just returned `result`."""
+        if result is not NO_CHANGE:
+            return timer.interval
+        interval = timer.current_interval * self.factor
+        if self.max_interval is not None:
+            interval = min(interval, max(self.max_interval, timer.interval))
+        return interval
+
+
+def _reset_timers_on_wake():
+    for t in list(_TIMERS):
+        if t.is_alive() and t.policy is not None and getattr(t.policy, 'reset_on_wake', False):
+            t.reset()
+
+
 class Timer(object):
     """
     Python abstraction of an Objective-C event timer in a new thread for application. Controls the callback function,
@@ -2442,14 +3011,48 @@ class Timer(object):
     .. versionchanged:: 0.2.0
        Method `__call__` removed.
 
+    .. versionchanged:: 0.4.0
+       All timers share a single native timer; see :func:`rumps.set_timer_tolerance`. Added the `tolerance`,
+       `jitter` and `align_to` parameters and :attr:`drift`.
+
+    .. code-block:: python
+
+        # check every host about every 5 seconds without waking up the system 50 times
+        for host in hosts:
+            rumps.Timer(check(host), 5, tolerance=0.5, jitter=1).start()
+
     :param callback: Function that should be called every `interval` seconds. It will be passed this
                      :class:`rumps.Timer` object as its only parameter.
     :param interval: The time in seconds to wait before calling the `callback` function.
+    :param tolerance: how many seconds late the callback may be called, so that macOS can handle it together with
+                      other wakeups. ``None`` uses the default set with :func:`rumps.set_timer_tolerance`.
+    :param jitter: delay every call by a random amount of time between 0 and `jitter` seconds, spreading out timers
+                   started together. The interval between calls averages `interval`.
+    :param align_to: instead of calling the callback right away when started, start at the next multiple of
+                     `align_to` seconds of the wall clock (e.g. ``60`` for the start of a minute).
+    :param policy: an object adapting the interval to what the callback returns, such as :class:`rumps.Backoff`.
     """
-    def __init__(self, callback, interval):
+    def __init__(self, callback, interval, tolerance=None, jitter=0, align_to=None, policy=None):
+        if tolerance is not None and tolerance < 0:
+            raise ValueError('tolerance must not be negative')
+        if jitter < 0:
+            raise ValueError('jitter must not be negative')
+        if align_to is not None and align_to <= 0:
+            raise ValueError('align_to must be positive')
         self.set_callback(callback)
         self._interval = interval
+        self._tolerance = tolerance
+        self._jitter = jitter
+        self._align_to = align_to
+        self._drift = [0, 0.0, 0.0, 0.0]  # fires, total, max, last
+        self._policy = policy
+        self._current_interval = self._max_interval = interval
+        self._backoffs = self._resets = 0
+        self._in_callback = False
+        self._first_call = False
         self._status = False
+        if policy is not None:
+            events.on_wake.register(_reset_timers_on_wake)
 
     def __repr__(self):
         return ('<{0}: [callback: {1}; interval: {2}; '
@@ -2458,18 +3061,74 @@ class Timer(object):
 
     @property
     def interval(self):
-        """The time in seconds to wait before calling the :attr:`callback` function."""
-        return self._interval  # self._nstimer.timeInterval() when active but could be inactive
+        """The time in seconds to wait before calling the :attr:`callback` function. Changing it while the timer is
+        running moves the next call to one new interval after the previous call, or to now if that has passed,
+        without stopping the timer.
+
+        .. versionchanged:: 0.4.0
+           Changes made within the first interval after :meth:`start` are no longer ignored.
+        """
+        return self._interval
 
     @interval.setter
     def interval(self, new_interval):
-        if self._status:
-            if abs(self._nsdate.timeIntervalSinceNow()) >= self._nstimer.timeInterval():
-                self.stop()
-                self._interval = new_interval
-                self.start()
-        else:
-            self._interval = new_interval
+        previous = self._nominal - self._current_interval if self._status else None
+        self._interval = self._current_interval = new_interval
+        if self._status and not self._in_callback and not self._first_call:  # otherwise _fire schedules the next call
+            self._nominal = max(previous + new_interval, NSDate.date().timeIntervalSince1970())
+            self._schedule()
+
+    @property
+    def current_interval(self):
+        """The time in seconds until the call after the next one: :attr:`interval`, unless changed by the
+        :attr:`policy`."""
+        return self._current_interval
+
+    @property
+    def policy(self):
+        """The object adapting the interval to what the callback returns, or ``None``."""
+        return self._policy
+
+    @property
+    def interval_stats(self):
+        """An :class:`IntervalStats` with the current, base and longest interval, and how many times the policy
+        lengthened the interval and brought it back to the base interval."""
+        return IntervalStats(self._current_interval, self._interval, self._max_interval, self._backoffs, self._resets)
+
+    def reset(self):
+        """Go back to the base :attr:`interval`. If the interval was lengthened by the :attr:`policy`, the next call
+        is rescheduled to at most one base interval after the previous one."""
+        if self._current_interval == self._interval:
+            return
+        previous = self._nominal - self._current_interval if self._status else None
+        self._current_interval = self._interval
+        self._resets += 1
+        if self._status and not self._in_callback:  # otherwise _fire schedules the next call
+            self._nominal = max(previous + self._interval, NSDate.date().timeIntervalSince1970())
+            self._schedule()
+
+    @property
+    def tolerance(self):
+        """How many seconds late the callback may be called, or ``None`` for the default tolerance."""
+        return self._tolerance
+
+    @property
+    def jitter(self):
+        """The maximum random delay in seconds added to every call."""
+        return self._jitter
+
+    @property
+    def align_to(self):
+        """The wall clock multiple in seconds the timer starts at, or ``None`` to start right away."""
+        return self._align_to
+
+    @property
+    def drift(self):
+        """A :class:`TimerDrift` with the number of calls since the timer was created and the mean, maximum and last
+        delay in seconds between when the callback was due, jitter included, and when it was called.
+        """
+        fires, total, worst, last = self._drift
+        return TimerDrift(fires, total / fires if fires else 0.0, worst, last)
 
     @property
     def callback(self):
@@ -2483,19 +3142,19 @@ class Timer(object):
     def start(self):
         """Start the timer thread loop."""
         if not self._status:
-            self._nsdate = NSDate.date()
-            self._nstimer = NSTimer.alloc().initWithFireDate_interval_target_selector_userInfo_repeats_(
-                self._nsdate, self._interval, self, 'callback:', None, True)
-            NSRunLoop.currentRunLoop().addTimer_forMode_(self._nstimer, NSDefaultRunLoopMode)
+            self._current_interval = self._interval
+            self._first_call = True  # due at start, or at align_to, whatever the interval
+            self._nominal = NSDate.date().timeIntervalSince1970()
+            if self._align_to is not None:
+                self._nominal = math.ceil(self._nominal / self._align_to) * self._align_to
+            self._schedule()
             _TIMERS[self] = None
             self._status = True
 
     def stop(self):
         """Stop the timer thread loop."""
         if self._status:
-            self._nstimer.invalidate()
-            del self._nstimer
-            del self._nsdate
+            scheduling.scheduler.cancel(self)
             self._status = False
 
     def set_callback(self, callback):
@@ -2505,12 +3164,57 @@ class Timer(object):
         setattr(self, '*callback', callback)
 
     def callback_(self, _):
-        _log(self)
+        log.timer.debug('{0}', self)
         try:
-            return _internal.call_as_function_or_method(getattr(self, '*callback'), self)
+            return _internal.call_callback('timer', getattr(self, '*callback'), self)
         except Exception:
             traceback.print_exc()
 
+    def _adapt(self, result):
+        try:
+            interval = self._policy.next_interval(self, result)
+        except Exception:
+            traceback.print_exc()
+            return
+        if interval > self._current_interval:
+            self._backoffs += 1
+            self._max_interval = max(self._max_interval, interval)
+        elif interval < self._current_interval:
+            self._resets += 1
+        self._current_interval = interval
+
+    def _schedule(self):
+        deadline = self._nominal
+        if self._jitter:
+            deadline += random.uniform(0, self._jitter)
+        scheduling.scheduler.schedule(self, deadline, self._tolerance)
+
+    def _fire(self, deadline):
+        if not self._status or self in scheduling.scheduler:  # stopped or rescheduled by a callback of this wakeup
+            return
+        drift = self._drift
+        late = max(NSDate.date().timeIntervalSince1970() - deadline, 0.0)
+        drift[0] += 1
+        drift[1] += late
+        drift[2] = max(drift[2], late)
+        drift[3] = late
+        self._in_callback = True
+        self._first_call = False
+        try:
+            result = self.callback_(None)
+        finally:
+            self._in_callback = False
+        if self._policy is not None:
+            self._adapt(result)
+        if self._status and self not in scheduling.scheduler:  # not stopped or restarted by the callback
+            interval = self._current_interval
+            nominal = self._nominal + interval
+            now = NSDate.date().timeIntervalSince1970()
+            if nominal <= now:  # skip missed fires like NSTimer
+                nominal = self._nominal + ((now - self._nominal) // interval + 1) * interval
+            self._nominal = nominal
+            self._schedule()
+
 
 class Window(object):
     """Generate a window to consume user input in the form of both text and button clicked.
@@ -2554,6 +3258,7 @@ class Window(object):
             title, ok, cancel, None, message)
         self._alert.setAlertStyle_(0)  # informational style
 
+        from .text_field import Editing, SecureEditing
         if secure:
             self._textfield = SecureEditing.alloc().initWithFrame_(NSMakeRect(0, 0, *dimensions))
         else:
@@ -2655,7 +3360,7 @@ class Window(object):
 
         :return: a :class:`rumps.rumps.Response` object that contains the text and the button clicked as an integer.
         """
-        _log(self)
+        log.app.debug('{0}', self)
         if NSUserDefaults.standardUserDefaults().stringForKey_('AppleInterfaceStyle') == 'Dark':
             self._alert.window().setAppearance_(AppKit.NSAppearance.appearanceNamed_('NSAppearanceNameVibrantDark'))
         clicked = self._alert.runModal() % 999
@@ -2705,11 +3410,36 @@ class Response(object):
         return self._text
 
 
+class _MenuDelegate(NSObject):
+    """Objective-C delegate class for the submenus of :class:`rumps.MenuItem` objects with a `populate` function, which
+    is kept in :data:`callback_registry` under the submenu."""
+
+    _instance = None
+
+    @classmethod
+    def shared(cls):
+        # NSMenu holds its delegate weakly so keep the only instance alive here
+        if cls._instance is None:
+            cls._instance = cls.alloc().init()
+        return cls._instance
+
+    def menuNeedsUpdate_(self, nsmenu):
+        try:
+            menuitem, populate = callback_registry.lookup(nsmenu)
+        except KeyError:  # removed from its menu, or garbage collected
+            return
+        if populate is None:
+            return
+        log.menu.debug('{0}', menuitem)
+        try:
+            menuitem._populate_if_stale()
+        except Exception:
+            traceback.print_exc()
+
+
 class NSApp(NSObject):
     """Objective-C delegate class for NSApplication. Don't instantiate - use App instead."""
 
-    _ns_to_py_and_callback = {}
-
     def userNotificationCenter_didActivateNotification_(self, notification_center, notification):
         notifications._clicked(notification_center, notification)
 
@@ -2726,8 +3456,8 @@ class NSApp(NSObject):
             quit_button.set_callback(quit_application)
             mainmenu.add(quit_button)
         else:
-            _log('WARNING: the default quit button is disabled. To exit the application gracefully, another button '
-                 'should have a callback of quit_application or call it indirectly.')
+            log.app.warning('the default quit button is disabled. To exit the application gracefully, another button '
+                            'should have a callback of quit_application or call it indirectly.')
         self.nsstatusitem.setMenu_(mainmenu._menu)  # mainmenu of our status bar spot (_menu attribute is NSMenu)
 
     def showMenu(self):
@@ -2762,55 +3492,58 @@ class NSApp(NSObject):
         )
 
     def receiveSleepNotification_(self, ns_notification):
-        _log('receiveSleepNotification')
+        log.app.debug('receiveSleepNotification')
         events.on_sleep.emit()
 
     def receiveWakeNotification_(self, ns_notification):
-        _log('receiveWakeNotification')
+        log.app.debug('receiveWakeNotification')
         events.on_wake.emit()
 
     def applicationWillTerminate_(self, ns_notification):
-        _log('applicationWillTerminate')
+        log.app.debug('applicationWillTerminate')
         events.before_quit.emit()
+        dispatch.shutdown_workers()
+        if 'rumps._aio' in sys.modules:  # only imported, along with asyncio, for App.run(loop=...)
+            sys.modules['rumps._aio'].stop()
 
     @classmethod
     def callback_(cls, nsmenuitem):
-        self, callback = cls._ns_to_py_and_callback[nsmenuitem]
-        _log(self)
+        self, callback = callback_registry.lookup(nsmenuitem)
+        log.menu.debug('{0}', self)
         try:
-            return _internal.call_as_function_or_method(callback, self)
+            return _internal.call_callback('menu', callback, self)
         except Exception:
             traceback.print_exc()
 
     @classmethod
     def textFieldCallback_(cls, nstextfield):
         """Callback for TextFieldMenuItem when text changes or Enter is pressed."""
-        self, callback = cls._ns_to_py_and_callback[nstextfield]
-        _log(self)
+        self, callback = callback_registry.lookup(nstextfield)
+        log.widget.debug('{0}', self)
         try:
-            return _internal.call_as_function_or_method(callback, self)
+            return _internal.call_callback('textfield', callback, self)
         except Exception:
             traceback.print_exc()
 
     @classmethod
     def imageCallback_(cls, nsimageview):
         """Callback for ImageMenuItem when image is clicked."""
-        self, callback = cls._ns_to_py_and_callback[nsimageview]
-        _log(self)
+        self, callback = callback_registry.lookup(nsimageview)
+        log.widget.debug('{0}', self)
         try:
-            return _internal.call_as_function_or_method(callback, self)
+            return _internal.call_callback('image', callback, self)
         except Exception:
             traceback.print_exc()
 
     @classmethod
     def checkboxCallback_(cls, nsmenuitem):
         """Callback for CheckboxMenuItem when checkbox is clicked."""
-        self, callback = cls._ns_to_py_and_callback[nsmenuitem]
+        self, callback = callback_registry.lookup(nsmenuitem)
         # Toggle the checked state
         self.toggle()
-        _log(self)
+        log.menu.debug('{0}', self)
         try:
-            return _internal.call_as_function_or_method(callback, self)
+            return _internal.call_callback('checkbox', callback, self)
         except Exception:
             traceback.print_exc()
 
@@ -2826,30 +3559,142 @@ class NSApp(NSObject):
                 # This is a direct NSComboBox object
                 nscombobox = nscombobox_or_notification
 
-            self, callback = cls._ns_to_py_and_callback[nscombobox]
-            _log(self)
+            self, callback = callback_registry.lookup(nscombobox)
+            log.widget.debug('{0}', self)
 
             # Update internal tracking
             self._selected_index = nscombobox.indexOfSelectedItem()
 
             # Call user callback
             if callback:
-                return _internal.call_as_function_or_method(callback, self)
+                return _internal.call_callback('list', callback, self)
         except Exception:
             traceback.print_exc()
 
     @classmethod
     def cardCallback_(cls, nsbutton):
         """Callback for CardMenuItem when card is clicked."""
-        self, callback = cls._ns_to_py_and_callback[nsbutton]
-        _log(self)
+        self, callback = callback_registry.lookup(nsbutton)
+        log.widget.debug('{0}', self)
         try:
             if callback:
-                return _internal.call_as_function_or_method(callback, self)
+                return _internal.call_callback('card', callback, self)
         except Exception:
             traceback.print_exc()
 
 
+StatusBarStats = collections.namedtuple('StatusBarStats', 'requested applied dropped')
+
+
+class _StatusBarUpdater(object):
+    """Applies title and icon changes of an :class:`rumps.App` to its status item, at most `max_refresh_rate` times
+    per second when a rate is set.
+
+    A change is applied right away if the previous update is at least one period old and it is made on the main
+    thread. Otherwise it is marked pending and all pending changes are applied together, with their latest values,
+    once the period has elapsed. Requests for a part that is already pending, and values equal to those on screen,
+    are counted as dropped.
+    """
+
+    _unset = object()
+
+    def __init__(self, app, max_refresh_rate=None):
+        self._app = app
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._scheduled = False
+        self._last_update = float('-inf')
+        self._shown = {'title': self._unset, 'icon': self._unset}
+        self.max_refresh_rate = max_refresh_rate
+        self.requested = self.applied = self.dropped = 0
+
+    @property
+    def max_refresh_rate(self):
+        return self._max_refresh_rate
+
+    @max_refresh_rate.setter
+    def max_refresh_rate(self, rate):
+        if rate is not None and rate <= 0:
+            raise ValueError('max_refresh_rate must be positive or None')
+        self._max_refresh_rate = rate
+        self._period = None if rate is None else 1.0 / rate
+
+    def stats(self):
+        return StatusBarStats(self.requested, self.applied, self.dropped)
+
+    def request(self, part):
+        nsapp = self._app.__dict__.get('_nsapp')
+        if nsapp is None:  # not running yet, the status item is initialized with the current values
+            return
+        with self._lock:
+            self.requested += 1
+            if part in self._pending:
+                self.dropped += 1
+                return
+            self._pending.add(part)
+            if self._scheduled:
+                return
+            now = NSDate.date().timeIntervalSince1970()
+            delay = 0 if self._period is None else self._last_update + self._period - now
+            if delay > 0 or not NSThread.isMainThread():
+                self._scheduled = True
+                _internal.call_later(delay, self.flush)
+                return
+        self.flush()
+
+    def flush(self):
+        """Apply pending changes now."""
+        with self._lock:
+            parts, self._pending = self._pending, set()
+            self._scheduled = False
+            self._last_update = NSDate.date().timeIntervalSince1970()
+        nsapp = self._app.__dict__.get('_nsapp')
+        if nsapp is None or not parts:
+            return
+        values = {'title': self._app._title, 'icon': self._app._icon_nsimage}
+        changed = [part for part in parts if values[part] is not self._shown[part] and
+                   not (part == 'title' and values[part] == self._shown[part])]
+        self.dropped += len(parts) - len(changed)
+        if not changed:
+            return
+        for part in changed:
+            self._shown[part] = values[part]
+        if 'icon' in changed:
+            nsapp.nsstatusitem.setImage_(values['icon'])
+        if 'title' in changed:
+            nsapp.nsstatusitem.setTitle_(values['title'])
+        nsapp.fallbackOnName()
+        self.applied += 1
+
+
+StartupPhase = collections.namedtuple('StartupPhase', 'name start duration deferred')
+StartupProfile = collections.namedtuple('StartupProfile', 'phases status_item complete')
+
+
+class _StartupTimer(object):
+    """Times the phases of starting an :class:`App`, in seconds since it was created."""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._phases = []
+        self._marks = {}
+        self.deferring = False
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.append(StartupPhase(name, start - self._origin, time.perf_counter() - start, self.deferring))
+
+    def mark(self, name):
+        self._marks[name] = time.perf_counter() - self._origin
+
+    def profile(self):
+        return StartupProfile(tuple(self._phases), self._marks.get('status_item'), self._marks.get('complete'))
+
+
 class App(object):
     """Represents the statusbar application.
 
@@ -2867,27 +3712,47 @@ class App(object):
                  application. Parsing is implemented by calling :meth:`rumps.MenuItem.update`.
     :param quit_button: the quit application menu item within the main menu. If ``None``, the default quit button will
                         not be added.
+    :param max_refresh_rate: the maximum number of times per second the statusbar title and icon are updated. See
+                             :attr:`max_refresh_rate`.
     """
 
     # NOTE:
     # Serves as a setup class for NSApp since Objective-C classes shouldn't be instantiated normally.
     # This is the most user-friendly way.
 
-    #: A serializer for notification data.  The default is pickle.
+    #: A serializer for notification data.  The default is pickle.  It can also be the name of one of the more compact
+    #: serializers of :mod:`rumps.serializers`, e.g. ``'json'`` or ``'marshal+zlib'``.
     serializer = pickle
 
-    def __init__(self, name, title=None, icon=None, template=None, menu=None, quit_button='Quit'):
+    def __init__(self, name, title=None, icon=None, template=None, menu=None, quit_button='Quit',
+                 max_refresh_rate=None):
         _internal.require_string(name)
+        self._startup = _StartupTimer()
         self._name = name
         self._icon = self._icon_nsimage = self._title = None
+        self._status_bar = _StatusBarUpdater(self, max_refresh_rate)
         self._template = template
         self.icon = icon
         self.title = title
         self.quit_button = quit_button
         self._menu = Menu()
         if menu is not None:
-            self.menu = menu
-        self._application_support = application_support(self._name)
+            with self._startup.phase('menu'):
+                self.menu = menu
+        with self._startup.phase('application_support'):
+            self._application_support = application_support(self._name)
+
+    def __setattr__(self, name, value):
+        # bound methods of the running instance are cached for callback dispatch (see rumps._internal) so the cache
+        # must be dropped when a callable attribute appears, is replaced or disappears
+        if callable(value) or callable(self.__dict__.get(name)):
+            _internal.invalidate_method_cache()
+        super(App, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        if callable(self.__dict__.get(name)):
+            _internal.invalidate_method_cache()
+        super(App, self).__delattr__(name)
 
     # Properties
     #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -2915,10 +3780,7 @@ class App(object):
     def title(self, title):
         _internal.require_string_or_none(title)
         self._title = title
-        try:
-            self._nsapp.setStatusBarTitle()
-        except AttributeError:
-            pass
+        self._status_bar.request('title')
 
     @property
     def icon(self):
@@ -2928,18 +3790,27 @@ class App(object):
         .. versionchanged:: 0.2.0
            If the icon is set to an image then changed to ``None``, it will correctly be removed.
 
+        .. versionchanged:: 0.4.0
+           An icon set before :meth:`run` is only loaded by :meth:`run`, which may defer it (see `defer_startup`).
+           A path to a file that doesn't exist still raises :class:`IOError` right away.
+
         """
         return self._icon
 
     @icon.setter
     def icon(self, icon_path):
-        new_icon = _nsimage_from_file(icon_path, template=self._template) if icon_path is not None else None
+        if self.__dict__.get('_nsapp') is None:  # loaded by run, which may defer it
+            if isinstance(icon_path, string_types):
+                _locate_image_file(icon_path)  # fail here rather than in run
+            self._icon = icon_path
+            self._icon_nsimage = None
+            return
         self._icon = icon_path
-        self._icon_nsimage = new_icon
-        try:
-            self._nsapp.setStatusBarIcon()
-        except AttributeError:
-            pass
+        self._load_icon()
+
+    def _load_icon(self):
+        self._icon_nsimage = _nsimage_from_file(self._icon, template=self._template) if self._icon is not None else None
+        self._status_bar.request('icon')
 
     @property
     def template(self):
@@ -2954,6 +3825,49 @@ class App(object):
         # resetting the icon to apply template setting
         self.icon = self._icon
 
+    @property
+    def max_refresh_rate(self):
+        """The maximum number of times per second the statusbar title and icon are updated, or ``None`` (the default)
+        to update them on every change.
+
+        With a rate set, changes made faster than that are coalesced: only the latest title and icon are shown, once
+        per period, from the main run loop. This is useful when several timers or threads push values into the title.
+        :attr:`status_bar_stats` counts the changes that never had to reach the statusbar.
+
+        .. code-block:: python
+
+            app = rumps.App('Metrics', max_refresh_rate=30)
+
+        """
+        return self._status_bar.max_refresh_rate
+
+    @max_refresh_rate.setter
+    def max_refresh_rate(self, rate):
+        self._status_bar.max_refresh_rate = rate
+
+    @property
+    def status_bar_stats(self):
+        """A named tuple with the number of title and icon changes `requested` while running, the number of statusbar
+        updates `applied` and the number of changes `dropped` because a newer one superseded them or they did not
+        change what is displayed.
+        """
+        return self._status_bar.stats()
+
+    @property
+    def startup_profile(self):
+        """A named tuple with the `phases` of starting the application so far, the time in seconds from creating it
+        until the `status_item` was shown and until startup was `complete`, or ``None`` before then. Every phase is a
+        named tuple with its `name`, `start` and `duration` in seconds and whether it was `deferred` until after the
+        status item was shown (see :meth:`run`).
+
+        .. code-block:: python
+
+            for phase in app.startup_profile.phases:
+                print('{0.name:<20} {1:6.1f} ms'.format(phase, phase.duration * 1e3))
+
+        """
+        return self._startup.profile()
+
     @property
     def menu(self):
         """Represents the main menu of the statusbar application. Setting `menu` works by calling
@@ -3026,8 +3940,31 @@ class App(object):
         .. versionchanged:: 0.2.1
             Accepts `debug` keyword argument.
 
+        With ``loop='asyncio'`` an asyncio event loop runs on the main thread alongside the application run loop,
+        without blocking it, even while a menu is open. Callbacks for menu items, timers, widgets and events can then
+        be coroutine functions (``async def``); each call is run as a task on that loop.
+
+        .. code-block:: python
+
+            @rumps.timer(60)
+            async def poll(sender):
+                async with session.get(URL) as response:
+                    app.title = await response.text()
+
+            app.run(loop='asyncio')
+
         :param debug: determines if application should log information useful for debugging. Same effect as calling
                       :func:`rumps.debug_mode`.
+        :param loop: ``'cocoa'`` (the default) to only run the application run loop, ``'asyncio'`` to also run a new
+                     asyncio event loop, or an asyncio event loop to run.
+        :param asyncio_interval: for an event loop passed as `loop`, whose sockets rumps cannot wait on, the maximum
+                                 number of seconds between two iterations of the loop. Defaults to 0.01. The loop
+                                 rumps creates for ``'asyncio'`` only runs when it has something to do.
+        :param profile_startup: once started, log how long each phase of starting took (see :attr:`startup_profile`)
+                                at warning level on the ``app`` subsystem of :mod:`rumps.log`, or call this function with
+                                the :attr:`startup_profile`.
+        :param defer_startup: show the status item first and only then load the icon and add the menu items of the
+                              :func:`clicked`, :func:`slider`, ... decorators, from the run loop.
 
         """
         dont_change = object()
@@ -3035,23 +3972,82 @@ class App(object):
         if debug is not dont_change:
             debug_mode(debug)
 
-        nsapplication = NSApplication.sharedApplication()
-        nsapplication.activateIgnoringOtherApps_(True)  # NSAlerts in front
-        self._nsapp = NSApp.alloc().init()
-        self._nsapp._app = self.__dict__  # allow for dynamic modification based on this App instance
-        nsapplication.setDelegate_(self._nsapp)
-        notifications._init_nsapp(self._nsapp)
+        loop = options.get('loop', 'cocoa')
+        if loop not in ('cocoa', 'asyncio') and not hasattr(loop, 'run_forever'):
+            raise ValueError("loop must be 'cocoa', 'asyncio' or an asyncio event loop, not {0!r}".format(loop))
 
-        setattr(App, '*app_instance', self)  # class level ref to running instance (for passing self to App subclasses)
-        t = b = None
-        for t in getattr(timer, '*timers', []):
-            t.start()
-        for b in getattr(clicked, '*buttons', []):
-            b(self)  # we waited on registering clicks so we could pass self to access _menu attribute
-        del t, b
+        startup = self._startup
+        defer = options.get('defer_startup', False)
+
+        if not defer:
+            with startup.phase('icon'):
+                self._load_icon()  # before self._nsapp exists, the status item is then created with the icon
 
-        self._nsapp.initializeStatusBar()
+        with startup.phase('nsapp'):
+            nsapplication = NSApplication.sharedApplication()
+            nsapplication.activateIgnoringOtherApps_(True)  # NSAlerts in front
+            self._nsapp = NSApp.alloc().init()
+            self._nsapp._app = self.__dict__  # allow for dynamic modification based on this App instance
+            nsapplication.setDelegate_(self._nsapp)
+            notifications._init_nsapp(self._nsapp)
+
+        setattr(App, '*app_instance', self)  # class level ref to running instance (for passing self to App subclasses)
+        with startup.phase('timers'):
+            for t in getattr(timer, '*timers', []):
+                t.start()
+        if not defer:
+            with startup.phase('decorators'):
+                self._register_decorated()
+
+        with startup.phase('status_item'):
+            self._nsapp.initializeStatusBar()
+        startup.mark('status_item')
+
+        if loop != 'cocoa':
+            with startup.phase('asyncio'):
+                from . import _aio
+                _aio.start(None if loop == 'asyncio' else loop, options.get('asyncio_interval', 0.01))
 
         AppHelper.installMachInterrupt()
-        events.before_start.emit()
+        with startup.phase('before_start'):
+            events.before_start.emit()
+        AppHelper.callAfter(self._finish_startup, defer, options.get('profile_startup', False))
         AppHelper.runEventLoop()
+
+    def _register_decorated(self):
+        for b in getattr(clicked, '*buttons', []):
+            b(self)  # we waited on registering clicks so we could pass self to access _menu attribute
+
+    def _finish_startup(self, deferred, report):
+        startup = self._startup
+        startup.deferring = True
+        if deferred:
+            with startup.phase('icon'):
+                self._load_icon()
+                self._status_bar.request('title')  # drop the name shown in place of the icon
+            with startup.phase('decorators'):
+                quit_button = self._quit_button
+                if quit_button is not None and self._menu.get(quit_button.title) is quit_button:
+                    del self._menu[quit_button.title]  # keep it last
+                    self._register_decorated()
+                    self._menu.add(quit_button)
+                else:
+                    self._register_decorated()
+        startup.mark('complete')
+        if not report:
+            return
+        profile = startup.profile()
+        if callable(report):
+            try:
+                report(profile)
+            except Exception:
+                traceback.print_exc()
+            return
+        # at warning level, which app logs from by default: the caller asked for the report
+        for phase in profile.phases:
+            log.app.warning('startup phase {0} took {1:.1f} ms{2}', phase.name, phase.duration * 1e3,
+                         ' (deferred)' if phase.deferred else '', phase=phase.name, duration=phase.duration,
+                         deferred=phase.deferred)
+        log.app.warning('status item shown after {0:.1f} ms, startup complete after {1:.1f} ms',
+                     profile.status_item * 1e3, profile.complete * 1e3,
+                     status_item=profile.status_item, complete=profile.complete)
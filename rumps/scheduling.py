@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.scheduling
+~~~~~~~~~~~~~~~~
+
+Running every :class:`rumps.Timer` from a single native timer.
+
+Started timers are kept in a hierarchical timing wheel by their next deadline. One ``NSTimer`` on the main run loop is
+set to fire at the earliest deadline, with the tolerance of the native timer up to the earliest deadline plus tolerance of
+any timer, so that macOS can fire it a little late together with other wakeups; when it does, every timer due by then
+is fired and rescheduled, and the native timer is moved to the next deadline. Hundreds of polling timers therefore cost
+the run loop one timer and, with a tolerance, far fewer wakeups. The wheel works to the millisecond: timers due within
+the same millisecond always share a wakeup.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import collections
+import math
+import threading
+
+from Foundation import NSDate, NSTimer, NSRunLoop, NSDefaultRunLoopMode, NSThread
+from PyObjCTools import AppHelper
+
+SchedulerStats = collections.namedtuple('SchedulerStats', 'timers wakeups fired tolerance')
+
+_EPSILON = 1e-6  # of a tick, absorbs float error when converting times to ticks
+
+
+def _now():
+    return NSDate.date().timeIntervalSince1970()
+
+
+class TimerWheel(object):
+    """Hierarchical timing wheel of items by deadline, in ticks of `resolution` seconds.
+
+    Level ``k`` has `slots` slots each spanning ``slots ** k`` ticks and holds the items due within
+    ``slots ** (k + 1)`` ticks of the current one; items further away overflow into a separate set. As time advances,
+    the items in the current slot of a level are cascaded down to finer levels. Adding and removing items are O(1);
+    finding the next deadline looks at no more than ``slots + 1`` slots per level.
+    """
+
+    def __init__(self, resolution=0.001, slots=64, levels=4):
+        self.resolution = resolution
+        self._slots = slots
+        self._widths = [slots ** level for level in range(levels)]
+        self._span = slots ** levels
+        self._levels = [{} for _ in range(levels)]  # unit -> {item: None}, ordered by insertion
+        self._overflow = {}
+        self._deadlines = {}  # item -> deadline in seconds
+        self._ticks = {}  # item -> deadline in ticks
+        self._where = {}  # item -> (level or None for the overflow, unit)
+        self._tick = 0
+
+    def __len__(self):
+        return len(self._ticks)
+
+    def __contains__(self, item):
+        return item in self._ticks
+
+    def add(self, item, deadline):
+        """Add `item` due at `deadline` seconds, replacing its previous deadline if it is already in the wheel.
+        Deadlines in the past are due at the next :meth:`advance`."""
+        self.remove(item)
+        tick = max(int(math.floor(deadline / self.resolution + _EPSILON)), self._tick)
+        self._deadlines[item] = deadline
+        self._ticks[item] = tick
+        self._place(item, tick)
+
+    def remove(self, item):
+        """Remove `item` and return whether it was in the wheel."""
+        if self._ticks.pop(item, None) is None:
+            return False
+        del self._deadlines[item]
+        level, unit = self._where.pop(item)
+        if level is None:
+            del self._overflow[item]
+        else:
+            bucket = self._levels[level][unit]
+            del bucket[item]
+            if not bucket:
+                del self._levels[level][unit]
+        return True
+
+    def deadline(self, item):
+        """Return the deadline of `item` in seconds, or ``None`` if it is not in the wheel."""
+        return self._deadlines.get(item)
+
+    def next_deadline(self):
+        """Return the earliest deadline in seconds, or ``None`` if the wheel is empty."""
+        tick, bucket = self._next_tick()
+        if tick is None:
+            return None
+        return min(self._deadlines[item] for item in bucket if self._ticks[item] == tick)
+
+    def advance(self, now):
+        """Move the wheel to `now` seconds, remove the items due by then and return them as ``(item, deadline)``
+        pairs, earliest first. Items due within the same tick as `now` are included."""
+        target = int(math.floor(now / self.resolution + _EPSILON))
+        due = []
+        while True:
+            tick = self._next_tick()[0]
+            if tick is None or tick > target:
+                break
+            self._tick = tick
+            self._cascade()
+            for item in sorted(self._levels[0].pop(tick), key=self._deadlines.get):
+                del self._ticks[item]
+                del self._where[item]
+                due.append((item, self._deadlines.pop(item)))
+        if target > self._tick:
+            self._tick = target
+            self._cascade()
+        return due
+
+    def _place(self, item, tick):
+        delta = tick - self._tick
+        for level, width in enumerate(self._widths):
+            if delta < width * self._slots:
+                unit = tick // width
+                self._levels[level].setdefault(unit, {})[item] = None
+                self._where[item] = level, unit
+                return
+        self._overflow[item] = None
+        self._where[item] = None, tick
+
+    def _cascade(self):
+        for level in range(1, len(self._widths)):
+            bucket = self._levels[level].pop(self._tick // self._widths[level], None)
+            if bucket:
+                for item in bucket:
+                    self._place(item, self._ticks[item])
+        if self._overflow:
+            for item in [item for item in self._overflow if self._ticks[item] - self._tick < self._span]:
+                del self._overflow[item]
+                self._place(item, self._ticks[item])
+
+    def _next_tick(self):
+        # the earliest tick and the bucket holding its items (amongst others)
+        best = best_bucket = None
+        for level, width in enumerate(self._widths):
+            buckets = self._levels[level]
+            if not buckets:
+                continue
+            first = self._tick // width
+            last = first + self._slots if best is None else min(first + self._slots, best // width)
+            for unit in range(first, last + 1):
+                bucket = buckets.get(unit)
+                if bucket:
+                    tick = unit if level == 0 else min(self._ticks[item] for item in bucket)
+                    if best is None or tick < best:
+                        best, best_bucket = tick, bucket
+                    break
+        if self._overflow:
+            tick = min(self._ticks[item] for item in self._overflow)
+            if best is None or tick < best:
+                best, best_bucket = tick, self._overflow
+        return best, best_bucket
+
+
+class TimerScheduler(object):
+    """Fires the timers added with :meth:`schedule` from one native timer.
+
+    Timers are called back with ``timer._fire(deadline)`` on the main thread, at most their tolerance after their
+    deadline so that timers due close together share a wakeup. `tolerance` is the tolerance of timers scheduled
+    without one. The native timer only exists while a timer is scheduled.
+    """
+
+    _IDLE_INTERVAL = 365 * 24 * 60 * 60.0  # the native timer repeats so that it stays valid; it is always moved
+
+    def __init__(self, tolerance=0.0, resolution=0.001):
+        self.tolerance = tolerance
+        self._wheel = TimerWheel(resolution)  # by deadline
+        self._latest = TimerWheel(resolution)  # by deadline plus tolerance
+        self._lock = threading.RLock()
+        self._nstimer = None
+        self._firing = False
+        self.wakeups = self.fired = 0
+
+    def __len__(self):
+        return len(self._wheel)
+
+    def __contains__(self, timer):
+        return timer in self._wheel
+
+    def schedule(self, timer, deadline, tolerance=None):
+        """Fire `timer` at `deadline` seconds since 1970, or up to `tolerance` seconds later, replacing its current
+        deadline."""
+        if tolerance is None:
+            tolerance = self.tolerance
+        with self._lock:
+            if not self._wheel:
+                now = _now()  # idle since the last wakeup: bring the wheels to the present
+                self._wheel.advance(now)
+                self._latest.advance(now)
+            self._wheel.add(timer, deadline)
+            self._latest.add(timer, deadline + tolerance)
+        self._rearm()
+
+    def cancel(self, timer):
+        """Stop firing `timer` and return whether it was scheduled."""
+        with self._lock:
+            if not self._wheel.remove(timer):
+                return False
+            self._latest.remove(timer)
+        self._rearm()
+        return True
+
+    def deadline(self, timer):
+        """Return the deadline of `timer` in seconds since 1970, or ``None`` if it is not scheduled."""
+        return self._wheel.deadline(timer)
+
+    def stats(self):
+        """Return a :class:`SchedulerStats` with the number of scheduled timers, how many times the native timer woke
+        the run loop, how many timers it fired and the coalescing tolerance."""
+        return SchedulerStats(len(self._wheel), self.wakeups, self.fired, self.tolerance)
+
+    def tick_(self, nstimer):
+        self.wakeups += 1
+        self._firing = True
+        try:
+            with self._lock:
+                now = _now()
+                due = self._wheel.advance(now)
+                for timer, _ in due:
+                    self._latest.remove(timer)
+                self._latest.advance(now)
+            for timer, deadline in due:
+                self.fired += 1
+                timer._fire(deadline)
+        finally:
+            self._firing = False
+            self._arm()
+
+    def _rearm(self):
+        if self._firing:  # done once every due timer has fired
+            return
+        if NSThread.isMainThread():
+            self._arm()
+        else:
+            AppHelper.callAfter(self._arm)
+
+    def _arm(self):
+        with self._lock:
+            deadline = self._wheel.next_deadline()
+            latest = self._latest.next_deadline()
+        if deadline is None:
+            if self._nstimer is not None:
+                self._nstimer.invalidate()
+                self._nstimer = None
+            return
+        fire_date = NSDate.dateWithTimeIntervalSince1970_(deadline)
+        if self._nstimer is None:
+            self._nstimer = NSTimer.alloc().initWithFireDate_interval_target_selector_userInfo_repeats_(
+                fire_date, self._IDLE_INTERVAL, self, 'tick:', None, True)
+            self._nstimer.setTolerance_(latest - deadline)
+            NSRunLoop.currentRunLoop().addTimer_forMode_(self._nstimer, NSDefaultRunLoopMode)
+        else:
+            self._nstimer.setTolerance_(latest - deadline)
+            self._nstimer.setFireDate_(fire_date)
+
+
+scheduler = TimerScheduler()
+
+
+def set_timer_tolerance(seconds):
+    """Let rumps fire a :class:`rumps.Timer` created without a `tolerance` up to `seconds` late, so that it shares a
+    run loop wakeup with the other timers due in that window. The default, ``0``, fires these timers at their
+    deadline. Applies from the next time each timer is scheduled.
+
+    .. code-block:: python
+
+        rumps.set_timer_tolerance(0.5)  # 300 hosts polled every 30 seconds wake the app ~60 times a minute, not 600
+
+    :param seconds: the coalescing tolerance in seconds.
+    """
+    if seconds < 0:
+        raise ValueError('timer tolerance must not be negative')
+    scheduler.tolerance = seconds
+
+
+def timer_stats():
+    """Return the :class:`SchedulerStats` of the timer scheduler."""
+    return scheduler.stats()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+rumps.serializers
+~~~~~~~~~~~~~~~~~
+
+Serializers for the data attached to notifications (see :func:`rumps.notification`).
+
+:attr:`rumps.App.serializer` can be any object with ``dumps`` and ``loads``, as :mod:`pickle` is, or the name of one
+of the serializers here: ``'pickle'``, ``'marshal'``, ``'json'`` or ``'msgpack'`` (which needs the msgpack package),
+optionally followed by ``'+zlib'`` to compress payloads that are worth compressing. ``marshal`` is the fastest,
+``json`` can be read back by any version of Python (and any other program) and ``pickle`` handles any object; lists of
+similar records, once compressed, take a third of the space or less.
+
+Apple limits notification data to about 1 KB once serialized. :func:`check_size` is applied before a notification is
+built, so that data over the limit fails at once with :class:`rumps.exceptions.PayloadTooLargeError` rather than in
+Notification Center; ``rumps.notification(..., oversized='store')`` keeps such data in the application support folder
+instead and sends only a key to it.
+
+:copyright: (c) 2020 by Jared Suttles
+:license: BSD-3-Clause, see LICENSE for details.
+"""
+
+import json as _json
+import marshal as _marshal
+import pickle as _pickle
+import zlib
+
+from . import compat
+from .exceptions import PayloadTooLargeError
+
+try:
+    import msgpack as _msgpack
+except ImportError:
+    _msgpack = None
+
+#: The largest serialized notification data, in bytes, Notification Center is given.
+USER_INFO_LIMIT = 1024
+
+
+class Serializer(object):
+    """Base class of the serializers here; subclasses implement :meth:`dumps` and :meth:`loads` on bytes."""
+
+    #: The name :func:`get_serializer` knows the serializer by.
+    name = None
+
+    def dumps(self, data):
+        raise NotImplementedError
+
+    def loads(self, dumped):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return '<{0}: {1}>'.format(type(self).__name__, self.name)
+
+
+class PickleSerializer(Serializer):
+    """:mod:`pickle` at its most compact protocol. Any picklable object, read back only by Python."""
+
+    name = 'pickle'
+
+    def dumps(self, data):
+        return _pickle.dumps(data, _pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, dumped):
+        return _pickle.loads(bytes(dumped))
+
+
+class MarshalSerializer(Serializer):
+    """:mod:`marshal`: builtin types only, the fastest of all, but tied to the version of Python that wrote it --
+    don't use it for notifications that may be clicked after the app has been upgraded to a new Python."""
+
+    name = 'marshal'
+
+    def dumps(self, data):
+        return _marshal.dumps(data)
+
+    def loads(self, dumped):
+        return _marshal.loads(bytes(dumped))
+
+
+class JSONSerializer(Serializer):
+    """Compact UTF-8 JSON: dicts with string keys, lists, strings, numbers, booleans and ``None``. Tuples come back as
+    lists."""
+
+    name = 'json'
+
+    def dumps(self, data):
+        return _json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, dumped):
+        if not isinstance(dumped, compat.string_types):
+            dumped = bytes(dumped).decode('utf-8')
+        return _json.loads(dumped)
+
+
+class MsgpackSerializer(Serializer):
+    """MessagePack, if the msgpack package is installed: the types of JSON plus bytes, and a little smaller."""
+
+    name = 'msgpack'
+
+    def __init__(self):
+        if _msgpack is None:
+            raise ImportError("the 'msgpack' serializer needs the msgpack package (pip install msgpack)")
+
+    def dumps(self, data):
+        return _msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, dumped):
+        return _msgpack.unpackb(bytes(dumped), raw=False)
+
+
+class Compressed(Serializer):
+    """Wraps another serializer and compresses its output with :mod:`zlib` when that makes it smaller.
+
+    Payloads are raw deflate streams with a 1 KB window: no header or checksum, and a compressor that is several
+    times cheaper to set up than that of :func:`zlib.compress`, which is most of the cost for data of this size.
+
+    :param serializer: the serializer whose output is compressed.
+    :param threshold: payloads shorter than this many bytes are not worth the try and are kept as they are.
+    :param level: the zlib compression level, from 1 (fastest) to 9 (smallest).
+    """
+
+    _RAW = b'\x00'
+    _ZLIB = b'\x01'
+    _WBITS = -10  # raw deflate, 2 ** 10 byte window
+    _MEMLEVEL = 4
+
+    def __init__(self, serializer, threshold=128, level=6):
+        self.serializer = serializer
+        self.threshold = threshold
+        self.level = level
+        self.name = '{0}+zlib'.format(getattr(serializer, 'name', None) or type(serializer).__name__)
+
+    def dumps(self, data):
+        dumped = self.serializer.dumps(data)
+        if isinstance(dumped, compat.text_type):
+            raise TypeError('{0!r} must serialize to bytes to be compressed'.format(self.serializer))
+        if len(dumped) >= self.threshold:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, self._WBITS, self._MEMLEVEL)
+            compressed = compressor.compress(dumped) + compressor.flush()
+            if len(compressed) < len(dumped):
+                return self._ZLIB + compressed
+        return self._RAW + dumped
+
+    def loads(self, dumped):
+        dumped = bytes(dumped)
+        if dumped[:1] == self._ZLIB:
+            return self.serializer.loads(zlib.decompress(dumped[1:], self._WBITS))
+        return self.serializer.loads(dumped[1:])
+
+
+_FORMATS = {
+    'pickle': PickleSerializer,
+    'marshal': MarshalSerializer,
+    'json': JSONSerializer,
+    'msgpack': MsgpackSerializer,
+}
+_serializers = {}
+
+
+def formats():
+    """Return the names of the serializers that can be used here, uncompressed."""
+    return tuple(name for name in _FORMATS if name != 'msgpack' or _msgpack is not None)
+
+
+def get_serializer(name):
+    """Return the serializer called `name`, e.g. ``'json'`` or ``'marshal+zlib'``.
+
+    :param name: one of :func:`formats`, optionally followed by ``'+zlib'``.
+    """
+    serializer = _serializers.get(name)
+    if serializer is None:
+        base, plus, compression = name.partition('+')
+        if base not in _FORMATS or (plus and compression != 'zlib'):
+            raise ValueError('unknown serializer {0!r}; use one of {1}, optionally followed by +zlib'.format(
+                name, ', '.join(map(repr, _FORMATS))))
+        serializer = _FORMATS[base]()
+        if plus:
+            serializer = Compressed(serializer)
+        _serializers[name] = serializer
+    return serializer
+
+
+def resolve(serializer):
+    """Return `serializer` itself, or the serializer it names when it is a string."""
+    if isinstance(serializer, compat.string_types):
+        return get_serializer(serializer)
+    return serializer
+
+
+def payload_size(dumped):
+    """Return the size in bytes of serialized data as it is sent to Notification Center."""
+    if isinstance(dumped, compat.text_type):
+        return len(dumped.encode('utf-8'))
+    return len(dumped)
+
+
+def check_size(dumped, limit=USER_INFO_LIMIT):
+    """Return the size of serialized data, raising :class:`rumps.exceptions.PayloadTooLargeError` if it is larger
+    than `limit` bytes."""
+    size = payload_size(dumped)
+    if size > limit:
+        raise PayloadTooLargeError(
+            'notification data is {0} bytes once serialized, over the {1} byte limit of Notification Center; send '
+            'less, use a more compact serializer, or pass oversized="store"'.format(size, limit), size, limit)
+    return size
@@ -10,6 +10,11 @@ Generic container classes and utility functions.
 :license: BSD-3-Clause, see LICENSE for details.
 """
 
+import bisect
+import collections
+import threading
+import weakref
+
 from .packages.ordereddict import OrderedDict as _OrderedDict
 
 
@@ -30,3 +35,221 @@ class ListDict(_OrderedDict):
 
     def insert_before(self, existing_key, key_value):
         self.__insertion(self._OrderedDict__map[existing_key][0], key_value)
+
+    def key_after(self, existing_key):
+        """Return the key following `existing_key`, or ``None`` if it is the last one."""
+        return self._OrderedDict__map[existing_key][1][2]
+
+
+def longest_increasing_subsequence(seq):
+    """Return the indices of a longest strictly increasing subsequence of `seq` in O(n log n) time."""
+    tails = []          # tails[k]: index of the smallest tail of an increasing subsequence of length k + 1
+    tail_values = []
+    previous = [None] * len(seq)
+    for i, value in enumerate(seq):
+        k = bisect.bisect_left(tail_values, value)
+        if k:
+            previous[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(value)
+        else:
+            tails[k] = i
+            tail_values[k] = value
+    indices = []
+    i = tails[-1] if tails else None
+    while i is not None:
+        indices.append(i)
+        i = previous[i]
+    indices.reverse()
+    return indices
+
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses evictions entries size max_entries max_size')
+
+
+class LRUCache(object):
+    """Thread-safe mapping that keeps the least recently used values out once it holds more than `max_entries`
+    values or more than `max_size` in total size, as measured by `sizeof`. Either limit can be ``None``.
+    """
+
+    def __init__(self, max_entries=None, max_size=None, sizeof=None):
+        self._data = collections.OrderedDict()  # key -> (value, size), least recently used first
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._sizeof = sizeof or (lambda value: 1)
+        self._size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the value for `key` and mark it as most recently used, or `default` if it is not cached."""
+        with self._lock:
+            try:
+                entry = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Cache `value` under `key`, then evict least recently used values while over a limit."""
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._data[key] = value, size
+            self._size += size
+            self._shrink()
+
+    def discard(self, predicate):
+        """Remove every value whose key satisfies `predicate` and return how many were removed."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                self._size -= self._data.pop(key)[1]
+            return len(keys)
+
+    def clear(self):
+        """Remove all values and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Return a :class:`CacheInfo` with the statistics, the current number of entries and total size, and the
+        limits."""
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._data), self._size,
+                         self._max_entries, self._max_size)
+
+    @property
+    def max_entries(self):
+        """The maximum number of values kept, or ``None`` for no limit."""
+        return self._max_entries
+
+    @max_entries.setter
+    def max_entries(self, max_entries):
+        with self._lock:
+            self._max_entries = max_entries
+            self._shrink()
+
+    @property
+    def max_size(self):
+        """The maximum total size of the values kept, or ``None`` for no limit."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size):
+        with self._lock:
+            self._max_size = max_size
+            self._shrink()
+
+    def _shrink(self):
+        while self._data and ((self._max_entries is not None and len(self._data) > self._max_entries) or
+                              (self._max_size is not None and self._size > self._max_size)):
+            self._size -= self._data.popitem(last=False)[1][1]
+            self.evictions += 1
+
+
+RegistryStats = collections.namedtuple('RegistryStats', 'entries by_type registered unregistered collected')
+
+
+class _OwnerRef(weakref.ref):
+    __slots__ = ('native', 'type_name')
+
+    def __new__(cls, owner, callback, native):
+        self = weakref.ref.__new__(cls, owner, callback)
+        self.native = native
+        self.type_name = type(owner).__name__
+        return self
+
+    def __init__(self, owner, callback, native):
+        pass
+
+
+class CallbackRegistry(object):
+    """Maps the native objects sending actions to the Python objects owning them and their callbacks.
+
+    Owners are only weakly referenced: an entry disappears as soon as its owner is garbage collected. Each owner keeps
+    its own callbacks so that :meth:`detach` can drop its entries, for instance when it is removed from a menu, and
+    :meth:`attach` can bring them back if it is added again.
+    """
+
+    def __init__(self):
+        self._entries = {}  # native object -> weak reference to the owner
+        self._by_type = collections.Counter()
+        self.registered = self.unregistered = self.collected = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, native):
+        return native in self._entries
+
+    def register(self, native, owner, callback):
+        """Make actions sent by `native` call `callback` with `owner`."""
+        owner.__dict__.setdefault('*callbacks', {})[native] = callback
+        self._add(native, owner)
+        self.registered += 1
+
+    def lookup(self, native):
+        """Return the ``(owner, callback)`` pair registered for `native`, raising ``KeyError`` if there is none."""
+        owner = self._entries[native]()
+        if owner is None:
+            raise KeyError(native)
+        return owner, owner.__dict__['*callbacks'][native]
+
+    @staticmethod
+    def callback(owner, native):
+        """Return the callback `owner` has registered for `native`, or ``None``."""
+        return owner.__dict__.get('*callbacks', {}).get(native)
+
+    def detach(self, owner):
+        """Remove the entries of `owner` while keeping its callbacks, and return how many were removed."""
+        removed = 0
+        for native in owner.__dict__.get('*callbacks', ()):
+            ref = self._entries.get(native)
+            if ref is not None and ref() is owner:
+                self._remove(native, ref)
+                removed += 1
+        self.unregistered += removed
+        return removed
+
+    def attach(self, owner):
+        """Restore the entries of `owner` removed by :meth:`detach`."""
+        for native in owner.__dict__.get('*callbacks', ()):
+            if native not in self._entries:
+                self._add(native, owner)
+
+    def stats(self):
+        """Return a :class:`RegistryStats` with the number of live entries, in total and per owner type, and the
+        number of entries registered, explicitly unregistered and dropped along with their owner."""
+        return RegistryStats(len(self._entries), dict((k, v) for k, v in self._by_type.items() if v),
+                             self.registered, self.unregistered, self.collected)
+
+    def _add(self, native, owner):
+        old = self._entries.get(native)
+        if old is not None:
+            self._remove(native, old)
+        ref = _OwnerRef(owner, self._collected, native)
+        self._entries[native] = ref
+        self._by_type[ref.type_name] += 1
+
+    def _remove(self, native, ref):
+        del self._entries[native]
+        self._by_type[ref.type_name] -= 1
+
+    def _collected(self, ref):
+        if self._entries.get(ref.native) is ref:
+            self._remove(ref.native, ref)
+            self.collected += 1
@@ -46,7 +46,7 @@ setup(
     description='Ridiculously Uncomplicated MacOS Python Statusbar apps.',
     author='Jared Suttles',
     url='https://github.com/jaredks/rumps',
-    packages=['rumps', 'rumps.packages'],
+    packages=['rumps', 'rumps.packages', 'rumps.backends', 'rumps.backends.fake'],
     package_data={'': ['LICENSE']},
     long_description=readme + '\n\n' + changes,
     license='BSD License',
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+import pytest
+
+try:
+    import AppKit  # noqa: F401
+except ImportError:  # not on macOS -- run against the in-memory backend
+    os.environ.setdefault('RUMPS_BACKEND', 'fake')
+
+import rumps
+from rumps import backends
+
+
+@pytest.fixture(autouse=True)
+def _fresh_fake_backend():
+    if backends.name == 'fake':
+        from rumps.backends import fake
+        fake.reset()
+    yield
+    # decorators and App.run keep module level state; don't let it leak into the next test
+    for obj, name in ((rumps.App, '*app_instance'), (rumps.clicked, '*buttons'), (rumps.timer, '*timers')):
+        try:
+            delattr(obj, name)
+        except AttributeError:
+            pass
+    for t in rumps.timers():
+        t.stop()
+    if 'rumps._aio' in sys.modules:
+        sys.modules['rumps._aio'].stop()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+import rumps
+from rumps import backends
+
+pytestmark = pytest.mark.skipif(backends.name != 'fake', reason='drives the in-memory run loop')
+
+if backends.name == 'fake':
+    from rumps.backends import fake
+    from rumps.backends.fake.Foundation import NSRunLoop
+
+
+def run_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, 'timed out'
+        fake.run_pending()
+        time.sleep(0.001)
+
+
+class TestAsyncioLoop(object):
+    def test_async_click(self):
+        app = rumps.App('test', menu=['Fetch'])
+        seen = []
+
+        async def fetch(sender):
+            await asyncio.sleep(0)
+            sender.title = 'fetched'
+            seen.append(asyncio.get_running_loop())
+
+        app.menu['Fetch'].set_callback(fetch)
+        fake.launch(app, loop='asyncio')
+        task = fake.click(app.menu['Fetch'])
+        assert isinstance(task, asyncio.Task)
+        fake.run_for(0.1)
+        assert task.done()
+        assert app.menu['Fetch'].title == 'fetched'
+        assert len(seen) == 1
+
+    def test_async_timer_and_method(self):
+        class Subclass(rumps.App):
+            ticks = 0
+
+            @rumps.timer(1)
+            async def tick(self, sender):
+                await asyncio.sleep(0)
+                self.ticks += 1
+
+        app = Subclass('test')
+        fake.launch(app, loop='asyncio')
+        fake.run_for(3.5)
+        assert app.ticks == 4
+
+    def test_async_populate(self):
+        async def populate(sender):
+            await asyncio.sleep(0)
+            return ['x', 'y']
+
+        item = rumps.MenuItem('lazy', populate=populate)
+        fake.launch(rumps.App('test', menu=[item]), loop='asyncio')
+        fake.open_menu(item)
+        run_until(lambda: len(item) == 2)
+        assert [i.title() for i in item._menu.itemArray()] == ['x', 'y']
+
+    def test_idle_loop_does_not_wake_the_run_loop(self):
+        app = rumps.App('test', menu=['Wait'])
+
+        async def wait(sender):
+            await asyncio.sleep(0.05)
+            sender.title = 'waited'
+
+        app.menu['Wait'].set_callback(wait)
+        fake.launch(app, loop='asyncio')
+        fake.run_pending()
+        assert not NSRunLoop.currentRunLoop().has_timers()
+        fake.click(app.menu['Wait'])
+        fake.run_pending()
+        assert NSRunLoop.currentRunLoop().next_wakeup() == pytest.approx(fake.now() + 0.05, abs=0.02)
+        deadline = time.time() + 5
+        while app.menu['Wait'].title != 'waited':
+            assert time.time() < deadline, 'timed out'
+            fake.run_for(0.01)
+            time.sleep(0.001)
+        fake.run_pending()
+        assert not NSRunLoop.currentRunLoop().has_timers()
+
+    def test_socket_readiness_wakes_the_run_loop(self):
+        app = rumps.App('test', menu=['Status'])
+        reader, writer = socket.socketpair()
+        reader.setblocking(False)
+
+        async def receive(sender):
+            data = await asyncio.get_running_loop().sock_recv(reader, 10)
+            sender.title = data.decode()
+
+        app.menu['Status'].set_callback(receive)
+        fake.launch(app, loop='asyncio', asyncio_interval=3600)
+        try:
+            fake.click(app.menu['Status'])
+            fake.run_pending()
+            threading.Timer(0.05, writer.send, args=(b'done',)).start()
+            run_until(lambda: app.menu['Status'].title == 'done')  # without advancing virtual time
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_quit_from_coroutine_shuts_the_loop_down(self):
+        app = rumps.App('test')
+        loops = []
+
+        @rumps.timer(1)
+        async def quit_soon(sender):
+            loops.append(asyncio.get_running_loop())
+            rumps.quit_application()
+
+        app.run(loop='asyncio')
+        assert loops[0].is_closed()
+
+    def test_async_callback_requires_asyncio_loop(self, capsys):
+        app = rumps.App('test', menu=['Fetch'])
+
+        async def fetch(sender):
+            pass
+
+        app.menu['Fetch'].set_callback(fetch)
+        fake.launch(app)
+        assert fake.click(app.menu['Fetch']) is None
+        assert 'App.run(loop="asyncio")' in capsys.readouterr().err
+
+    def test_invalid_loop(self):
+        with pytest.raises(ValueError):
+            rumps.App('test').run(loop='trio')
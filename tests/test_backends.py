@@ -0,0 +1,587 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import time
+
+import pytest
+
+import rumps
+from rumps import backends, events
+
+pytestmark = pytest.mark.skipif(backends.name != 'fake', reason='drives the in-memory backend')
+
+if backends.name == 'fake':
+    import Foundation
+    from rumps.backends import fake
+    from AppKit import NSWorkspaceWillSleepNotification, NSWorkspaceDidWakeNotification
+
+
+class TestFakeApp(object):
+    def test_menu_click(self):
+        clicks = []
+        app = rumps.App('test', menu=['One', ('Sub', ['Two'])])
+        app.menu['One'].set_callback(lambda sender: clicks.append(sender))
+        app.menu['Sub']['Two'].set_callback(lambda sender: clicks.append(sender))
+        fake.launch(app)
+
+        fake.click(app.menu['One'])
+        fake.click(app.menu['Sub']['Two'])
+        assert clicks == [app.menu['One'], app.menu['Sub']['Two']]
+
+        status_item = app._nsapp.nsstatusitem
+        titles = [item.title() for item in status_item.menu().itemArray()]
+        assert titles == ['One', 'Sub', 'Quit']
+
+    def test_subclass_method_gets_self(self):
+        class Subclass(rumps.App):
+            @rumps.clicked('Hello')
+            def hello(self, sender):
+                return self, sender
+
+        app = Subclass('test')
+        fake.launch(app)
+        assert fake.click(app.menu['Hello']) == (app, app.menu['Hello'])
+
+    def test_title_falls_back_on_name(self):
+        app = rumps.App('fallback')
+        fake.launch(app)
+        assert app._nsapp.nsstatusitem.title() == 'fallback'
+        app.title = 'new'
+        assert app._nsapp.nsstatusitem.title() == 'new'
+
+    def test_timers_run_in_virtual_time(self):
+        ticks = []
+        t = rumps.Timer(lambda sender: ticks.append(fake.now()), 5)
+        t.start()
+        fake.run_for(60)
+        t.stop()
+        assert len(ticks) == 13  # fires immediately then every 5 seconds
+        assert ticks[-1] - ticks[0] == pytest.approx(60)
+        fake.run_for(60)
+        assert len(ticks) == 13
+
+    def test_run_until_quit(self):
+        app = rumps.App('test')
+        seen = []
+
+        @rumps.timer(1)
+        def tick(sender):
+            seen.append(sender)
+            if len(seen) == 3:
+                rumps.quit_application()
+
+        quitting = []
+        handler = events.before_quit.register(lambda: quitting.append(True))
+        try:
+            app.run()
+        finally:
+            events.before_quit.unregister(handler)
+        assert len(seen) == 3
+        assert quitting == [True]
+
+    def test_sleep_and_wake(self):
+        seen = []
+        sleep = events.on_sleep.register(lambda: seen.append('sleep'))
+        wake = events.on_wake.register(lambda: seen.append('wake'))
+        try:
+            fake.launch(rumps.App('test'))
+            fake.post_workspace_notification(NSWorkspaceWillSleepNotification)
+            fake.post_workspace_notification(NSWorkspaceDidWakeNotification)
+        finally:
+            events.on_sleep.unregister(sleep)
+            events.on_wake.unregister(wake)
+        assert seen == ['sleep', 'wake']
+
+
+class TestFakeRunLoop(object):
+    def test_call_later_from_other_thread_never_fires(self):
+        import threading
+        from PyObjCTools import AppHelper
+        calls = []
+        thread = threading.Thread(target=lambda: (AppHelper.callLater(1, calls.append, 'later'),
+                                                  AppHelper.callAfter(calls.append, 'after')))
+        thread.start()
+        thread.join()
+        fake.run_for(2)
+        assert calls == ['after']  # as with PyObjC: nothing runs the worker thread's run loop
+
+    def test_call_later_on_main_thread(self):
+        from PyObjCTools import AppHelper
+        calls = []
+        AppHelper.callLater(1, calls.append, 'later')
+        fake.run_for(0.5)
+        assert calls == []
+        fake.run_for(0.5)
+        assert calls == ['later']
+
+
+class TestFakeStatusBarUpdates(object):
+    def test_unlimited_applies_each_change(self):
+        app = rumps.App('test')
+        fake.launch(app)
+        fake.native_calls.clear()
+        app.title = 'a'
+        app.title = 'a'
+        app.title = 'b'
+        assert app._nsapp.nsstatusitem.title() == 'b'
+        assert fake.native_calls['NSStatusItem.setTitle_'] == 2
+        assert app.status_bar_stats == (3, 2, 1)
+
+    def test_coalesced_at_max_rate(self):
+        app = rumps.App('test', max_refresh_rate=30)
+        fake.launch(app)
+        fake.native_calls.clear()
+        for i in range(100):
+            app.title = str(i)
+        assert app._nsapp.nsstatusitem.title() == '0'  # leading edge
+        fake.run_for(1 / 30.0)
+        assert app._nsapp.nsstatusitem.title() == '99'
+        assert fake.native_calls['NSStatusItem.setTitle_'] == 2
+        assert app.status_bar_stats == (100, 2, 98)
+
+    def test_title_and_icon_applied_together(self, tmp_path):
+        icon = tmp_path / 'icon.png'
+        icon.write_bytes(b'')
+        app = rumps.App('test', max_refresh_rate=10)
+        fake.launch(app)
+        app.title = 'first'
+        fake.native_calls.clear()
+        app.title = 'second'
+        app.icon = str(icon)
+        app.icon = str(icon)
+        assert fake.native_calls['NSStatusItem.setTitle_'] == 0
+        fake.run_for(0.1)
+        assert fake.native_calls['NSStatusItem.setTitle_'] == 1
+        assert fake.native_calls['NSStatusItem.setImage_'] == 1
+        assert app.status_bar_stats.applied == 2
+
+    def test_other_threads_go_through_the_run_loop(self):
+        import threading
+        app = rumps.App('test')
+        fake.launch(app)
+        thread = threading.Thread(target=setattr, args=(app, 'title', 'from thread'))
+        thread.start()
+        thread.join()
+        assert app._nsapp.nsstatusitem.title() == 'test'
+        fake.run_for(0)
+        assert app._nsapp.nsstatusitem.title() == 'from thread'
+
+    def test_rate_limited_from_other_thread(self, monkeypatch):
+        import threading
+        from PyObjCTools import AppHelper
+        call_later, threads = AppHelper.callLater, []
+
+        def record(*args, **kwargs):
+            threads.append(threading.current_thread())
+            call_later(*args, **kwargs)
+        monkeypatch.setattr(AppHelper, 'callLater', record)
+        app = rumps.App('test', max_refresh_rate=1)
+        fake.launch(app)
+        app.title = 'first'
+        thread = threading.Thread(target=setattr, args=(app, 'title', 'from thread'))
+        thread.start()
+        thread.join()
+        fake.run_for(1)
+        assert threads == [threading.main_thread()]  # timers on another thread's run loop never fire
+        assert app._nsapp.nsstatusitem.title() == 'from thread'
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            rumps.App('test', max_refresh_rate=0)
+
+
+class TestFakeStartup(object):
+    def test_profile(self):
+        app = rumps.App('test', menu=['One'])
+        fake.launch(app)
+        assert app.startup_profile.complete is None
+        fake.run_pending()
+        profile = app.startup_profile
+        assert [phase.name for phase in profile.phases] == [
+            'menu', 'application_support', 'icon', 'nsapp', 'timers', 'decorators', 'status_item', 'before_start']
+        assert not any(phase.deferred for phase in profile.phases)
+        assert 0 < profile.status_item <= profile.complete
+        starts = [phase.start for phase in profile.phases]
+        assert starts == sorted(starts)
+
+    def test_report_to_function(self):
+        reports = []
+        app = rumps.App('test')
+        fake.launch(app, profile_startup=reports.append)
+        fake.run_pending()
+        assert reports == [app.startup_profile]
+
+    def test_report_to_log(self):
+        app = rumps.App('test')
+        fake.launch(app, profile_startup=True)
+        fake.run_pending()
+        records = rumps.log_events(subsystem='app', level='warning')
+        assert [r.fields['phase'] for r in records[:-1]] == [phase.name for phase in app.startup_profile.phases]
+        assert records[-1].message.startswith('status item shown after ')
+
+    def test_missing_icon_fails_before_run(self, tmp_path):
+        with pytest.raises(IOError):
+            rumps.App('test', icon=str(tmp_path / 'missing.png'))
+
+    def test_defer(self, tmp_path):
+        icon = tmp_path / 'icon.png'
+        icon.write_bytes(b'')
+
+        @rumps.clicked('Decorated')
+        def decorated(sender):
+            pass
+
+        app = rumps.App('test', icon=str(icon), menu=['One'])
+        fake.launch(app, defer_startup=True)
+        status_item = app._nsapp.nsstatusitem
+        assert (status_item.title(), status_item.image()) == ('test', None)
+        assert [item.title() for item in status_item.menu().itemArray()] == ['One', 'Quit']
+
+        fake.run_pending()
+        assert status_item.image() is not None and not status_item.title()
+        assert [item.title() for item in status_item.menu().itemArray()] == ['One', 'Decorated', 'Quit']
+        assert rumps.callback_registry.lookup(app.menu['Quit']._menuitem) == (app.menu['Quit'], rumps.quit_application)
+        deferred = [phase.name for phase in app.startup_profile.phases if phase.deferred]
+        assert deferred == ['icon', 'decorators']
+
+
+class TestFakeWidgets(object):
+    def test_build_every_widget(self):
+        app = rumps.App('test')
+        widgets = [
+            rumps.SliderMenuItem(value=10, min_value=0, max_value=20),
+            rumps.TextFieldMenuItem(text='abc', placeholder='type'),
+            rumps.ImageMenuItem(dimensions=(50, 50)),
+            rumps.ListMenuItem(items=['a', 'b']),
+            rumps.ListView(items=['a', 'b']),
+            rumps.CardMenuItem(title='card'),
+            rumps.ProgressBarMenuItem(value=0.5),
+            rumps.CircularProgressMenuItem(value=0.5),
+            rumps.CheckboxMenuItem(title='check'),
+        ]
+        app.menu = widgets
+        fake.launch(app)
+        assert len(app._nsapp.nsstatusitem.menu().itemArray()) == len(widgets) + 1
+
+    def test_widget_callbacks(self):
+        seen = []
+        slider = rumps.SliderMenuItem(value=5, callback=lambda sender: seen.append(sender.value))
+        checkbox = rumps.CheckboxMenuItem(title='check', callback=lambda sender: seen.append(sender.checked))
+        card = rumps.CardMenuItem(title='card', callback=lambda sender: seen.append(sender.title))
+        app = rumps.App('test', menu=[slider, checkbox, card])
+        fake.launch(app)
+
+        slider.value = 42
+        fake.click(slider)
+        fake.click(checkbox)
+        fake.click(card)
+        assert seen == [42, True, 'card']
+
+    def test_progress(self):
+        bar = rumps.ProgressBarMenuItem(value=0.1)
+        bar.value = 0.75
+        assert bar._text_field.stringValue() == '75%'
+
+
+class TestFakeLazyMenus(object):
+    def test_untouched_branches_are_never_built(self):
+        built = []
+
+        def branch(name, depth):
+            def populate(sender):
+                built.append(name)
+                if depth:
+                    return [rumps.MenuItem(name + str(i), populate=branch(name + str(i), depth - 1)) for i in range(3)]
+                return ['leaf']
+            return populate
+
+        app = rumps.App('test', menu=[rumps.MenuItem('a', populate=branch('a', 2)),
+                                      rumps.MenuItem('b', populate=branch('b', 2))])
+        fake.launch(app)
+        assert built == []
+        assert len(app.menu['b']._menu.itemArray()) == 0
+
+        fake.open_menu(app.menu['a'])
+        fake.open_menu(app.menu['a']['a1'])
+        assert built == ['a', 'a1']
+        assert list(app.menu['a']['a1']) == ['a10', 'a11', 'a12']
+        assert len(app.menu['a']['a0']._menu.itemArray()) == 0
+
+    def test_removed_submenus_are_forgotten(self):
+        app = rumps.App('test')
+        fake.launch(app)
+        before = len(rumps.callback_registry)
+        kept = []
+        for _ in range(100):
+            app.menu.clear()
+            items = [rumps.MenuItem(str(n), populate=lambda sender: ['x']) for n in range(5)]
+            app.menu.update(items)
+            kept.extend(items)  # alive, so only removing them from the menu can drop their entries
+        assert len(rumps.callback_registry) <= before + 2 * 5  # the item and its submenu of those in the menu
+        removed = kept[0]
+        fake.open_menu(removed)
+        assert len(removed) == 0
+        app.menu.add(removed)
+        fake.open_menu(removed)
+        assert list(removed) == ['x']
+
+    def test_cached_until_invalidated(self):
+        calls = []
+        item = rumps.MenuItem('lazy', populate=lambda sender: calls.append(sender) or ['x', 'y'])
+        fake.open_menu(item)
+        fake.open_menu(item)
+        assert calls == [item]
+        assert [i.title() for i in item._menu.itemArray()] == ['x', 'y']
+
+        item.invalidate()
+        fake.open_menu(item)
+        assert len(calls) == 2
+        assert [i.title() for i in item._menu.itemArray()] == ['x', 'y']
+
+    def test_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+        calls = []
+        item = rumps.MenuItem('lazy', populate=lambda sender: calls.append(now[0]), ttl=10)
+        fake.open_menu(item)
+        now[0] += 5
+        fake.open_menu(item)
+        assert len(calls) == 1
+        now[0] += 6
+        fake.open_menu(item)
+        assert len(calls) == 2
+
+    def test_populate_in_thread(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        @rumps.execution_policy('thread')
+        def populate(sender):
+            calls.append(sender)
+            started.set()
+            release.wait(5)
+            return ['x', 'y']
+
+        item = rumps.MenuItem('lazy', populate=populate)
+        fake.open_menu(item)
+        started.wait(5)
+        fake.open_menu(item)  # still running: not started again
+        assert len(item) == 0
+        release.set()
+        deadline = time.time() + 5
+        while len(item) < 2:
+            assert time.time() < deadline, 'timed out'
+            fake.run_pending()
+            time.sleep(0.001)
+        assert calls == [item]
+        assert [i.title() for i in item._menu.itemArray()] == ['x', 'y']
+
+    def test_populate_adding_items_itself(self):
+        def populate(sender):
+            sender.add('one')
+            sender.add('two')
+
+        item = rumps.MenuItem('lazy', populate=populate)
+        fake.open_menu(item)
+        item.invalidate()
+        fake.open_menu(item)
+        assert list(item) == ['one', 'two']
+        assert [i.title() for i in item._menu.itemArray()] == ['one', 'two']
+
+    def test_error_is_retried(self, capsys):
+        calls = []
+
+        def populate(sender):
+            calls.append(sender)
+            if len(calls) == 1:
+                raise ValueError('boom')
+            return ['ok']
+
+        item = rumps.MenuItem('lazy', populate=populate)
+        fake.open_menu(item)
+        assert 'ValueError: boom' in capsys.readouterr().err
+        fake.open_menu(item)
+        assert list(item) == ['ok']
+
+    def test_disable(self):
+        item = rumps.MenuItem('lazy', populate=lambda sender: ['x'])
+        item.set_populate(None)
+        fake.open_menu(item)
+        assert item.populate is None
+        assert len(item) == 0
+
+
+class TestFakeNotifications(object):
+    def test_round_trip(self):
+        received = []
+        handler = events.on_notification.register(received.append)
+        try:
+            fake.launch(rumps.App('test'))
+            rumps.notification('title', 'subtitle', 'message', data={'k': 'v'})
+            fake.activate_notification()
+        finally:
+            events.on_notification.unregister(handler)
+        assert received[0]['k'] == 'v'
+        assert received[0].title == 'title'
+
+    def test_serializer_by_name(self, monkeypatch):
+        received = []
+        handler = events.on_notification.register(received.append)
+        monkeypatch.setattr(rumps.App, 'serializer', 'json+zlib')
+        try:
+            fake.launch(rumps.App('test'))
+            rumps.notification('title', 'subtitle', 'message', data={'k': ['v'] * 100})
+            center = Foundation.NSUserNotificationCenter.defaultUserNotificationCenter()
+            assert center.scheduledNotifications()[-1].userInfo()['value'][:1] == b'\x01'
+            fake.activate_notification()
+        finally:
+            events.on_notification.unregister(handler)
+        assert received[0]['k'] == ['v'] * 100
+
+    def test_oversized_fails_before_scheduling(self):
+        fake.launch(rumps.App('test'))
+        with pytest.raises(rumps.exceptions.PayloadTooLargeError):
+            rumps.notification('title', 'subtitle', 'message', data='x' * 2000)
+        assert not Foundation.NSUserNotificationCenter.defaultUserNotificationCenter().scheduledNotifications()
+        with pytest.raises(ValueError):
+            rumps.notification('title', 'subtitle', 'message', data='x', oversized='truncate')
+
+    def test_oversized_stored(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('RUMPS_FAKE_APPLICATION_SUPPORT', str(tmp_path))
+        received = []
+        handler = events.on_notification.register(received.append)
+        try:
+            fake.launch(rumps.App('test'))
+            rumps.notification('title', 'subtitle', 'message', data='x' * 2000, oversized='store')
+            folder = tmp_path / 'test' / 'notifications'
+            key, = [path.name for path in folder.iterdir()]
+            center = Foundation.NSUserNotificationCenter.defaultUserNotificationCenter()
+            assert dict(center.scheduledNotifications()[-1].userInfo()) == {'key': key}
+            fake.activate_notification()
+        finally:
+            events.on_notification.unregister(handler)
+        assert received[0].data == 'x' * 2000
+        assert not list(folder.iterdir())
+
+    def test_stored_data_expires(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('RUMPS_FAKE_APPLICATION_SUPPORT', str(tmp_path))
+        fake.launch(rumps.App('test'))
+        rumps.notification('title', 'subtitle', 'message', data='x' * 2000, oversized='store')
+        old, = (tmp_path / 'test' / 'notifications').iterdir()
+        os.utime(str(old), (0, 0))
+        rumps.notification('title', 'subtitle', 'message', data='y' * 2000, oversized='store')
+        assert not old.exists()
+
+
+class TestFakeNotificationDispatcher(object):
+    @staticmethod
+    def sent():
+        center = Foundation.NSUserNotificationCenter.defaultUserNotificationCenter()
+        return [(n.title(), n.subtitle(), n.informativeText()) for n in center.scheduledNotifications()]
+
+    def test_sent_later_on_the_main_run_loop(self):
+        dispatcher = rumps.NotificationDispatcher()
+        assert dispatcher.notify('title', 'subtitle', 'message')
+        assert self.sent() == []
+        fake.run_pending()
+        assert self.sent() == [('title', 'subtitle', 'message')]
+
+    def test_rate_limited(self):
+        dispatcher = rumps.NotificationDispatcher(rate=1, burst=2)
+        for n in range(5):
+            dispatcher.notify('title', 'subtitle', str(n))
+        fake.run_pending()
+        assert len(self.sent()) == 2
+        fake.run_for(1.01)
+        assert len(self.sent()) == 3
+        fake.run_for(2.01)
+        assert [message for _, _, message in self.sent()] == ['0', '1', '2', '3', '4']
+        assert dispatcher.stats() == (5, 5, 0, 0, 0, 0)
+
+    def test_dedup(self):
+        dispatcher = rumps.NotificationDispatcher(rate=1, burst=1, dedup_window=10)
+        dispatcher.notify('disk', 'host-a', 'first', key='a')
+        dispatcher.notify('disk', 'host-b', 'other', key='b')
+        assert dispatcher.notify('disk', 'host-b', 'replaced', key='b')
+        fake.run_for(1.01)
+        assert self.sent() == [('disk', 'host-a', 'first'), ('disk', 'host-b', 'replaced')]
+        assert not dispatcher.notify('disk', 'host-a', 'again', key='a')
+        fake.run_for(10)
+        assert dispatcher.notify('disk', 'host-a', 'again', key='a')
+        assert dispatcher.stats().deduplicated == 2
+
+    def test_summarize(self):
+        dispatcher = rumps.NotificationDispatcher(summarize_window=5)
+        for n in range(3):
+            dispatcher.notify('monitor', 'host', str(n), group='monitor')
+        dispatcher.notify('other', 'subtitle', 'alone')
+        fake.run_for(4)
+        assert self.sent() == []
+        fake.run_for(1.01)
+        assert sorted(self.sent()) == [('monitor', '3 notifications', '2'), ('other', 'subtitle', 'alone')]
+        assert dispatcher.stats().summarized == 2
+
+    def test_custom_summarize(self):
+        def summarize(notifications):
+            return dict(title='{0} alerts'.format(len(notifications)), subtitle=None,
+                        message=', '.join(n['message'] for n in notifications))
+
+        dispatcher = rumps.NotificationDispatcher(summarize_window=1, summarize=summarize)
+        for n in range(3):
+            dispatcher.notify('alert', None, str(n))
+        fake.run_for(1.01)
+        assert self.sent() == [('3 alerts', None, '0, 1, 2')]
+
+    def test_max_pending_drops_oldest(self):
+        dispatcher = rumps.NotificationDispatcher(rate=1, burst=1, max_pending=2)
+        for n in range(4):
+            dispatcher.notify('title', 'subtitle', str(n))
+        fake.run_for(2.01)
+        assert [message for _, _, message in self.sent()] == ['2', '3']
+        assert dispatcher.stats().dropped == 2
+
+    def test_flush(self):
+        dispatcher = rumps.NotificationDispatcher(rate=0.01, burst=1, summarize_window=60)
+        for n in range(3):
+            dispatcher.notify('title', 'subtitle', str(n), group=n % 2)
+        future = dispatcher.flush()
+        fake.run_pending()
+        assert future.result() == 2
+        assert len(self.sent()) == 2
+        assert dispatcher.stats().pending == 0
+
+    def test_notify_from_thread(self):
+        import threading
+        dispatcher = rumps.NotificationDispatcher()
+        thread = threading.Thread(target=dispatcher.notify, args=('title', 'subtitle', 'message'))
+        thread.start()
+        thread.join()
+        fake.run_pending()
+        assert self.sent() == [('title', 'subtitle', 'message')]
+
+    def test_windows_from_thread(self, monkeypatch):
+        import threading
+        from PyObjCTools import AppHelper
+        call_later = AppHelper.callLater
+
+        def main_thread_only(*args, **kwargs):
+            assert threading.current_thread() is threading.main_thread(), 'timer on a run loop that never runs'
+            call_later(*args, **kwargs)
+        monkeypatch.setattr(AppHelper, 'callLater', main_thread_only)
+        dispatcher = rumps.NotificationDispatcher(rate=1, burst=1, summarize_window=2)
+        for group in ('a', 'b'):
+            thread = threading.Thread(target=dispatcher.notify, args=(group, 'subtitle', 'message'))
+            thread.start()
+            thread.join()
+        fake.run_for(2.01)
+        assert len(self.sent()) == 1  # the rate limit holds back the second group
+        fake.run_for(1)
+        assert len(self.sent()) == 2
+
+    def test_invalid(self):
+        for options in ({'rate': 0}, {'burst': 0}, {'max_pending': 0}, {'dedup_window': -1},
+                        {'summarize_window': -1}):
+            with pytest.raises(ValueError):
+                rumps.NotificationDispatcher(**options)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+import rumps
+from rumps import backends, dispatch
+
+pytestmark = pytest.mark.skipif(backends.name != 'fake', reason='drives the in-memory run loop')
+
+if backends.name == 'fake':
+    from rumps.backends import fake
+
+
+@pytest.fixture
+def queue():
+    return dispatch.MainThreadQueue()
+
+
+class TestMainThreadQueue(object):
+    def test_runs_on_next_pass(self, queue):
+        item = rumps.MenuItem('before')
+        future = queue.submit(setattr, item, 'title', 'after')
+        assert item.title == 'before'
+        assert not future.done()
+        fake.run_pending()
+        assert item.title == 'after'
+        assert future.result(0) is None
+
+    def test_batches_calls_in_one_pass(self, queue):
+        futures = [queue.submit(lambda i=i: i * 2) for i in range(10)]
+        fake.run_pending()
+        assert [f.result(0) for f in futures] == list(range(0, 20, 2))
+        assert queue.stats() == (10, 0, 1, 0)
+
+    def test_exception_goes_to_future(self, queue):
+        future = queue.submit(lambda: 1 / 0)
+        fake.run_pending()
+        with pytest.raises(ZeroDivisionError):
+            future.result(0)
+
+    def test_cancelled(self, queue):
+        future = queue.submit(lambda: None)
+        future.cancel()
+        fake.run_pending()
+        assert queue.stats().cancelled == 1
+
+    def test_runs_on_main_thread_from_workers(self, queue):
+        seen = []
+        futures = []
+
+        def produce():
+            for _ in range(100):
+                futures.append(queue.submit(lambda: seen.append(threading.current_thread())))
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        fake.run_pending()
+        assert len(seen) == 400
+        assert set(seen) == {threading.main_thread()}
+        assert all(f.done() for f in futures)
+
+    def test_app_methods_get_self(self):
+        class Subclass(rumps.App):
+            def set_title(self, title):
+                self.title = title
+                return self
+
+        app = Subclass('test')
+        fake.launch(app)
+        future = rumps.call_on_main(Subclass.set_title, 'queued')
+        fake.run_pending()
+        assert future.result(0) is app
+        assert app._nsapp.nsstatusitem.title() == 'queued'
+
+
+def worker_pid():
+    import os
+    return os.getpid()
+
+
+def run_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, 'timed out'
+        fake.run_pending()
+        time.sleep(0.001)
+
+
+class TestExecutionPolicy(object):
+    @pytest.fixture(autouse=True)
+    def _workers(self):
+        yield
+        dispatch.shutdown_workers(wait=True)
+        rumps.set_main_thread_budget(None)
+
+    def test_thread(self):
+        results = []
+
+        def done(sender, result):
+            results.append((sender, result, threading.current_thread()))
+
+        @rumps.execution_policy('thread', on_result=done)
+        def slow(sender):
+            return threading.current_thread()
+
+        item = rumps.MenuItem('item', callback=slow)
+        future = fake.click(item)
+        run_until(lambda: results)
+        assert results == [(item, future.result(), threading.main_thread())]
+        assert future.result() is not threading.main_thread()
+
+    def test_errors(self, capsys):
+        errors = []
+
+        @rumps.execution_policy('thread', on_error=lambda sender, exc: errors.append(exc))
+        def handled(sender):
+            raise KeyError('handled')
+
+        @rumps.execution_policy('thread')
+        def unhandled(sender):
+            raise KeyError('unhandled')
+
+        fake.click(rumps.MenuItem('a', callback=handled))
+        fake.click(rumps.MenuItem('b', callback=unhandled))
+        err = []
+        run_until(lambda: err.append(capsys.readouterr().err) or "KeyError: 'unhandled'" in ''.join(err))
+        run_until(lambda: errors)
+        assert isinstance(errors[0], KeyError)
+
+    def test_process(self):
+        import os
+        results = []
+        callback = rumps.execution_policy('process', on_result=lambda sender, pid: results.append(pid))(worker_pid)
+        try:
+            fake.click(rumps.MenuItem('item', callback=callback))
+            run_until(lambda: results, timeout=30)
+        finally:
+            rumps.execution_policy('main')(worker_pid)
+        assert results and results[0] != os.getpid()
+
+    def test_timer_and_app_method(self):
+        class Subclass(rumps.App):
+            results = []
+
+            def done(self, sender, result):
+                self.results.append((self, result))
+
+            @rumps.timer(1)
+            @rumps.execution_policy('thread', on_result=done)
+            def poll(self, sender):
+                return 42
+
+        app = Subclass('test')
+        fake.launch(app)
+        fake.run_for(0)
+        run_until(lambda: app.results)
+        assert app.results == [(app, 42)]
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            rumps.execution_policy('gpu')
+
+    def test_main_thread_budget(self):
+        exceeded = []
+        rumps.set_main_thread_budget(0.01, on_exceed=lambda func, elapsed: exceeded.append((func, elapsed)))
+
+        def slow(sender):
+            time.sleep(0.02)
+
+        fake.click(rumps.MenuItem('slow', callback=slow))
+        fake.click(rumps.MenuItem('fast', callback=lambda sender: None))
+        assert [func for func, _ in exceeded] == [slow]
+        overruns = rumps.main_thread_overruns()
+        name, = overruns
+        assert name.endswith('test_main_thread_budget.<locals>.slow')
+        assert overruns[name].count == 1 and overruns[name].worst >= 0.02
+
+    def test_main_thread_budget_nested_callback(self):
+        exceeded = []
+        rumps.set_main_thread_budget(0.01, on_exceed=lambda func, elapsed: exceeded.append(func))
+
+        def slow(row):
+            time.sleep(0.02)
+
+        paged = rumps.PagedMenuItem('big', ['x'], callback=slow)
+        fake.click(paged._rows[0])
+        assert exceeded == [slow]
+
+    def test_default_budget_warning(self):
+        rumps.set_main_thread_budget(0)
+        callback = lambda sender: time.sleep(0.001)  # noqa: E731
+        fake.click(rumps.MenuItem('slow', callback=callback))
+        record = rumps.log_events(subsystem='app', level='warning')[-1]
+        assert 'blocked the main thread' in record.message
+        assert record.fields['callback'] is callback
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+
+import rumps
+from rumps import backends, events
+from rumps.events import EventEmitter
+
+fake_only = pytest.mark.skipif(backends.name != 'fake', reason='drives the in-memory backend')
+
+if backends.name == 'fake':
+    from rumps.backends import fake
+
+
+class TestEventEmitter(object):
+    def test_order(self):
+        emitter = EventEmitter('test')
+        calls = []
+        for name, priority in (('a', 0), ('b', 5), ('c', 0), ('d', -1), ('e', 5)):
+            emitter.register(lambda name=name: calls.append(name), priority=priority)
+        emitter.emit()
+        assert calls == ['b', 'e', 'a', 'c', 'd']
+
+    def test_decorator(self):
+        emitter = EventEmitter('test')
+
+        @emitter
+        def first(value):
+            return value
+
+        @emitter.register(priority=1)
+        def second(value):
+            return value
+
+        assert emitter.callbacks == (second, first)
+
+    def test_register_again_replaces(self):
+        emitter = EventEmitter('test')
+        a, b = (lambda: None), (lambda: None)
+        emitter.register(a)
+        emitter.register(b)
+        emitter.register(a)
+        assert emitter.callbacks == (b, a)
+        emitter.register(a, priority=1)
+        assert emitter.callbacks == (a, b)
+
+    def test_unregister(self):
+        emitter = EventEmitter('test')
+        a = emitter.register(lambda: None)
+        snapshot = emitter.callbacks
+        assert emitter.unregister(a)
+        assert not emitter.unregister(a)
+        assert emitter.callbacks == () and snapshot == (a,)
+
+    def test_set_methods_of_callbacks(self):
+        emitter = EventEmitter('test')
+        a, b = (lambda: None), (lambda: None)
+        emitter.register(a, priority=1)
+        emitter.callbacks.add(b)
+        emitter.callbacks.add(a)  # already subscribed: keeps its priority
+        assert emitter.callbacks == (a, b)
+        emitter.callbacks.discard(a)
+        emitter.callbacks.discard(a)
+        assert emitter.callbacks == (b,)
+        emitter.callbacks.remove(b)
+        with pytest.raises(KeyError):
+            emitter.callbacks.remove(b)
+        assert emitter.callbacks == ()
+
+    def test_changes_apply_from_next_emit(self):
+        emitter = EventEmitter('test')
+        calls = []
+
+        def late():
+            calls.append('late')
+
+        def subscriber():
+            calls.append('subscriber')
+            emitter.register(late)
+            emitter.unregister(subscriber)
+
+        emitter.register(subscriber)
+        emitter.emit()
+        emitter.emit()
+        assert calls == ['subscriber', 'late']
+
+    def test_errors_do_not_stop_delivery(self, capsys):
+        emitter = EventEmitter('test')
+        calls = []
+        emitter.register(lambda: 1 / 0, priority=1)
+        emitter.register(lambda: calls.append(True))
+        emitter.emit()
+        assert calls == [True]
+        assert 'ZeroDivisionError' in capsys.readouterr().err
+
+    @fake_only
+    def test_app_methods_resolved(self):
+        emitter = EventEmitter('test')
+
+        class App(rumps.App):
+            def woke(self, value):
+                return self.seen.append(value)
+
+        emitter.register(App.woke)
+        app = App('test')
+        app.seen = []
+        fake.launch(app)
+        emitter.emit(1)
+        table = rumps._internal.method_table()
+        app.other = lambda: None  # drops the table of bound methods
+        emitter.emit(2)
+        assert rumps._internal.method_table() is not table
+        assert app.seen == [1, 2]
+
+
+@fake_only
+class TestDelivery(object):
+    def test_predicate(self):
+        emitter = EventEmitter('test')
+        seen = []
+        emitter.register(seen.append, predicate=lambda value: value % 2)
+        for value in range(5):
+            emitter.emit(value)
+        assert seen == [1, 3]
+        assert emitter.stats()[:5] == (5, 2, 3, 0, 0)
+
+    def test_failing_predicate(self, capsys):
+        emitter = EventEmitter('test')
+        seen = []
+        emitter.register(seen.append, predicate=lambda value: 1 / 0)
+        emitter.emit(1)
+        assert seen == [] and emitter.stats().errors == 1
+        assert 'ZeroDivisionError' in capsys.readouterr().err
+
+    def test_thread_executor_runs_in_parallel(self):
+        emitter = EventEmitter('test')
+        barrier = threading.Barrier(4, timeout=5)  # broken unless all four subscribers run at once
+        threads = []
+
+        def reconnect():
+            threads.append(threading.current_thread())
+            barrier.wait()
+
+        for _ in range(4):
+            emitter.register(lambda: reconnect(), executor='thread')
+        future = emitter.emit_async()
+        assert not future.done()
+        fake.run_pending()
+        future.result(timeout=5)
+        assert len(threads) == 4 and threading.current_thread() not in threads
+        stats = emitter.stats()
+        assert stats.delivered == 4 and stats.errors == 0 and stats.max_latency >= stats.latency > 0
+
+    def test_coalesce_until_next_pass(self):
+        emitter = EventEmitter('test')
+        seen = []
+        emitter.register(seen.append, coalesce=True)
+        for value in range(3):
+            emitter.emit(value)
+        assert seen == []
+        fake.run_pending()
+        assert seen == [2]
+        emitter.emit(3)
+        fake.run_pending()
+        assert seen == [2, 3]
+        assert emitter.stats()[:4] == (4, 2, 0, 2)
+
+    def test_coalesce_window(self):
+        emitter = EventEmitter('test')
+        seen = []
+        emitter.register(lambda state: seen.append((state, fake.now())), coalesce=5)
+        start = fake.now()
+        emitter.emit('sleep')
+        fake.run_for(1)
+        emitter.emit('wake')
+        fake.run_for(3)
+        assert seen == []
+        fake.run_for(2)
+        assert seen == [('wake', pytest.approx(start + 5))]
+
+    def test_coalesce_window_from_other_thread(self, monkeypatch):
+        from PyObjCTools import AppHelper
+        call_later, threads = AppHelper.callLater, []
+
+        def record(*args, **kwargs):
+            threads.append(threading.current_thread())
+            call_later(*args, **kwargs)
+        monkeypatch.setattr(AppHelper, 'callLater', record)
+        emitter = EventEmitter('test')
+        seen = []
+        emitter.register(seen.append, coalesce=1)
+        for value in range(2):
+            thread = threading.Thread(target=emitter.emit, args=(value,))
+            thread.start()
+            thread.join()
+        fake.run_for(1)
+        assert threads == [threading.main_thread()]  # timers on another thread's run loop never fire
+        assert seen == [1]
+        assert emitter.stats()[:4] == (2, 1, 0, 1)
+
+    def test_emit_async_keeps_order(self):
+        emitter = EventEmitter('test')
+        seen = []
+        emitter.register(lambda value: seen.append(('low', value)))
+        emitter.register(lambda value: seen.append(('high', value)), priority=1)
+        future = emitter.emit_async(1)
+        assert seen == []
+        fake.run_pending()
+        assert future.done() and seen == [('high', 1), ('low', 1)]
+
+    def test_invalid_options(self):
+        emitter = EventEmitter('test')
+        with pytest.raises(ValueError):
+            emitter.register(len, executor='process')
+        with pytest.raises(ValueError):
+            emitter.register(len, coalesce=-1)
+
+
+@fake_only
+class TestChannel(object):
+    def test_drained_on_main_loop_in_batches(self):
+        metrics = events.Channel('metrics', payload=dict, batch_size=2)
+        seen = []
+        metrics.register(lambda payload: seen.append(payload['n']))
+        for n in range(5):
+            assert metrics.publish({'n': n})
+        assert seen == [] and metrics.depth == 5
+        fake.run_pending()  # runs the drains each batch posts for the next
+        assert seen == [0, 1, 2, 3, 4]
+        stats = metrics.queue_stats()
+        assert (stats.depth, stats.max_depth, stats.published, stats.dropped, stats.batches) == (0, 5, 5, 0, 3)
+        assert metrics.stats().delivered == 5
+
+    def test_batches_yield_to_the_run_loop(self):
+        metrics = events.Channel('metrics', batch_size=2)
+        seen = []
+        metrics.register(seen.append)
+        for n in range(5):
+            metrics.publish(n)
+        metrics._drain()
+        assert seen == [0, 1] and metrics.depth == 3
+
+    def test_payload_type(self):
+        finished = events.Channel('job_finished', payload=(int, float))
+        with pytest.raises(TypeError):
+            finished.publish('done')
+        assert finished.publish(1.5)
+
+    def test_drop_oldest(self):
+        metrics = events.Channel('metrics', maxsize=3)
+        seen = []
+        metrics.register(seen.append)
+        for n in range(5):
+            assert metrics.publish(n)
+        fake.run_pending()
+        assert seen == [2, 3, 4]
+        assert metrics.queue_stats().dropped == 2
+
+    def test_drop_newest(self):
+        metrics = events.Channel('metrics', maxsize=3, backpressure='drop-newest')
+        seen = []
+        metrics.register(seen.append)
+        assert [metrics.publish(n) for n in range(5)] == [True, True, True, False, False]
+        fake.run_pending()
+        assert seen == [0, 1, 2]
+        assert metrics.queue_stats().dropped == 2
+
+    def test_block(self):
+        jobs = events.Channel('jobs', maxsize=2, backpressure='block')
+        seen = []
+        jobs.register(seen.append)
+        results = []
+        worker = threading.Thread(target=lambda: results.extend(jobs.publish(n) for n in range(4)))
+        worker.start()
+        while worker.is_alive() or jobs.depth:
+            fake.run_pending()
+            worker.join(0.01)
+        assert results == [True] * 4 and seen == [0, 1, 2, 3]
+        assert jobs.queue_stats().dropped == 0
+
+    def test_block_timeout(self):
+        jobs = events.Channel('jobs', maxsize=1, backpressure='block')
+        outcome = []
+        worker = threading.Thread(target=lambda: outcome.extend([jobs.publish(1), jobs.publish(2, timeout=0.01)]))
+        worker.start()
+        worker.join()
+        assert outcome == [True, False] and jobs.queue_stats().dropped == 1
+
+    def test_block_on_main_thread_drains(self):
+        jobs = events.Channel('jobs', maxsize=1, backpressure='block')
+        seen = []
+        jobs.register(seen.append)
+        jobs.publish(1)
+        jobs.publish(2)
+        assert seen == [1] and jobs.depth == 1
+
+    def test_menu_subscriber(self):
+        item = rumps.MenuItem('CPU')
+        app = rumps.App('test', menu=[item])
+        fake.launch(app)
+        metrics = events.Channel('metrics', payload=float)
+        metrics.register(lambda cpu: setattr(item, 'title', 'CPU {0:.0%}'.format(cpu)))
+        worker = threading.Thread(target=lambda: [metrics.publish(n / 10.0) for n in range(5)])
+        worker.start()
+        worker.join()
+        fake.run_pending()
+        assert item.title == 'CPU 40%'
+
+    def test_named(self):
+        first = events.channel('test_named', payload=int)
+        assert events.channel('test_named') is first
+        assert events.channels()['test_named'] is first
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            events.Channel('test', backpressure='drop')
+        with pytest.raises(ValueError):
+            events.Channel('test', maxsize=0)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+import rumps
+from rumps.rumps import _nsimage_from_file
+
+
+@pytest.fixture
+def icon(tmp_path):
+    rumps.image_cache.clear()
+    path = tmp_path / 'icon.png'
+    path.write_bytes(b'\x89PNG')
+    yield str(path)
+    rumps.image_cache.clear()
+
+
+class TestImageCache(object):
+    def test_reused(self, icon):
+        image = _nsimage_from_file(icon)
+        assert _nsimage_from_file(icon) is image
+        assert rumps.MenuItem('item', icon=icon)._menuitem.image() is image
+        info = rumps.image_cache.info()
+        assert (info.hits, info.misses, info.entries) == (2, 1, 1)
+
+    def test_keyed_by_dimensions_and_template(self, icon):
+        plain = _nsimage_from_file(icon)
+        assert _nsimage_from_file(icon, dimensions=(16, 16)) is not plain
+        assert _nsimage_from_file(icon, template=True) is not plain
+        assert _nsimage_from_file(icon, dimensions=[16, 16]) is _nsimage_from_file(icon, dimensions=(16, 16))
+        assert rumps.image_cache.info().entries == 3
+
+    def test_file_change(self, icon):
+        _nsimage_from_file(icon)
+        _nsimage_from_file(icon, dimensions=(16, 16))
+        stat = os.stat(icon)
+        os.utime(icon, (stat.st_atime, stat.st_mtime + 10))
+        image = _nsimage_from_file(icon)
+        assert rumps.image_cache.info().entries == 1
+        assert _nsimage_from_file(icon) is image
+
+    def test_relative_to_main_script_is_same_entry(self, icon, monkeypatch):
+        import __main__
+        monkeypatch.setattr(__main__, '__file__', icon, raising=False)
+        image = _nsimage_from_file(icon)
+        assert _nsimage_from_file(os.path.basename(icon)) is image
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(IOError):
+            _nsimage_from_file(str(tmp_path / 'missing.png'))
+
+
+class TestSFSymbol(object):
+    @pytest.fixture(autouse=True)
+    def _clear(self):
+        rumps.SFSymbol.cache_clear()
+        rumps.image_cache.clear()
+
+    def test_interned(self):
+        symbol = rumps.SFSymbol('gear', color=[255, 0, 0], point_size=14, weight='bold')
+        assert rumps.SFSymbol('gear', color=(255, 0, 0), point_size=14, weight='bold') is symbol
+        assert rumps.SFSymbol('gear', color=(0, 255, 0), point_size=14, weight='bold') is not symbol
+        info = rumps.SFSymbol.cache_info()
+        assert (info.hits, info.misses, info.entries) == (1, 2, 2)
+
+    def test_image_built_lazily_once(self, monkeypatch):
+        built = []
+        create = rumps.SFSymbol._create_nsimage
+        monkeypatch.setattr(rumps.SFSymbol, '_create_nsimage', lambda self: built.append(self) or create(self))
+        symbol = rumps.SFSymbol('heart.fill')
+        rumps.SFSymbol('heart.fill')
+        assert built == []
+        image = symbol()
+        assert symbol() is image
+        assert built == [symbol]
+
+    def test_immutable(self):
+        symbol = rumps.SFSymbol('gear')
+        with pytest.raises(AttributeError):
+            symbol.color = '#ffffff'
+
+    def test_resized_copies_leave_shared_image_alone(self):
+        symbol = rumps.SFSymbol('gear')
+        shared = symbol()
+        small = _nsimage_from_file(symbol, dimensions=(16, 16))
+        assert small is not shared
+        assert _nsimage_from_file(symbol, dimensions=(16, 16)) is small
+        assert tuple(shared.size()) == (20, 20)
+        assert _nsimage_from_file(symbol) is shared
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import rumps
+from rumps import backends
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code):
+    env = dict(os.environ, RUMPS_BACKEND=backends.name, PYTHONPATH=ROOT)
+    return subprocess.check_output([sys.executable, '-c', code], env=env, cwd=ROOT).decode().split()
+
+
+class TestLazyImport(object):
+    def test_import_does_not_load_rumps_rumps(self):
+        assert run('import rumps, sys; print("rumps.rumps" in sys.modules, "rumps.dispatch" in sys.modules)') == [
+            'False', 'False']
+
+    @pytest.mark.skipif(backends.name != 'fake', reason='sends a notification')
+    def test_notification_does_not_load_rumps_rumps(self):
+        assert run('import rumps, sys; rumps.notification("title", "subtitle", "message", data={"n": 1}); '
+                   'print("rumps.rumps" in sys.modules)') == ['False']
+
+    def test_widget_views_defined_on_first_use(self):
+        assert run('import rumps, sys; rumps.App; print("rumps.circular_progress" in sys.modules, '
+                   '"rumps.text_field" in sys.modules); rumps.CircularProgressMenuItem(value=0.5); '
+                   'print("rumps.circular_progress" in sys.modules)') == ['False', 'False', 'True']
+
+    def test_exports(self):
+        for name in rumps._LAZY:
+            assert getattr(rumps, name) is getattr(sys.modules['rumps.' + rumps._LAZY[name]], name)
+        assert set(rumps._LAZY) <= set(dir(rumps))
+        assert rumps.rumps is sys.modules['rumps.rumps']
+        assert rumps.notifications is sys.modules['rumps.notifications'].on_notification
+
+    def test_unknown(self):
+        with pytest.raises(AttributeError):
+            rumps.NotAThing
@@ -2,7 +2,7 @@
 
 import pytest
 
-from rumps._internal import guard_unexpected_errors
+from rumps._internal import guard_unexpected_errors, _MethodResolver
 
 
 class TestGuardUnexpectedErrors(object):
@@ -34,3 +34,64 @@ rumps.exceptions.InternalRumpsError: an unexpected error occurred within an inte
         captured = capfd.readouterr()
         assert not captured.out
         assert not captured.err
+
+
+class TestMethodResolver(object):
+    class Host(object):
+        def one(self, sender):
+            return 'one', sender
+
+        def two(self, sender):
+            return 'two', sender
+
+    def test_resolves_bound_method(self):
+        resolver = _MethodResolver()
+        host = self.Host()
+        assert resolver.resolve(host, self.Host.two)('s') == ('two', 's')
+
+    def test_plain_function_unchanged(self):
+        resolver = _MethodResolver()
+
+        def func(sender):
+            return sender
+
+        assert resolver.resolve(self.Host(), func) is func
+
+    def test_rebuilds_for_new_instance(self):
+        resolver = _MethodResolver()
+        first, second = self.Host(), self.Host()
+        assert resolver.resolve(first, self.Host.one).__self__ is first
+        assert resolver.resolve(second, self.Host.one).__self__ is second
+
+    def test_does_not_keep_instance_alive(self):
+        import gc
+        import weakref
+        resolver = _MethodResolver()
+        host = self.Host()
+        assert resolver.resolve(host, self.Host.one)('s') == ('one', 's')
+        ref = weakref.ref(host)
+        del host
+        gc.collect()
+        assert ref() is None
+
+    def test_classmethod(self):
+        class Host(self.Host):
+            @classmethod
+            def make(cls, sender):
+                return cls, sender
+
+        resolver = _MethodResolver()
+        assert resolver.resolve(Host(), Host.make.__func__)('s') == (Host, 's')
+
+    def test_invalidate(self):
+        resolver = _MethodResolver()
+        host = self.Host()
+
+        def extra(self, sender):
+            return 'extra'
+
+        assert resolver.resolve(host, extra) is extra
+        host.extra = extra.__get__(host)
+        assert resolver.resolve(host, extra) is extra  # stale until invalidated
+        resolver.invalidate()
+        assert resolver.resolve(host, extra)(None) == 'extra'
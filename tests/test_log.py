@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+
+import rumps
+from rumps import backends, log
+
+fake_only = pytest.mark.skipif(backends.name != 'fake', reason='drives the in-memory backend')
+
+if backends.name == 'fake':
+    from rumps.backends import fake
+
+
+@pytest.fixture(autouse=True)
+def _default_logging():
+    log._events.clear()
+    yield
+    rumps.debug_mode(False)
+    for sink in log._sinks:
+        rumps.remove_log_sink(sink)
+    rumps.set_log_capacity(1000)
+
+
+class Formatted(object):
+    def __init__(self):
+        self.count = 0
+
+    def __format__(self, spec):
+        self.count += 1
+        return 'formatted'
+
+
+class TestLogger(object):
+    def test_disabled_does_no_string_work(self):
+        value = Formatted()
+        log.timer.debug('fired {0}', value)
+        assert value.count == 0
+        assert rumps.log_events() == []
+
+    def test_formats_once_when_read(self):
+        rumps.set_log_level('debug', 'timer')
+        value = Formatted()
+        log.timer.debug('fired {0} {late:.1f} s late', value, late=0.25)
+        assert value.count == 0
+        record, = rumps.log_events()
+        assert (record.subsystem, record.level, record.fields) == ('timer', log.DEBUG, {'late': 0.25})
+        assert record.message == 'fired formatted 0.2 s late'
+        assert str(record) == '[timer] DEBUG: fired formatted 0.2 s late'
+        record.message
+        assert value.count == 1
+
+    def test_levels_per_subsystem(self):
+        rumps.set_log_level('debug', 'menu')
+        assert rumps.log_levels() == {'app': 'warning', 'menu': 'debug', 'timer': 'warning', 'image': 'warning',
+                                      'notification': 'warning', 'widget': 'warning'}
+        assert log.menu.enabled() and not log.widget.enabled()
+        log.menu.debug('shown')
+        log.widget.debug('hidden')
+        log.widget.error('failed')
+        assert [r.message for r in rumps.log_events()] == ['shown', 'failed']
+        assert [r.message for r in rumps.log_events(level='error')] == ['failed']
+        assert [r.message for r in rumps.log_events(subsystem='menu')] == ['shown']
+
+    def test_off(self):
+        rumps.set_log_level('off')
+        log.app.error('dropped')
+        assert rumps.log_events() == []
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            rumps.set_log_level('verbose')
+        with pytest.raises(ValueError):
+            rumps.set_log_level('debug', 'network')
+
+    def test_bad_template(self):
+        log.app.warning('{0} and {1}', 'one')
+        assert 'formatting failed' in rumps.log_events()[0].message
+
+
+class TestEvents(object):
+    def test_ring_buffer(self):
+        rumps.set_log_capacity(3)
+        for n in range(5):
+            log.app.warning('event {0}', n)
+        assert [r.message for r in rumps.log_events()] == ['event 2', 'event 3', 'event 4']
+        assert [r.message for r in rumps.log_events(2)] == ['event 3', 'event 4']
+
+    def test_menu_key_warning_is_kept(self):
+        menu = rumps.MenuItem('parent')
+        menu['key'] = rumps.MenuItem('title')
+        record, = rumps.log_events(subsystem='menu')
+        assert record.level == log.WARNING and "'key'" in record.message
+
+
+class TestSinks(object):
+    def test_sink(self):
+        received = []
+        sink = rumps.add_log_sink(received.append)
+        log.image.warning('missing')
+        rumps.remove_log_sink(sink)
+        log.image.warning('not received')
+        assert [r.message for r in received] == ['missing']
+
+    def test_failing_sink(self, capsys):
+        rumps.add_log_sink(lambda record: 1 / 0)
+        log.app.warning('still kept')
+        assert rumps.log_events()[0].message == 'still kept'
+        assert 'ZeroDivisionError' in capsys.readouterr().err
+
+    def test_async_sink(self):
+        threads = []
+        sink = rumps.add_log_sink(lambda record: threads.append((record.message, threading.current_thread())),
+                                  asynchronous=True)
+        log.app.warning('one')
+        log.app.warning('two')
+        sink.flush()
+        assert [message for message, _ in threads] == ['one', 'two']
+        assert all(thread is not threading.current_thread() for _, thread in threads)
+        rumps.remove_log_sink(sink)
+        assert not sink._thread.is_alive()
+
+
+@fake_only
+class TestDebugMode(object):
+    def test_nslog(self, capsys):
+        rumps.debug_mode(True)
+        item = rumps.MenuItem('Clicked', callback=lambda sender: None)
+        app = rumps.App('test', menu=[item])
+        fake.launch(app)
+        fake.click(item)
+        assert "[menu] DEBUG: <MenuItem: ['Clicked' -> []; callback:" in capsys.readouterr().err
+        rumps.debug_mode(False)
+        fake.click(item)
+        assert capsys.readouterr().err == ''
+        assert rumps.log_levels()['menu'] == 'warning'
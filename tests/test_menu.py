@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+import gc
+
+import pytest
+
+import rumps
+from rumps import backends
+
+fake_only = pytest.mark.skipif(backends.name != 'fake', reason='counts calls made on the in-memory backend')
+
+
+def ns_titles(menu):
+    return [item.title() for item in menu._menu.itemArray()]
+
+
+class TestBatch(object):
+    def test_defers_until_exit(self):
+        menu = rumps.MenuItem('root')
+        menu.add('existing')
+        with menu.batch():
+            menu.add('a')
+            menu.add('b')
+            assert ns_titles(menu) == ['existing']
+            assert list(menu) == ['existing', 'a', 'b']
+        assert ns_titles(menu) == ['existing', 'a', 'b']
+
+    def test_nested(self):
+        menu = rumps.MenuItem('root')
+        with menu.batch():
+            menu.add('a')
+            with menu.batch():
+                menu.add('b')
+            assert ns_titles(menu) == []
+        assert ns_titles(menu) == ['a', 'b']
+
+    def test_insert_and_delete(self):
+        menu = rumps.MenuItem('root')
+        menu.update(['a', 'b', 'c'])
+        with menu.batch():
+            del menu['b']
+            menu.insert_before('a', 'z')
+            menu.insert_after('c', 'd')
+        assert list(menu) == ['z', 'a', 'c', 'd']
+        assert ns_titles(menu) == ['z', 'a', 'c', 'd']
+
+    def test_exception_still_commits(self):
+        menu = rumps.MenuItem('root')
+        with pytest.raises(ZeroDivisionError):
+            with menu.batch():
+                menu.add('a')
+                1 / 0
+        assert ns_titles(menu) == ['a']
+
+    def test_update_submenus(self):
+        menu = rumps.MenuItem('root')
+        menu.update([('sub', ['x', ('deeper', ['y'])]), 'z'])
+        assert ns_titles(menu) == ['sub', 'z']
+        assert ns_titles(menu['sub']) == ['x', 'deeper']
+        assert ns_titles(menu['sub']['deeper']) == ['y']
+
+    @fake_only
+    def test_update_sizes_views_once(self):
+        from rumps.backends import fake
+        menu = rumps.MenuItem('root')
+        sliders = [rumps.SliderMenuItem() for _ in range(20)]
+        fake.native_calls.clear()
+        menu.update(['a'] + sliders)
+        assert fake.native_calls['NSMenu.size'] == 1
+        assert fake.native_calls['NSMenu.addItem_'] == 21
+        width = sliders[0]._menuitem.view().frame().size.width
+        assert all(s._menuitem.view().frame().size.width == width for s in sliders)
+
+
+class TestReconcile(object):
+    def test_keeps_unchanged_items(self):
+        menu = rumps.MenuItem('root')
+        menu.update(['a', 'b', 'c', 'd'])
+        a, c = menu['a'], menu['c']
+        menu.reconcile(['c', 'a', 'e', 'd'])
+        assert list(menu) == ['c', 'a', 'e', 'd']
+        assert ns_titles(menu) == ['c', 'a', 'e', 'd']
+        assert menu['a'] is a and menu['c'] is c
+
+    def test_retitle_with_key(self):
+        menu = rumps.MenuItem('root')
+        key = lambda title: title.split()[0]
+        menu.reconcile(['alpha 1', 'beta 1'], key=key)
+        alpha = menu['alpha']
+        menu.reconcile(['alpha 2', 'gamma 2'], key=key)
+        assert list(menu) == ['alpha', 'gamma']
+        assert menu['alpha'] is alpha
+        assert ns_titles(menu) == ['alpha 2', 'gamma 2']
+
+    def test_menuitem_instances_and_separators(self):
+        menu = rumps.MenuItem('root')
+        slider = rumps.SliderMenuItem()
+        item = rumps.MenuItem('item')
+        menu.update([item, None, slider])
+        separator = menu.values()[1]
+        menu.reconcile([slider, None, item, rumps.separator])
+        assert menu.values()[:3] == [slider, separator, item]
+        assert menu.values()[3] not in (separator, slider, item)
+        assert [x for x in menu._menu.itemArray()] == [v._menuitem for v in menu.values()]
+
+    def test_submenus(self):
+        menu = rumps.MenuItem('root')
+        menu.update([('sub', ['x', 'y']), ('other', ['z'])])
+        sub = menu['sub']
+        menu.reconcile([('sub', ['y', 'w']), 'other'])
+        assert menu['sub'] is sub
+        assert list(sub) == ['y', 'w']
+        assert ns_titles(sub) == ['y', 'w']
+        assert len(menu['other']) == 0
+
+    def test_from_empty(self):
+        menu = rumps.MenuItem('root')
+        menu.reconcile({'a': ['b']})
+        assert ns_titles(menu) == ['a']
+        assert ns_titles(menu['a']) == ['b']
+
+    def test_bad_element(self):
+        with pytest.raises(ValueError):
+            rumps.MenuItem('root').reconcile([('a', 'b', 'c')])
+
+    @fake_only
+    def test_native_calls(self):
+        from rumps.backends import fake
+        menu = rumps.MenuItem('root')
+        rows = ['row %d' % i for i in range(100)]
+        menu.update(rows)
+        rows[10], rows[90] = rows[90], rows[10]
+        del rows[50]
+        rows.insert(20, 'new')
+        fake.native_calls.clear()
+        menu.reconcile(rows)
+        assert ns_titles(menu) == rows
+        assert fake.native_calls['NSMenu.removeItem_'] == 3
+        assert fake.native_calls['NSMenu.insertItem_atIndex_'] == 3
+        assert sum(n for name, n in fake.native_calls.items() if name.startswith('NSMenu.')) == 6
+
+
+class TestPagedMenuItem(object):
+    def visible(self, paged):
+        return [item.title() for item in paged._menu.itemArray() if not item.isHidden()]
+
+    def test_first_page(self):
+        paged = rumps.PagedMenuItem('big', range(1000), page_size=3)
+        assert self.visible(paged) == ['0', '1', '2', u'More…']
+        assert len(paged._menu.itemArray()) == 5  # previous + 3 rows + more
+
+    def test_paging_recycles_rows(self):
+        paged = rumps.PagedMenuItem('big', range(7), page_size=3)
+        rows = list(paged._rows)
+        paged.next_page()
+        assert self.visible(paged) == ['Previous', '3', '4', '5', u'More…']
+        paged.next_page()
+        assert self.visible(paged) == ['Previous', '6']
+        paged.next_page()  # no-op at the end
+        assert paged.offset == 6
+        paged.previous_page()
+        assert self.visible(paged) == ['Previous', '3', '4', '5', u'More…']
+        assert paged._rows == rows
+
+    def test_callable_source_without_total(self):
+        data = ['a', 'b', 'c', 'd']
+        calls = []
+
+        def source(offset, limit):
+            calls.append((offset, limit))
+            return data[offset:offset + limit]
+
+        paged = rumps.PagedMenuItem('big', source, page_size=2, formatter=str.upper)
+        assert self.visible(paged) == ['A', 'B', u'More…']
+        paged.next_page()
+        assert self.visible(paged) == ['Previous', 'C', 'D']  # no empty page after an exact multiple of page_size
+        paged.next_page()  # no-op at the end
+        assert paged.offset == 2
+        assert calls == [(0, 3), (2, 3)]
+
+    def test_callable_source_without_total_partial_page(self):
+        paged = rumps.PagedMenuItem('big', lambda offset, limit: range(5)[offset:offset + limit], page_size=2)
+        paged.scroll_to(4)
+        assert self.visible(paged) == ['Previous', '4']
+
+    def test_row_callback(self):
+        seen = []
+        paged = rumps.PagedMenuItem('big', ['x', 'y', 'z'], page_size=2,
+                                    callback=lambda row: seen.append((row.index, row.data)))
+        paged.next_page()
+        paged._row_clicked(paged._rows[0])
+        assert seen == [(2, 'z')]
+
+    def test_source_setter_resets(self):
+        paged = rumps.PagedMenuItem('big', range(10), page_size=4)
+        paged.scroll_to(8)
+        paged.source = ['only']
+        assert paged.offset == 0
+        assert self.visible(paged) == ['only']
+
+
+class TestCallbackRegistry(object):
+    def test_removed_items_are_detached(self):
+        menu = rumps.MenuItem('menu')
+        menu.update([rumps.MenuItem('a', callback=len), ('b', [rumps.MenuItem('c', callback=len)])])
+        b, c = menu['b'], menu['b']['c']
+        assert c._menuitem in rumps.callback_registry
+        del menu['b']
+        assert c._menuitem not in rumps.callback_registry
+        assert c.callback is len
+
+        menu.add(b)
+        assert rumps.callback_registry.lookup(c._menuitem) == (c, len)
+
+        a = menu['a']
+        menu.clear()
+        assert a._menuitem not in rumps.callback_registry
+
+    def test_moved_items_keep_their_callback(self):
+        menu = rumps.MenuItem('menu')
+        menu.update(['a', 'b'])
+        c = rumps.MenuItem('c', callback=len)
+        menu.insert_after('a', c)
+        with menu.batch():
+            menu.insert_before('a', c)
+        assert list(menu) == ['c', 'a', 'b']
+        assert rumps.callback_registry.lookup(c._menuitem) == (c, len)
+
+    def test_flat_across_rebuilds(self):
+        menu = rumps.MenuItem('menu')
+        menu.update(['first'])
+        widget_types = (rumps.SliderMenuItem, rumps.CheckboxMenuItem, rumps.CardMenuItem)
+        gc.collect()
+        sizes = set()
+        for i in range(500):
+            menu.clear()
+            menu.update([rumps.MenuItem(str(n), callback=len) for n in range(5)] +
+                        [cls(callback=len) for cls in widget_types])
+            menu.reconcile(['x', 'y'])
+            sizes.add(len(rumps.callback_registry))
+        assert len(sizes) == 1
@@ -93,11 +93,19 @@ class TestNotification:
 
 
 class TestDefaultUserNotificationCenter:
+    @pytest.mark.skipif(rumps.backends.name != 'pyobjc', reason='checks the real PyObjC class')
     def test_basic(self):
         """Ensure we can obtain a PyObjC default notification center object."""
         ns_user_notification_center = notifications._default_user_notification_center()
         assert type(ns_user_notification_center).__name__ == '_NSConcreteUserNotificationCenter'
 
+    def test_cached(self, mocker):
+        mocker.patch('rumps._notifications._notification_center', None)
+        center_class = mocker.patch('rumps._notifications.NSUserNotificationCenter')
+        first = notifications._default_user_notification_center()
+        assert notifications._default_user_notification_center() is first
+        center_class.defaultUserNotificationCenter.assert_called_once_with()
+
 
 class TestInitNSApp:
     def test_calls(self, mocker):
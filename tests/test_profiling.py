@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+import rumps
+from rumps import backends, events
+from rumps.profiling import LatencyHistogram
+
+fake_only = pytest.mark.skipif(backends.name != 'fake', reason='drives the in-memory backend')
+
+if backends.name == 'fake':
+    from rumps.backends import fake
+
+
+@pytest.fixture(autouse=True)
+def _no_profiler():
+    yield
+    rumps.set_profiler(None)
+
+
+class TestLatencyHistogram(object):
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert (histogram.count, histogram.mean, histogram.percentile(99), histogram.max) == (0, 0.0, 0.0, 0.0)
+
+    @pytest.mark.parametrize('scale', [1e-6, 1e-3, 1, 100])
+    def test_precision(self, scale):
+        rng = random.Random(1)
+        values = sorted(rng.lognormvariate(0, 1) * scale for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        for percent in (50, 90, 99, 100):
+            exact = values[int(len(values) * percent / 100.0) - 1]
+            assert histogram.percentile(percent) == pytest.approx(exact, rel=0.02, abs=2e-6)
+        assert histogram.max == values[-1]
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    def test_buckets_are_sparse(self):
+        histogram = LatencyHistogram()
+        for value in (1e-6, 1e-3, 1, 1000):
+            histogram.record(value)
+        assert len(histogram._counts) == 4
+
+
+@fake_only
+class TestProfiler(object):
+    def test_disabled_by_default(self):
+        fake.click(rumps.MenuItem('a', callback=lambda sender: None))
+        assert rumps.stats() == {}
+
+    def test_dispatch_points(self):
+        def clicked(sender):
+            pass
+
+        def checked(sender):
+            pass
+
+        def failing(sender):
+            raise ValueError('boom')
+
+        def ticked(sender):
+            pass
+
+        def woke():
+            pass
+
+        def notified(notification):
+            pass
+
+        rumps.set_profiler()
+        app = rumps.App('test', menu=[rumps.MenuItem('a', callback=clicked), rumps.MenuItem('b', callback=failing),
+                                      rumps.CheckboxMenuItem('c', callback=checked)])
+        wake = events.on_wake.register(woke)
+        notification = events.on_notification.register(notified)
+        try:
+            fake.launch(app)
+            for _ in range(3):
+                fake.click(app.menu['a'])
+            fake.click(app.menu['b'])
+            fake.click(app.menu['c'])
+            t = rumps.Timer(ticked, 1)
+            t.start()
+            fake.run_for(1.5)
+            t.stop()
+            events.on_wake.emit()
+            rumps.notification('title', 'subtitle', 'message', data={'k': 'v'})
+            fake.activate_notification()
+        finally:
+            events.on_wake.unregister(wake)
+            events.on_notification.unregister(notification)
+
+        stats = rumps.stats()
+        name = __name__ + '.TestProfiler.test_dispatch_points.<locals>.'
+        assert stats[name + 'clicked'][:3] == ('menu', 3, 0)
+        assert stats[name + 'checked'][:3] == ('checkbox', 1, 0)
+        assert stats[name + 'failing'][:3] == ('menu', 1, 1)
+        assert stats[name + 'ticked'][:3] == ('timer', 2, 0)
+        assert stats[name + 'woke'][:3] == ('event:on_wake', 1, 0)
+        assert stats[name + 'notified'][:3] == ('event:on_notification', 1, 0)
+        assert stats['rumps.notifications._clicked'][:3] == ('notification', 1, 0)
+        s = stats[name + 'ticked']
+        assert 0 <= s.p50 <= s.p99 <= s.max
+
+    def test_hook_and_reset(self):
+        calls = []
+        rumps.set_profiler(lambda site, func, elapsed, error: calls.append((site, func, error)))
+        callback = lambda sender: None  # noqa: E731
+        item = rumps.MenuItem('a', callback=callback)
+        fake.click(item)
+        assert calls == [('menu', callback, None)]
+        assert len(rumps.stats(reset=True)) == 1
+        assert rumps.stats() == {}
+
+    def test_paged_row_click_counted_once(self):
+        calls = []
+        rumps.set_profiler(lambda site, func, elapsed, error: calls.append(site))
+        paged = rumps.PagedMenuItem('big', ['x', 'y'], callback=lambda row: None)
+        fake.click(paged._rows[0])
+        assert calls == ['menu']
+
+    def test_profiled_keeps_metadata(self):
+        from rumps import _internal
+
+        def handler():
+            """Handles."""
+
+        wrapped = _internal.profiled('test')(handler)
+        assert wrapped.__wrapped__ is handler
+        assert (wrapped.__qualname__, wrapped.__module__, wrapped.__doc__) == (
+            handler.__qualname__, handler.__module__, 'Handles.')
+        assert _internal.callback_name(wrapped) == _internal.callback_name(handler)
+
+    def test_invalid(self):
+        with pytest.raises(TypeError):
+            rumps.set_profiler(42)
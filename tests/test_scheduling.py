@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+import rumps
+from rumps import backends
+from rumps.scheduling import TimerWheel, scheduler
+
+fake_only = pytest.mark.skipif(backends.name != 'fake', reason='drives the in-memory backend')
+
+if backends.name == 'fake':
+    from rumps.backends import fake
+    from AppKit import NSWorkspaceDidWakeNotification
+    from Foundation import NSRunLoop
+
+
+class TestTimerWheel(object):
+    def test_advance(self):
+        wheel = TimerWheel(resolution=1, slots=4, levels=2)
+        for name, deadline in (('c', 30), ('a', 2), ('b', 9), ('far', 1000)):
+            wheel.add(name, deadline)
+        assert wheel.next_deadline() == 2
+        assert wheel.advance(1) == []
+        assert wheel.advance(9) == [('a', 2), ('b', 9)]
+        assert wheel.next_deadline() == 30
+        assert wheel.advance(999) == [('c', 30)]
+        assert wheel.advance(1000) == [('far', 1000)]
+        assert len(wheel) == 0 and wheel.next_deadline() is None
+
+    def test_remove_and_replace(self):
+        wheel = TimerWheel(resolution=1, slots=4, levels=2)
+        wheel.add('a', 5)
+        wheel.add('b', 6)
+        assert wheel.remove('a')
+        assert not wheel.remove('a')
+        wheel.add('b', 3)
+        assert wheel.deadline('b') == 3
+        assert wheel.advance(10) == [('b', 3)]
+
+    def test_matches_sorting(self):
+        rng = random.Random(7)
+        wheel = TimerWheel(resolution=0.01, slots=8, levels=3)
+        deadlines = dict((n, rng.uniform(0, 100)) for n in range(500))
+        for n, deadline in deadlines.items():
+            wheel.add(n, deadline)
+        for n in range(0, 500, 5):
+            wheel.remove(n)
+            del deadlines[n]
+        fired, now = [], 0
+        while wheel:
+            assert wheel.next_deadline() == min(deadlines[n] for n, _ in deadlines.items() if n not in fired)
+            now = wheel.next_deadline()
+            fired.extend(item for item, _ in wheel.advance(now))
+        assert fired == sorted(deadlines, key=deadlines.get)
+
+
+@fake_only
+class TestTimerScheduler(object):
+    @pytest.fixture(autouse=True)
+    def _default_tolerance(self):
+        yield
+        rumps.set_timer_tolerance(0)
+
+    def test_timers_share_one_native_timer(self):
+        ticks = []
+        timers = [rumps.Timer(lambda sender: ticks.append((sender, fake.now())), 1 + n / 10.0) for n in range(10)]
+        for t in timers:
+            t.start()
+        assert len([entry for entry in NSRunLoop.currentRunLoop()._heap if NSRunLoop._live(entry)]) == 1
+        fake.run_for(10)
+        for t in timers:
+            fired = [at for sender, at in ticks if sender is t]
+            assert fired[1] - fired[0] == pytest.approx(t.interval)
+        assert set(rumps.timers()) >= set(timers)
+        for t in timers:
+            t.stop()
+        assert not NSRunLoop.currentRunLoop().has_timers()
+
+    def test_tolerance_coalesces_wakeups(self):
+        def run(tolerance):
+            rumps.set_timer_tolerance(tolerance)
+            timers = [rumps.Timer(lambda sender: None, 5) for n in range(50)]
+            for t in timers:
+                t.start()
+                fake.run_for(0.1)
+            wakeups = scheduler.wakeups
+            fake.run_for(60)
+            for t in timers:
+                t.stop()
+            return scheduler.wakeups - wakeups
+
+        assert run(0) == 600
+        assert run(1) < 100
+
+    def test_stop_and_restart_from_callback(self):
+        ticks = []
+
+        def callback(sender):
+            ticks.append(fake.now())
+            if len(ticks) == 2:
+                sender.stop()
+                sender.interval = 10
+                sender.start()
+
+        t = rumps.Timer(callback, 1)
+        start = fake.now()
+        t.start()
+        fake.run_for(25)
+        t.stop()
+        assert [round(tick - start) for tick in ticks] == [0, 1, 1, 11, 21]
+
+    def test_stop_from_callback_of_timer_due_together(self):
+        ticks = []
+        b = rumps.Timer(lambda sender: ticks.append('b'), 5)
+        a = rumps.Timer(lambda sender: (ticks.append('a'), b.stop()), 5)
+        a.start()
+        b.start()
+        fake.run_for(6)
+        a.stop()
+        assert ticks == ['a', 'a']
+
+    def test_restart_from_callback_of_timer_due_together(self):
+        ticks = []
+
+        def restart(sender):
+            if not ticks:
+                b.stop()
+                b.start()
+
+        b = rumps.Timer(lambda sender: ticks.append(fake.now()), 5)
+        a = rumps.Timer(restart, 5)
+        start = fake.now()
+        a.start()
+        b.start()
+        fake.run_for(6)
+        a.stop()
+        b.stop()
+        assert [round(tick - start) for tick in ticks] == [0, 5]
+
+    def test_interval_change_of_running_timer(self):
+        ticks = []
+        t = rumps.Timer(lambda sender: ticks.append(fake.now()), 10)
+        start = fake.now()
+        t.start()
+        fake.run_for(3)
+        t.interval = 2  # one new interval after the previous call has passed: due now
+        assert t.interval == 2
+        assert scheduler.deadline(t) == pytest.approx(fake.now())
+        fake.run_for(5.5)
+        t.interval = 5
+        assert scheduler.deadline(t) == pytest.approx(start + 12)
+        fake.run_for(5)
+        t.stop()
+        assert [round(tick - start, 6) for tick in ticks] == [0, 3, 5, 7, 12]
+
+    def test_interval_change_before_first_call(self):
+        ticks = []
+        fake.run_for(60 - fake.now() % 60 + 7)
+        t = rumps.Timer(lambda sender: ticks.append(fake.now()), 10, align_to=60)
+        t.start()
+        t.interval = 20
+        fake.run_for(100)
+        t.stop()
+        assert [round(tick % 60) for tick in ticks] == [0, 20, 40]
+
+    def test_invalid_tolerance(self):
+        with pytest.raises(ValueError):
+            rumps.set_timer_tolerance(-1)
+
+
+@fake_only
+class TestTimerOptions(object):
+    def test_tolerance_coalesces_with_other_timers(self):
+        ticks = []
+        start = fake.now()
+        lenient = rumps.Timer(lambda sender: ticks.append(('lenient', fake.now() - start)), 10, tolerance=3)
+        strict = rumps.Timer(lambda sender: ticks.append(('strict', fake.now() - start)), 10)
+        lenient.start()
+        fake.run_for(1)
+        strict.start()
+        assert scheduler._nstimer.tolerance() == pytest.approx(1)  # until strict is due
+        fake.run_for(10)
+        assert scheduler._nstimer.tolerance() == pytest.approx(1)
+        lenient.stop()
+        strict.stop()
+        assert [(name, round(at, 6)) for name, at in ticks] == [
+            ('lenient', 1), ('strict', 1), ('lenient', 11), ('strict', 11)]
+        assert lenient.drift == (2, pytest.approx(1), pytest.approx(1), pytest.approx(1))
+        assert strict.drift.max == pytest.approx(0)
+
+    def test_tolerance_alone(self):
+        ticks = []
+        t = rumps.Timer(lambda sender: ticks.append(fake.now()), 5, tolerance=0.5)
+        t.start()
+        fake.run_for(20)
+        t.stop()
+        assert [round(b - a, 6) for a, b in zip(ticks, ticks[1:])] == [5, 5, 5]  # late, but no drift builds up
+        assert t.drift.last == pytest.approx(0.5)
+
+    def test_jitter(self):
+        ticks = []
+        t = rumps.Timer(lambda sender: ticks.append(fake.now()), 5, jitter=1)
+        start = fake.now()
+        t.start()
+        fake.run_for(500)
+        t.stop()
+        offsets = [tick - start - 5 * n for n, tick in enumerate(ticks)]
+        assert len(ticks) == 100
+        assert all(0 <= offset <= 1 for offset in offsets)
+        assert len(set(round(offset, 3) for offset in offsets)) > 50
+        assert t.drift.max == pytest.approx(0)
+
+    def test_align_to(self):
+        ticks = []
+        fake.run_for(60 - fake.now() % 60 + 7)
+        t = rumps.Timer(lambda sender: ticks.append(fake.now()), 30, align_to=60)
+        t.start()
+        fake.run_for(100)
+        t.stop()
+        assert [round(tick % 60) for tick in ticks] == [0, 30]
+        assert ticks[0] - (fake.now() - 100) == pytest.approx(53)
+
+    def test_decorator(self):
+        @rumps.timer(5, tolerance=1, jitter=2, align_to=10)
+        def poll(sender):
+            pass
+
+        t, = getattr(rumps.timer, '*timers')
+        assert (t.interval, t.tolerance, t.jitter, t.align_to) == (5, 1, 2, 10)
+
+    def test_invalid_options(self):
+        for options in ({'tolerance': -1}, {'jitter': -1}, {'align_to': 0}):
+            with pytest.raises(ValueError):
+                rumps.Timer(None, 5, **options)
+
+
+@fake_only
+class TestBackoff(object):
+    def make(self, results, **options):
+        ticks = []
+
+        def poll(sender):
+            ticks.append(round(fake.now() - start, 6))
+            return results.pop(0) if results else rumps.NO_CHANGE
+
+        start = fake.now()
+        t = rumps.Timer(poll, 5, policy=rumps.Backoff(**options))
+        t.start()
+        return t, ticks
+
+    def test_backs_off_and_snaps_back(self):
+        results = [rumps.NO_CHANGE] * 4 + ['new mail'] + [rumps.NO_CHANGE] * 10
+        t, ticks = self.make(results, factor=2, max_interval=40)
+        fake.run_for(200)
+        t.stop()
+        assert ticks == [0, 10, 30, 70, 110, 115, 125, 145, 185]
+        assert t.interval_stats == (40, 5, 40, 6, 1)
+
+    def test_reset_on_wake(self):
+        t, ticks = self.make([], factor=3)
+        fake.run_for(60)
+        assert ticks == [0, 15, 60] and t.current_interval == 135
+        fake.launch(rumps.App('test'))
+        fake.post_workspace_notification(NSWorkspaceDidWakeNotification)
+        fake.run_for(10)
+        t.stop()
+        assert ticks == [0, 15, 60, 65]
+        assert t.interval_stats.resets == 1
+
+    def test_wake_ignored_when_disabled(self):
+        t, ticks = self.make([], reset_on_wake=False)
+        fake.run_for(30)
+        fake.launch(rumps.App('test'))
+        fake.post_workspace_notification(NSWorkspaceDidWakeNotification)
+        fake.run_for(10)
+        t.stop()
+        assert ticks == [0, 10, 30]
+
+    def test_reset_from_another_callback(self):
+        t, ticks = self.make([])
+        fake.run_for(20)
+        assert t.current_interval == 20
+        t.reset()
+        t.reset()
+        assert t.current_interval == 5
+        fake.run_for(10)
+        t.stop()
+        assert ticks == [0, 10, 20, 30]
+        assert t.interval_stats.resets == 1
+
+    def test_invalid_factor(self):
+        with pytest.raises(ValueError):
+            rumps.Backoff(factor=1)
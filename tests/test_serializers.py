@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from rumps import serializers
+from rumps.exceptions import PayloadTooLargeError
+
+DATA = {'id': 1234, 'title': 'café', 'tags': ['a', 'b'], 'ratio': 0.5, 'done': False, 'parent': None}
+
+
+class TestSerializers(object):
+    @pytest.mark.parametrize('name', ['pickle', 'marshal', 'json', 'pickle+zlib', 'marshal+zlib', 'json+zlib'])
+    def test_round_trip(self, name):
+        serializer = serializers.get_serializer(name)
+        dumped = serializer.dumps(DATA)
+        assert isinstance(dumped, bytes)
+        assert serializer.loads(dumped) == DATA
+        assert serializer.loads(bytearray(dumped)) == DATA  # as NSData is handed back
+
+    def test_compact(self):
+        data = [dict(DATA, id=n) for n in range(10)]
+        pickled = len(serializers.get_serializer('pickle').dumps(data))
+        for name in ('pickle+zlib', 'marshal+zlib', 'json+zlib'):
+            assert len(serializers.get_serializer(name).dumps(data)) < pickled / 2
+
+    def test_compressed_only_when_smaller(self):
+        serializer = serializers.get_serializer('json+zlib')
+        assert serializer.dumps('x')[:1] == b'\x00'
+        assert serializer.dumps('x' * 1000)[:1] == b'\x01'
+        assert serializer.loads(serializer.dumps('x' * 1000)) == 'x' * 1000
+
+    def test_cached_by_name(self):
+        assert serializers.get_serializer('json') is serializers.get_serializer('json')
+        assert serializers.get_serializer('json+zlib').name == 'json+zlib'
+
+    def test_resolve(self):
+        import pickle
+        assert serializers.resolve(pickle) is pickle
+        assert serializers.resolve('marshal') is serializers.get_serializer('marshal')
+
+    @pytest.mark.parametrize('name', ['yaml', 'json+gzip', 'json+'])
+    def test_unknown(self, name):
+        with pytest.raises(ValueError):
+            serializers.get_serializer(name)
+
+    @pytest.mark.skipif(serializers._msgpack is not None, reason='msgpack is installed')
+    def test_msgpack_not_installed(self):
+        assert 'msgpack' not in serializers.formats()
+        with pytest.raises(ImportError):
+            serializers.get_serializer('msgpack')
+
+    @pytest.mark.skipif(serializers._msgpack is None, reason='msgpack is not installed')
+    def test_msgpack(self):
+        serializer = serializers.get_serializer('msgpack+zlib')
+        assert serializer.loads(serializer.dumps(DATA)) == DATA
+
+
+class TestCheckSize(object):
+    def test_within_limit(self):
+        assert serializers.check_size(b'x' * serializers.USER_INFO_LIMIT) == serializers.USER_INFO_LIMIT
+
+    def test_text_counted_in_bytes(self):
+        assert serializers.check_size('é' * 10) == 20
+
+    def test_over_limit(self):
+        with pytest.raises(PayloadTooLargeError) as excinfo:
+            serializers.check_size(b'x' * 2000)
+        assert (excinfo.value.size, excinfo.value.limit) == (2000, 1024)
+        assert isinstance(excinfo.value, ValueError)
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import gc
+
 import pytest
 
-from rumps.utils import ListDict
+from rumps.utils import ListDict, LRUCache, CallbackRegistry, longest_increasing_subsequence
 
 
 class TestListDict(object):
@@ -17,3 +19,113 @@ class TestListDict(object):
         ld.clear()
         assert len(ld) == 0
         assert ld.items() == []
+
+    def test_key_after(self):
+        ld = ListDict([('a', 1), ('b', 2)])
+        assert ld.key_after('a') == 'b'
+        assert ld.key_after('b') is None
+        ld.insert_after('a', ('c', 3))
+        assert ld.key_after('a') == 'c'
+
+
+@pytest.mark.parametrize('seq, expected', [
+    ([], []),
+    ([5], [0]),
+    ([3, 1, 2], [1, 2]),
+    ([1, 2, 3, 0], [0, 1, 2]),
+    ([2, 2, 2], [0]),
+    ([0, 8, 4, 12, 2, 10, 6, 14, 1, 9], [0, 2, 6, 9]),
+])
+def test_longest_increasing_subsequence(seq, expected):
+    indices = longest_increasing_subsequence(seq)
+    assert len(indices) == len(expected)
+    assert all(seq[i] < seq[j] for i, j in zip(indices, indices[1:]))
+    assert indices == sorted(indices)
+
+
+class TestLRUCache(object):
+    def test_hits_and_misses(self):
+        cache = LRUCache()
+        assert cache.get('a') is None
+        cache.put('a', 1)
+        assert cache.get('a') == 1
+        info = cache.info()
+        assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+
+    def test_max_entries_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert 'b' not in cache
+        assert 'a' in cache and 'c' in cache
+        assert cache.info().evictions == 1
+        cache.max_entries = 1
+        assert list(cache._data) == ['c']
+
+    def test_max_size(self):
+        cache = LRUCache(max_size=10, sizeof=len)
+        cache.put('a', 'xxxx')
+        cache.put('b', 'xxxx')
+        cache.put('a', 'xxxxxx')
+        assert cache.info().size == 10
+        cache.put('c', 'x')
+        assert 'b' not in cache
+        assert cache.info().size == 7
+
+    def test_discard_and_clear(self):
+        cache = LRUCache()
+        for key in ('a1', 'a2', 'b1'):
+            cache.put(key, key)
+        assert cache.discard(lambda key: key.startswith('a')) == 2
+        assert len(cache) == 1
+        cache.get('b1')
+        cache.clear()
+        assert cache.info() == (0, 0, 0, 0, 0, None, None)
+
+
+class Owner(object):
+    pass
+
+
+class TestCallbackRegistry(object):
+    def test_lookup(self):
+        registry = CallbackRegistry()
+        owner, native = Owner(), object()
+        registry.register(native, owner, len)
+        assert registry.lookup(native) == (owner, len)
+        assert registry.callback(owner, native) is len
+        with pytest.raises(KeyError):
+            registry.lookup(object())
+
+    def test_owner_is_weakly_referenced(self):
+        registry = CallbackRegistry()
+        native = object()
+        owner = Owner()
+        owner.cycle = owner
+        registry.register(native, owner, len)
+        del owner
+        gc.collect()
+        assert native not in registry
+        assert registry.stats() == (0, {}, 1, 0, 1)
+
+    def test_detach_and_attach(self):
+        registry = CallbackRegistry()
+        owner, native = Owner(), object()
+        registry.register(native, owner, len)
+        assert registry.detach(owner) == 1
+        assert len(registry) == 0
+        assert registry.callback(owner, native) is len
+        registry.attach(owner)
+        assert registry.lookup(native) == (owner, len)
+
+    def test_replaced_owner(self):
+        registry = CallbackRegistry()
+        first, second, native = Owner(), Owner(), object()
+        registry.register(native, first, len)
+        registry.register(native, second, repr)
+        assert registry.detach(first) == 0
+        del first
+        assert registry.lookup(native) == (second, repr)
+        assert registry.stats().by_type == {'Owner': 1}